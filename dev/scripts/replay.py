@@ -0,0 +1,71 @@
+# Headless replay of a recorded modal event stream
+#
+# blender --background scene.blend --python dev/scripts/replay.py -- \
+#     --events events.json --object Cube --edit --out report.json --baseline baseline.json
+#
+# Record a stream from the Blender python console :
+#     from KBT.utils.replay import EventRecorder
+#     EventRecorder.start("events.json")   # run the tool, then
+#     EventRecorder.stop()
+
+import argparse
+import json
+import sys
+
+import addon_utils
+import bpy
+
+
+def parse_args():
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", required=True)
+    parser.add_argument("--operator", default="")
+    parser.add_argument("--object", default="")
+    parser.add_argument("--edit", action="store_true")
+    parser.add_argument("--addon", default="KBT")
+    parser.add_argument("--out", default="")
+    parser.add_argument("--baseline", default="")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    addon_utils.enable(args.addon, default_set=True)
+    replay = sys.modules[f"{args.addon}.utils.replay"]
+
+    obj = bpy.data.objects.get(args.object) if args.object else bpy.context.view_layer.objects.active
+    if obj is not None:
+        for other in bpy.context.view_layer.objects:
+            other.select_set(other == obj)
+        bpy.context.view_layer.objects.active = obj
+        if args.edit:
+            bpy.ops.object.mode_set(mode='EDIT')
+
+    idname, events = replay.load_event_stream(args.events)
+    idname = args.operator or idname
+    op_cls = replay.operator_class_from_idname(idname)
+    if op_cls is None:
+        print(f"Operator not found : {idname}")
+        sys.exit(2)
+
+    report = replay.replay_events(op_cls, events, obj=obj)
+    print(json.dumps(report, indent=4))
+    if args.out:
+        with open(args.out, 'w') as file:
+            json.dump(report, file, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as file:
+            baseline = json.load(file)
+        errors = replay.compare_reports(report, baseline, args.tolerance)
+        for error in errors:
+            print(f"REGRESSION : {error}")
+        if errors:
+            sys.exit(1)
+    if 'error' in report:
+        sys.exit(1)
+
+
+main()
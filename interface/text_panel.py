@@ -31,3 +31,12 @@ class KBT_PT_TextPanel(KBT_Panel):
         box = self.layout.box()
         row = box.row()
         row.label(text="KBT Panel")
+        # Build
+        box = self.layout.box()
+        text = getattr(context.space_data, 'text', None)
+        if text is not None and hasattr(text, 'kbt'):
+            box.prop(text.kbt, 'build_include')
+            box.prop(text.kbt, 'build_order')
+        row = box.row(align=True)
+        row.operator('kbt.script_build', text="Build").force = False
+        row.operator('kbt.script_build', text="Rebuild All").force = True
@@ -5,6 +5,11 @@
 # R&D
 from .rnd_modal import KBT_OT_RND_Modal
 from .rnd_static import KBT_OT_RND_Static
+# Scripts
+from .script_build import KBT_OT_ScriptBuild
+from .text_autocomplete import KBT_OT_TextAutocomplete
+# Macro
+from .macro_replay import KBT_OT_MacroReplay
 
 # ------------------------------------------------------------------------------- #
 # REGISTER
@@ -14,6 +19,11 @@ CLASSES = (
     # R&D
     KBT_OT_RND_Modal,
     KBT_OT_RND_Static,
+    # Scripts
+    KBT_OT_ScriptBuild,
+    KBT_OT_TextAutocomplete,
+    # Macro
+    KBT_OT_MacroReplay,
 )
 
 
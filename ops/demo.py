@@ -8,35 +8,51 @@ import blf
 import gpu
 from gpu_extras.batch import batch_for_shader
 import gc
+import traceback
+import enum
+from ..utils.localize import LocalRegion
+from ..utils.modal import STATUS, ModalBase
+from ..utils.preview import MeshPreview, bmesh_coords, set_bmesh_coords
+from ..utils.snapshot import CHANGES, BmeshSnapshot
+from ..utils.undo import UndoStore
+from ..utils.workers import POOL_TYPES, WorkerPool
+
+# ------------------------------------------------------------------------------- #
+# ENUMS
+# ------------------------------------------------------------------------------- #
+
+class DIRTY(enum.Flag):
+    NONE      = 0
+    TABLES    = enum.auto()
+    INDICES   = enum.auto()
+    NORMALS   = enum.auto()
+    SELECTION = enum.auto()
+    ALL       = TABLES | INDICES | NORMALS | SELECTION
 
 # ------------------------------------------------------------------------------- #
 # FUNCTIONS
 # ------------------------------------------------------------------------------- #
 
-def ensure_bmesh_type_tables_normals_selections(bm):
-    if isinstance(bm, bmesh.types.BMesh) and bm.is_valid:
-        tool_sel_mode = bpy.context.tool_settings.mesh_select_mode
-        bm.select_mode = {mode for mode, sel in zip(['VERT', 'EDGE', 'FACE'], tool_sel_mode) if sel}
+def refresh_bmesh(bm, dirty:DIRTY):
+    """Refreshes only the dirty parts of the bmesh, returns the flags that are still dirty"""
+    if not isinstance(bm, bmesh.types.BMesh) or not bm.is_valid:
+        return dirty
+    if DIRTY.TABLES in dirty:
         bm.verts.ensure_lookup_table()
         bm.edges.ensure_lookup_table()
         bm.faces.ensure_lookup_table()
+    if DIRTY.INDICES in dirty:
         bm.verts.index_update()
         bm.edges.index_update()
         bm.faces.index_update()
-        bm.select_history.validate()
-        bm.select_flush_mode()
-        bm.normal_update()
-        return True
-    return False
-
-def ensure_bmesh_normals_selections(bm):
-    if isinstance(bm, bmesh.types.BMesh) and bm.is_valid:
+    if DIRTY.SELECTION in dirty:
         tool_sel_mode = bpy.context.tool_settings.mesh_select_mode
         bm.select_mode = {mode for mode, sel in zip(['VERT', 'EDGE', 'FACE'], tool_sel_mode) if sel}
+        bm.select_history.validate()
         bm.select_flush_mode()
+    if DIRTY.NORMALS in dirty:
         bm.normal_update()
-        return True
-    return False
+    return DIRTY.NONE
 
 # ------------------------------------------------------------------------------- #
 # EDITOR
@@ -46,6 +62,7 @@ class BmeshEditor:
     def __init__(self, obj):
         # SETTINGS
         self.undo_limit = 32
+        self.undo_budget = 256 * 1024 * 1024
         # ID Data
         self.uid = obj.session_uid
         self.obj = obj
@@ -57,10 +74,29 @@ class BmeshEditor:
         self.ogmesh = obj.data.copy()
         self.ogmesh_uid = self.ogmesh.session_uid
         self.ogmesh.calc_loop_triangles()
-        # MESH BACKUPS
-        self.backups = []
+        # UNDO
+        self.undo_store = UndoStore(limit=self.undo_limit, byte_budget=self.undo_budget)
+        self.undo_mesh = None
+        self.undo_mesh_uid = None
+        self.undo_mesh_dirty = False
+        self.undo_mesh_backup = None
+        # COORDS
+        self.coords_mesh = None
+        self.coords_mesh_uid = None
+        # SNAPSHOT
+        self.snapshot = None
+        self.changes = CHANGES.TOPOLOGY
+        self.moved = None
         # BMESH
         self.BM = None
+        self.dirty = DIRTY.ALL
+        # LOCAL
+        self.local = None
+        # PREVIEW
+        self.preview = None
+        self.preview_topology = True
+        self.preview_hidden = None
+        self.preview_stale = False
 
     def validator(self):
         # ID DATA
@@ -86,66 +122,234 @@ class BmeshEditor:
         return self.ensure_bmesh()
 
     def ensure_bmesh(self):
-        if not isinstance(self.BM, bmesh.types.BMesh):
-            return False
-        if not self.BM.is_valid:
-            self.BM.free()
+        is_editmode = self.obj.data.is_editmode
+        # Keep
+        if isinstance(self.BM, bmesh.types.BMesh):
+            if self.BM.is_valid and self.BM.is_wrapped == is_editmode:
+                return True
+            if self.BM.is_valid and not self.BM.is_wrapped:
+                self.BM.free()
             self.BM = None
             gc.collect()
-            return False
-        if self.obj.data.is_editmode:
+        # Acquire
+        if is_editmode:
             self.BM = bmesh.from_edit_mesh(self.obj.data)
         else:
             self.BM = bmesh.new(use_operators=True)
             self.BM.from_mesh(self.obj.data, face_normals=True, vertex_normals=True, use_shape_key=False, shape_key_index=0)
-        if ensure_bmesh_type_tables_normals_selections(self.BM):
-            return True
-        return False
+        self.dirty = DIRTY.ALL
+        self.changes, self.moved = CHANGES.TOPOLOGY, None
+        self.preview_topology = True
+        return isinstance(self.BM, bmesh.types.BMesh) and self.BM.is_valid
 
-    def restore(self):
+    def mark_dirty(self, dirty:DIRTY):
+        self.dirty |= dirty
+
+    def ensure(self, dirty:DIRTY=DIRTY.ALL):
+        """Refreshes the requested tables, indices, normals or selections if an operation invalidated them"""
+        pending = self.dirty & dirty
+        if pending:
+            self.dirty = (self.dirty & ~pending) | refresh_bmesh(self.BM, pending)
+        return not (self.dirty & dirty)
+
+    def mark_changes(self, changes:CHANGES, moved=None):
+        """Declare what the last operation changed, COORDS with moved vertex indices restores only those"""
+        self.changes = changes
+        self.moved = moved if changes == CHANGES.COORDS else None
+        if CHANGES.TOPOLOGY in changes:
+            self.dirty |= DIRTY.ALL
+            self.preview_topology = True
+        elif CHANGES.COORDS in changes:
+            self.dirty |= DIRTY.NORMALS
+
+    def restore(self, capture=True):
+        """Restores the last saved state, capture takes a snapshot for the next restore when none is valid"""
         if not self.validator():
             return False
-        backup = self.backups[-1] if self.backups else self.ogmesh
-        bmesh.ops.delete(self.BM, geom=self.BM.verts, context='VERTS')
+        changes, moved = self.changes, self.moved
+        self.changes, self.moved = CHANGES.TOPOLOGY, None
+        # Snapshot
+        snapshot = self.snapshot
+        if snapshot and snapshot.is_valid():
+            if changes == CHANGES.NONE:
+                return True
+            if CHANGES.TOPOLOGY not in changes:
+                if moved is not None:
+                    self.ensure(DIRTY.INDICES)
+                if snapshot.restore_coords(self.BM, moved):
+                    self.dirty |= DIRTY.NORMALS if moved is not None else DIRTY.ALL
+                    return True
+            if not self.BM.is_wrapped:
+                self.BM.free()
+                self.BM = snapshot.copy()
+                self.dirty = DIRTY.ALL
+                self.preview_topology = True
+                return True
+        # Backup
+        backup = self.undo_backup_mesh() if self.undo_store.entries else self.ogmesh
+        if backup is None:
+            return False
+        self.BM.clear()
         self.BM.from_mesh(backup, face_normals=True, vertex_normals=True, use_shape_key=False, shape_key_index=0)
-        return ensure_bmesh_type_tables_normals_selections(self.BM)
+        self.dirty = DIRTY.ALL
+        self.preview_topology = True
+        if capture and not (snapshot and snapshot.is_valid()):
+            self.capture_snapshot()
+        return True
+
+    def capture_snapshot(self):
+        self.free_snapshot()
+        self.ensure(DIRTY.TABLES)
+        self.snapshot = BmeshSnapshot(self.BM)
+        # Unmarked operations count as topology changes, callers opt in to the fast paths through mark_changes
+        self.changes, self.moved = CHANGES.TOPOLOGY, None
+
+    def free_snapshot(self):
+        if isinstance(self.snapshot, BmeshSnapshot):
+            self.snapshot.free()
+        self.snapshot = None
+        self.changes, self.moved = CHANGES.TOPOLOGY, None
+
+    def enable_preview(self):
+        """Routes update to a GPU preview, the real mesh is written on save, commit or close"""
+        if self.preview is None:
+            self.preview = MeshPreview(self.mat_ws)
+            self.preview_topology = True
+        # The real mesh stays unchanged until write, hide it so it does not z-fight with the preview
+        if self.preview_hidden is None:
+            try:
+                self.preview_hidden = self.obj.hide_get()
+                self.obj.hide_set(True)
+            except (ReferenceError, RuntimeError):
+                self.preview_hidden = None
+        return self.preview.show()
+
+    def disable_preview(self, flush=True):
+        """Frees the preview, flush writes the BMesh so the edit mesh triangles and normals are current again"""
+        if flush and self.preview_stale:
+            self.write()
+        if isinstance(self.preview, MeshPreview):
+            self.preview.free()
+        self.preview = None
+        if self.preview_hidden is not None:
+            try: self.obj.hide_set(self.preview_hidden)
+            except (ReferenceError, RuntimeError): pass
+        self.preview_hidden = None
 
     def update(self):
+        if self.preview is None:
+            return self.write()
         if not self.validator():
             return False
-        ensure_bmesh_normals_selections(self.BM)
+        self.ensure(DIRTY.NORMALS | DIRTY.INDICES)
+        self.preview.upload(self.BM, topology=self.preview_topology)
+        self.preview_topology = False
+        # The edit mesh is not updated until write, its triangles and normals lag behind the preview
+        self.preview_stale = True
+        return True
+
+    def commit(self):
+        """Writes the working BMesh to the real mesh"""
+        return self.write()
+
+    def write(self):
+        if not self.validator():
+            return False
+        self.ensure(DIRTY.NORMALS | DIRTY.SELECTION)
         if self.obj.data.is_editmode:
             bmesh.update_edit_mesh(self.obj.data, loop_triangles=True, destructive=True)
         elif not self.BM.is_wrapped:
             self.BM.to_mesh(self.obj.data)
             self.obj.data.calc_loop_triangles()
+        self.preview_stale = False
+        return True
+
+    def localize(self, rings:int=1):
+        """Starts a localized edit on the selection plus n rings, the region is hidden until commit or discard"""
+        if not self.validator():
+            return None
+        self.discard_local()
+        self.ensure(DIRTY.TABLES | DIRTY.INDICES)
+        local = LocalRegion(self.BM, rings)
+        if local.is_empty:
+            local.free()
+            return None
+        local.hide_region(self.BM, hide=True)
+        self.local = local
+        self.write()
+        return local
+
+    def commit_local(self):
+        """Splices the localized result into the full mesh"""
+        if self.local is None or not self.validator():
+            return False
+        try:
+            self.local.splice(self.BM)
+        except ValueError:
+            traceback.print_exc()
+            self.discard_local()
+            return False
+        self.local.free()
+        self.local = None
+        self.mark_changes(CHANGES.TOPOLOGY)
+        return self.write()
+
+    def discard_local(self):
+        if self.local is None:
+            return False
+        if self.validator():
+            self.local.hide_region(self.BM, hide=False)
+            self.write()
+        self.local.free()
+        self.local = None
         return True
 
+    def undo_backup_mesh(self):
+        """Returns the scratch mesh holding the top undo state, decoded only when the stack changed"""
+        if not isinstance(self.undo_mesh, bpy.types.Mesh) or self.undo_mesh.session_uid != self.undo_mesh_uid:
+            self.undo_mesh = bpy.data.meshes.new(f"{self.obj.data.name}_undo")
+            self.undo_mesh_uid = self.undo_mesh.session_uid
+            self.undo_mesh_dirty = True
+        if self.undo_mesh_dirty:
+            self.undo_mesh_backup = self.undo_store.backup_mesh(self.undo_mesh)
+            self.undo_mesh_dirty = False
+        return self.undo_mesh_backup
+
+    def coords_scratch(self):
+        if not isinstance(self.coords_mesh, bpy.types.Mesh) or self.coords_mesh.session_uid != self.coords_mesh_uid:
+            self.coords_mesh = bpy.data.meshes.new(f"{self.obj.data.name}_coords")
+            self.coords_mesh_uid = self.coords_mesh.session_uid
+        return self.coords_mesh
+
+    def read_coords(self):
+        """Returns the (N, 3) float32 vertex coords of the BMesh, bulk read through a scratch mesh"""
+        return bmesh_coords(self.BM, self.coords_scratch())
+
+    def write_coords(self, coords):
+        """Writes coords returned by read_coords back in bulk, the BMesh is reloaded so element references are stale"""
+        set_bmesh_coords(self.BM, self.coords_scratch(), coords)
+        self.dirty = DIRTY.ALL
+        self.mark_changes(CHANGES.COORDS)
+
+    def memory_usage(self):
+        return self.undo_store.memory_usage()
+
     def save(self):
-        if not self.update():
+        if not self.write():
             return False
         if self.obj.data.is_editmode:
             self.obj.update_from_editmode()
-        backup = self.obj.data.copy()
-        backup.calc_loop_triangles()
-        self.backups.append(backup)
-        # Undo Limit
-        if len(self.backups) > self.undo_limit:
-            backup = self.backups[0]
-            self.backups.remove(backup)
-            if isinstance(backup, bpy.types.Mesh):
-                if backup.session_uid != self.uid and backup.session_uid != self.ogmesh_uid:
-                    if backup.name in bpy.data.meshes:
-                        bpy.data.meshes.remove(backup, do_unlink=True, do_id_user=True, do_ui_user=True)
+        self.undo_store.limit = self.undo_limit
+        self.undo_store.byte_budget = self.undo_budget
+        self.undo_store.push(self.obj.data, vertex_groups=len(self.obj.vertex_groups) > 0)
+        self.undo_mesh_dirty = True
+        self.capture_snapshot()
         return True
 
     def undo(self):
-        if self.backups:
-            backup = self.backups.pop()
-            if isinstance(backup, bpy.types.Mesh):
-                if backup.session_uid != self.uid and backup.session_uid != self.ogmesh_uid:
-                    if backup.name in bpy.data.meshes:
-                        bpy.data.meshes.remove(backup, do_unlink=True, do_id_user=True, do_ui_user=True)
+        if self.undo_store.pop() is not None:
+            self.undo_mesh_dirty = True
+        self.free_snapshot()
         if self.restore():
             if self.update():
                 return True
@@ -153,14 +357,30 @@ class BmeshEditor:
 
     def close(self, revert=False):
         # Remove Backups
-        for backup in self.backups:
-            if isinstance(backup, bpy.types.Mesh):
-                if backup.session_uid != self.uid and backup.session_uid != self.ogmesh_uid:
-                    if backup.name in bpy.data.meshes:
-                        bpy.data.meshes.remove(backup)
-        self.backups = []
+        self.undo_store.clear()
+        if isinstance(self.undo_mesh, bpy.types.Mesh):
+            try:
+                if self.undo_mesh.session_uid == self.undo_mesh_uid:
+                    if self.undo_mesh.name in bpy.data.meshes:
+                        bpy.data.meshes.remove(self.undo_mesh)
+            except: pass
+        self.undo_mesh = None
+        self.undo_mesh_backup = None
+        if isinstance(self.coords_mesh, bpy.types.Mesh):
+            try:
+                if self.coords_mesh.session_uid == self.coords_mesh_uid:
+                    if self.coords_mesh.name in bpy.data.meshes:
+                        bpy.data.meshes.remove(self.coords_mesh)
+            except: pass
+        self.coords_mesh = None
+        # Local
+        self.discard_local()
+        # Preview, written by the update below
+        self.disable_preview(flush=False)
         # Revert to Original Mesh
-        if revert: self.restore()
+        self.free_snapshot()
+        if revert: self.restore(capture=False)
+        self.free_snapshot()
         # Update Edit / Object mode mesh
         self.update()
         # Free the Bmesh
@@ -186,16 +406,124 @@ class BmeshEditor:
         del self.mat_ws_inv
         del self.mat_ws_trs
         del self.ogmesh
-        del self.backups
+        del self.undo_store
+        del self.undo_mesh
+        del self.coords_mesh
+        del self.snapshot
+        del self.local
+        del self.preview
         del self.BM
 
+# ------------------------------------------------------------------------------- #
+# SESSION
+# ------------------------------------------------------------------------------- #
+
+class BmeshSession:
+    """
+    BmeshEditors for many objects with one shared undo timeline.
+    Each save is a single step recording which editors stored a state, undo pops the step for all of them.
+    """
+    def __init__(self, objs):
+        # SETTINGS
+        self.undo_limit = 32
+        self.undo_budget = 512 * 1024 * 1024
+        # EDITORS
+        self.editors = [BmeshEditor(obj) for obj in objs if isinstance(obj, bpy.types.Object) and obj.type == 'MESH']
+        # The timeline evicts for all editors
+        for editor in self.editors:
+            editor.undo_limit = None
+            editor.undo_budget = None
+        # TIMELINE
+        self.timeline = []
+
+    def validator(self):
+        """Drops editors whose objects became invalid, returns False when none are left"""
+        valid = []
+        for editor in self.editors:
+            if editor.validator():
+                valid.append(editor)
+            else:
+                editor.close(revert=False)
+        if len(valid) != len(self.editors):
+            self.timeline = [[e for e in step if e in valid] for step in self.timeline]
+            self.timeline = [step for step in self.timeline if step]
+        self.editors = valid
+        return bool(self.editors)
+
+    def ensure(self, dirty:DIRTY=DIRTY.ALL):
+        for editor in self.editors:
+            editor.ensure(dirty)
+
+    def restore(self):
+        return all([editor.restore() for editor in self.editors])
+
+    def update(self):
+        return all([editor.update() for editor in self.editors])
+
+    def map_coords(self, func, pool_type:POOL_TYPES=POOL_TYPES.THREAD):
+        """
+        Runs func((N, 3) float32 coords) -> coords for every editor on worker threads.
+        Arrays are read and written back in bulk on the main thread, func must not touch bpy.
+        """
+        editors = [editor for editor in self.editors if editor.validator()]
+        arrays = [editor.read_coords() for editor in editors]
+        results = WorkerPool.get(pool_type).map(func, arrays)
+        for editor, coords in zip(editors, results):
+            if coords is None or len(coords) != len(editor.BM.verts):
+                continue
+            editor.write_coords(coords)
+        return len(editors)
+
+    def save(self, editors=None):
+        """Stores one timeline step for the given editors or all of them"""
+        editors = [editor for editor in (editors or self.editors) if editor in self.editors]
+        saved = [editor for editor in editors if editor.save()]
+        if not saved:
+            return False
+        self.timeline.append(saved)
+        self.evict()
+        return True
+
+    def undo(self):
+        if not self.timeline:
+            return False
+        step = self.timeline.pop()
+        return all([editor.undo() for editor in step if editor in self.editors])
+
+    def evict(self):
+        while self.timeline and (len(self.timeline) > self.undo_limit or self.nbytes > self.undo_budget):
+            if len(self.timeline) == 1:
+                break
+            step = self.timeline.pop(0)
+            for editor in step:
+                editor.undo_store.drop_oldest()
+
+    @property
+    def nbytes(self):
+        return sum(editor.undo_store.nbytes for editor in self.editors)
+
+    def memory_usage(self):
+        return {editor.obj.name : editor.memory_usage() for editor in self.editors if isinstance(editor.obj, bpy.types.Object)}
+
+    def close(self, revert=False):
+        for editor in self.editors:
+            editor.close(revert=revert)
+        self.editors = []
+        self.timeline = []
+
 # ------------------------------------------------------------------------------- #
 # MODAL
 # ------------------------------------------------------------------------------- #
 
-class SimpleModalOperator(bpy.types.Operator):
+class SimpleModalOperator(ModalBase, bpy.types.Operator):
     bl_idname = "view3d.simple_modal"
     bl_label = "Simple Modal"
+    MODAL_EVENTS = {
+        ('ESC', 'PRESS') : 'on_cancel',
+        ('RET', 'PRESS') : 'on_confirm',
+    }
+    LOCAL_FACE_COUNT = 20000
+    LOCAL_RINGS = 2
 
     @classmethod
     def poll(cls, context):
@@ -206,42 +534,41 @@ class SimpleModalOperator(bpy.types.Operator):
         self.mouse_path = []
         self.prev_mouse = event.mouse_region_x
         self.bevel_width = 0
-        # Handle
-        add = bpy.types.SpaceView3D.draw_handler_add
-        self._handle = add(self.draw_2d, (context, ), 'WINDOW', 'POST_PIXEL')
-        self.shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        # Shader
+        self.shader = None
         # Editor
         obj = context.edit_object
         self.editor = BmeshEditor(obj)
+        self.local = None
+        if len(obj.data.polygons) > self.LOCAL_FACE_COUNT:
+            self.local = self.editor.localize(self.LOCAL_RINGS)
+        if self.local is None:
+            self.editor.enable_preview()
         # Modal
-        context.window_manager.modal_handler_add(self)
-        return {'RUNNING_MODAL'}
+        return self.modal_start(context, event)
 
-    def modal(self, context, event):
-        # Draw
-        context.area.tag_redraw()
+    def on_mouse_move(self, context, event):
+        # Mouse
+        self.mouse_path.append(self.mouse)
         # Update
         if not self.update(context, event):
-            return self.close(context)
-        # Mouse
-        if event.type == 'MOUSEMOVE':
-            coord = (event.mouse_region_x, event.mouse_region_y)
-            self.mouse_path.append(coord)
-        # Exit
-        elif event.type == 'ESC':
-            return self.close(context)
-        # Run
-        return {'RUNNING_MODAL'}
-
-    def close(self, context):
-        # Draw
-        context.area.tag_redraw()
-        # Handle
-        bpy.types.SpaceView3D.draw_handler_remove(self._handle, 'WINDOW')
+            self.status = STATUS.CANCELLED
+        return True
+
+    def on_cancel(self, context, event):
+        self.status = STATUS.CANCELLED
+        return True
+
+    def on_confirm(self, context, event):
+        if self.local is not None:
+            self.editor.commit_local()
+            self.local = None
+        self.status = STATUS.FINISHED
+        return True
+
+    def on_close(self, context):
         # Editor
-        self.editor.close(revert=True)
-        # Cancel
-        return {'CANCELLED'}
+        self.editor.close(revert=self.status != STATUS.FINISHED)
 
     def update(self, context, event):
         # Error
@@ -249,13 +576,17 @@ class SimpleModalOperator(bpy.types.Operator):
             print("Not Validated")
             return False
         # Offset
-        self.bevel_width += event.mouse_region_x - self.prev_mouse
-        self.prev_mouse = event.mouse_region_x
+        self.bevel_width += self.mouse[0] - self.prev_mouse
+        self.prev_mouse = self.mouse[0]
+        # Local
+        if self.local is not None:
+            bm = self.local.restore()
         # Editor
-        if not self.editor.restore():
+        elif not self.editor.restore():
             print("Not Restored")
             return False
-        bm = self.editor.BM
+        else:
+            bm = self.editor.BM
         # edges
         edges = [edge for edge in bm.edges if edge.select]
         if not edges:
@@ -281,15 +612,26 @@ class SimpleModalOperator(bpy.types.Operator):
             miter_inner='SHARP',
             spread=0,
             vmesh_method='ADJ')
+        # Local
+        if self.local is not None:
+            self.local.changed = True
+            return True
         # Editor
+        self.editor.mark_changes(CHANGES.TOPOLOGY)
         self.editor.update()
         # Valid
         return True
 
+    def draw_3d(self, context):
+        if self.local is not None:
+            self.local.draw(self.editor.mat_ws)
+
     def draw_2d(self, context):
         blf.position(0, 15, 30, 0)
         blf.size(0, 20.0)
         blf.draw(0, f"{self.bevel_width}")
+        if self.shader is None:
+            self.shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
         gpu.state.blend_set('ALPHA')
         self.shader.uniform_float("color", (0.0, 0.0, 0.0, 0.5))
         self.shader.uniform_float("viewportSize", (context.area.width, context.area.height))
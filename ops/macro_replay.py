@@ -0,0 +1,48 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+from bpy.types import (
+    Context, Operator,
+)
+from bpy.props import (
+    BoolProperty, IntProperty,
+)
+from ..utils.history import OperatorHistory
+from ..utils.macro import Macro
+
+# ------------------------------------------------------------------------------- #
+# OPERATOR
+# ------------------------------------------------------------------------------- #
+
+class KBT_OT_MacroReplay(Operator):
+    '''Replay the last recorded operators on every selected object with a single undo step'''
+    bl_label = "Replay Macro"
+    bl_idname = 'kbt.macro_replay'
+    bl_options = {'REGISTER'}
+    count : IntProperty(name="Operators", description="Number of recorded operators to replay", default=1, min=1, max=64)
+    benchmark : BoolProperty(name="Benchmark", description="Compare against naive replay on temporary copies", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return context.mode == 'OBJECT' and len(context.selected_objects) > 0
+
+
+    def execute(self, context:Context):
+        OperatorHistory.capture()
+        entries = [entry for entry in OperatorHistory.last(self.count + 1) if entry.bl_idname != 'KBT_OT_macro_replay']
+        macro = Macro.from_history(entries[-self.count:])
+        if not macro.steps:
+            self.report({'WARNING'}, "No recorded operators")
+            return {'CANCELLED'}
+        targets = list(context.selected_objects)
+        if self.benchmark:
+            naive, batched, speedup, identical = macro.benchmark(context, targets)
+            if not identical:
+                self.report({'WARNING'}, f"Naive and batched replay differ, naive {naive.ms:.1f} ms, batched {batched.ms:.1f} ms")
+                return {'FINISHED'}
+            self.report({'INFO'}, f"Naive {naive.ms:.1f} ms, batched {batched.ms:.1f} ms, {speedup:.1f}x")
+            return {'FINISHED'}
+        report = macro.run(context, targets)
+        self.report({'INFO'}, f"{report.steps} steps on {report.targets} objects in {report.ms:.1f} ms ({report.direct} direct, {report.failed} failed)")
+        return {'FINISHED'}
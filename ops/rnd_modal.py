@@ -2,26 +2,29 @@
 # IMPORTS
 # ------------------------------------------------------------------------------- #
 
-import bpy
 from bpy.types import (
     Context, Event, Operator,
 )
 from ..utils.handlers import (
-    SPACE_TYPES, REGION_TYPES, DRAW_TYPES, ShaderHandler,
+    SPACE_TYPES, REGION_TYPES,
 )
 from ..utils.modal import (
-    STATUS, add_shader_handles, remove_shader_handles,
+    STATUS, ModalBase,
 )
 
 # ------------------------------------------------------------------------------- #
 # OPERATOR
 # ------------------------------------------------------------------------------- #
 
-class KBT_OT_RND_Modal(Operator):
+class KBT_OT_RND_Modal(ModalBase, Operator):
     '''KBT R&D Modal'''
     bl_label = "KBT R&D Modal"
     bl_idname = 'kbt.rnd_modal'
     bl_options = {'REGISTER', 'UNDO'}
+    MODAL_EVENTS = {
+        ('ESC', 'PRESS') : 'on_cancel',
+        ('RET', 'PRESS') : 'on_confirm',
+    }
 
     @classmethod
     def poll(cls, context:Context):
@@ -29,42 +32,21 @@ class KBT_OT_RND_Modal(Operator):
 
 
     def invoke(self, context:Context, event:Event):
-        # State
-        self.status = STATUS.RUNNING
-        # Handlers
-        add_shader_handles(self, context, SPACE_TYPES.VIEW_3D, REGION_TYPES.WINDOW)
-        # Modal
-        context.window_manager.modal_handler_add(self)
-        return {'RUNNING_MODAL'}
-
-
-    def modal(self, context:Context, event:Event):
-        # State
-        self.status = STATUS.RUNNING
-        # Escape
-        if event.type == 'ESC' and event.value == 'PRESS':
-            self.status = STATUS.CANCELLED
-        # Enter
-        elif event.type == 'RET' and event.value == 'PRESS':
-            self.status = STATUS.FINISHED
-        # Exit
-        if self.status in STATUS.FINISHED | STATUS.CANCELLED:
-            return self.close(context)
-        # Running
-        return {'RUNNING_MODAL'}
-
-
-    def close(self, context:Context):
-        # Handlers
-        remove_shader_handles(self)
-        # State
-        if self.status == STATUS.CANCELLED:
-            return {'CANCELLED'}
-        return {'FINISHED'}
-
-
-    def cancel(self, context:Context):
-        pass
+        return self.modal_start(context, event, SPACE_TYPES.VIEW_3D, REGION_TYPES.WINDOW)
+
+
+    def on_cancel(self, context:Context, event:Event):
+        self.status = STATUS.CANCELLED
+        return False
+
+
+    def on_confirm(self, context:Context, event:Event):
+        self.status = STATUS.FINISHED
+        return False
+
+
+    def on_mouse_move(self, context:Context, event:Event):
+        return False
 
 
     def draw_3d(self, context:Context):
@@ -73,4 +55,3 @@ class KBT_OT_RND_Modal(Operator):
 
     def draw_2d(self, context:Context):
         pass
-
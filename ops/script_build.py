@@ -0,0 +1,48 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import (
+    Context, Operator,
+)
+from bpy.props import (
+    BoolProperty,
+)
+from ..utils.scripts import ScriptBuilder
+
+# ------------------------------------------------------------------------------- #
+# OPERATOR
+# ------------------------------------------------------------------------------- #
+
+class KBT_OT_ScriptBuild(Operator):
+    '''Run changed text blocks and the blocks importing them in dependency order'''
+    bl_label = "Build Scripts"
+    bl_idname = 'kbt.script_build'
+    bl_options = {'REGISTER'}
+    force : BoolProperty(name="Force", description="Run every block", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return len(bpy.data.texts) > 0
+
+
+    def execute(self, context:Context):
+        try:
+            report = ScriptBuilder.default().run(force=self.force)
+        except PermissionError as error:
+            self.report({'ERROR'}, str(error))
+            return {'CANCELLED'}
+        for result in report:
+            if result.error:
+                self.report({'WARNING'}, f"{result.status} {result.name} : {result.error.strip().splitlines()[-1]}")
+            elif result.status == 'BUILT':
+                self.report({'INFO'}, f"{result.name} built in {result.ms:.2f} ms")
+        built = [result for result in report if result.status == 'BUILT']
+        failed = [result for result in report if result.status in {'FAILED', 'SKIPPED', 'CYCLE'}]
+        total = sum(result.ms for result in built)
+        if failed:
+            self.report({'ERROR'}, f"Built {len(built)}, failed {len(failed)} : {', '.join(result.name for result in failed)}")
+            return {'CANCELLED'}
+        self.report({'INFO'}, f"Built {len(built)} of {len(report)} blocks in {total:.1f} ms")
+        return {'FINISHED'}
@@ -0,0 +1,57 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import (
+    Context, Event, Operator,
+)
+from bpy.props import (
+    StringProperty,
+)
+from .. import utils
+
+# ------------------------------------------------------------------------------- #
+# OPERATOR
+# ------------------------------------------------------------------------------- #
+
+class KBT_OT_TextAutocomplete(Operator):
+    '''Complete the word before the cursor'''
+    bl_label = "Autocomplete"
+    bl_idname = 'kbt.text_autocomplete'
+    bl_options = {'REGISTER'}
+    insert : StringProperty(name="Insert", default="", options={'SKIP_SAVE'})
+    word : StringProperty(name="Word", default="", options={'SKIP_SAVE'})
+
+    @classmethod
+    def poll(cls, context):
+        return utils.text.poll_text_editor_and_text_block(context)
+
+
+    def invoke(self, context:Context, event:Event):
+        if self.insert:
+            return self.execute(context)
+        text = context.space_data.text
+        line, column = text.current_line_index, text.current_character
+        suggestions = utils.autocomplete.Autocomplete.complete(text, line, column)
+        if not suggestions:
+            return {'CANCELLED'}
+        body = text.current_line.body[:column]
+        match = utils.autocomplete.CURSOR_RE.search(body)
+        word = match.group(2) or "" if match else ""
+        def draw(menu, context):
+            for name, kind in suggestions:
+                props = menu.layout.operator(self.bl_idname, text=f"{name}  ({kind.lower()})")
+                props.insert = name
+                props.word = word
+        context.window_manager.popup_menu(draw, title="Autocomplete")
+        return {'FINISHED'}
+
+
+    def execute(self, context:Context):
+        if not self.insert:
+            return {'CANCELLED'}
+        for _ in range(len(self.word)):
+            bpy.ops.text.delete(type='PREVIOUS_CHARACTER')
+        bpy.ops.text.insert(text=self.insert)
+        return {'FINISHED'}
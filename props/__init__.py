@@ -5,6 +5,8 @@
 # Addon
 from .addon_prefs import KBT_ADDON_Prefs
 from .addon_settings import KBT_PROP_AddonSettings
+# Text
+from .text_settings import KBT_PROP_TextSettings
 
 # ------------------------------------------------------------------------------- #
 # REGISTER
@@ -14,6 +16,8 @@ CLASSES = (
     # Addon
     KBT_PROP_AddonSettings,
     KBT_ADDON_Prefs,
+    # Text
+    KBT_PROP_TextSettings,
 )
 
 
@@ -22,9 +26,16 @@ def register():
     from bpy.utils import register_class
     for cls in CLASSES:
         register_class(cls)
+    # Pointers
+    from bpy.types import Text
+    from bpy.props import PointerProperty
+    Text.kbt = PointerProperty(type=KBT_PROP_TextSettings)
 
 
 def unregister():
+    # Pointers
+    from bpy.types import Text
+    del Text.kbt
     # Classes
     from bpy.utils import unregister_class
     for cls in reversed(CLASSES):
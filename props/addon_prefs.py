@@ -25,4 +25,6 @@ class KBT_ADDON_Prefs(AddonPreferences):
     def draw(self, context):
         layout = self.layout
         if self.tabs == 'SETTINGS':
-            pass
+            layout.prop(self.settings, 'measure_latency')
+            layout.prop(self.settings, 'disk_cache_size')
+            layout.prop(self.settings, 'redraw_max_fps')
@@ -5,6 +5,7 @@
 from bpy.types import PropertyGroup
 from bpy.props import (
     BoolProperty,
+    IntProperty,
     PointerProperty,
 )
 
@@ -14,3 +15,6 @@ from bpy.props import (
 
 class KBT_PROP_AddonSettings(PropertyGroup):
     prop : BoolProperty(name="Prop", default=False)
+    measure_latency : BoolProperty(name="Measure Latency", description="Show input to draw latency in modal tools and log it to the temp directory", default=False)
+    disk_cache_size : IntProperty(name="Disk Cache Size", description="Size cap in MB of derived mesh data cached in the config directory", default=512, min=0, soft_max=8192, subtype='UNSIGNED')
+    redraw_max_fps : IntProperty(name="Redraw Max FPS", description="Caps how often queued area redraws are flushed, 0 flushes on every timer tick", default=0, min=0, soft_max=240)
@@ -0,0 +1,17 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+from bpy.types import PropertyGroup
+from bpy.props import (
+    BoolProperty,
+    IntProperty,
+)
+
+# ------------------------------------------------------------------------------- #
+# PROPS
+# ------------------------------------------------------------------------------- #
+
+class KBT_PROP_TextSettings(PropertyGroup):
+    build_include : BoolProperty(name="Include in Build", description="Execute this text block when building the script library", default=True)
+    build_order : IntProperty(name="Build Order", description="Blocks without import dependencies between them run from low to high order", default=0)
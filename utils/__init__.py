@@ -3,18 +3,37 @@
 # ------------------------------------------------------------------------------- #
 
 from . import addon
+from . import aio
 from . import algos
+from . import autocomplete
+from . import codecache
 from . import debug
+from . import diskcache
 from . import event
+from . import fingerprint
 from . import graphics
 from . import handlers
+from . import history
 from . import labels
+from . import latency
+from . import localize
+from . import macro
 from . import maths
+from . import mesh
 from . import modal
 from . import modules
+from . import preview
 from . import props
+from . import redraw
+from . import replay
 from . import screen
+from . import scripts
+from . import search
+from . import snapshot
 from . import text
+from . import topology
+from . import undo
+from . import workers
 
 # ------------------------------------------------------------------------------- #
 # REGISTER
@@ -22,7 +41,27 @@ from . import text
 
 def register():
     handlers.register()
+    mesh.register()
+    topology.register()
+    workers.register()
+    aio.register()
+    diskcache.register()
+    scripts.register()
+    history.register()
+    autocomplete.register()
+    screen.register()
+    redraw.register()
 
 
 def unregister():
+    redraw.unregister()
+    screen.unregister()
+    autocomplete.unregister()
+    history.unregister()
+    scripts.unregister()
+    diskcache.unregister()
+    aio.unregister()
+    workers.unregister()
+    topology.unregister()
+    mesh.unregister()
     handlers.unregister()
@@ -16,3 +16,8 @@ def get_addon_name():
 def user_prefs():
     name = get_addon_name()
     return bpy.context.preferences.addons[name].preferences
+
+
+def config_directory():
+    """Returns the add-on folder in the Blender user config directory, created when missing"""
+    return bpy.utils.user_resource('CONFIG', path=get_addon_name(), create=True)
@@ -0,0 +1,253 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Event
+from collections import namedtuple
+from typing import (
+    Callable,
+    Coroutine,
+    Tuple,
+)
+import asyncio
+import time
+import traceback
+from .handlers import (
+    SPACE_TYPES, REGION_TYPES, DRAW_TYPES, ShaderHandler,
+)
+from .redraw import RedrawQueue
+from .workers import POOL_TYPES, WorkerPool
+
+# ------------------------------------------------------------------------------- #
+# TYPES
+# ------------------------------------------------------------------------------- #
+
+EventInfo = namedtuple('EventInfo', ('type', 'value', 'mouse_x', 'mouse_y', 'mouse_region_x', 'mouse_region_y', 'ctrl', 'shift', 'alt', 'time'))
+
+
+def event_info_from_event(event:Event):
+    """Returns a copy of the event data that stays valid after the modal call returns"""
+    return EventInfo(
+        event.type, event.value,
+        event.mouse_x, event.mouse_y,
+        event.mouse_region_x, event.mouse_region_y,
+        event.ctrl, event.shift, event.alt,
+        time.perf_counter())
+
+# ------------------------------------------------------------------------------- #
+# LOOP
+# ------------------------------------------------------------------------------- #
+
+class AsyncLoop:
+    """
+    Asyncio event loop stepped from bpy.app.timers.
+    Each tick runs ready callbacks until the time slice is used, so coroutines never block the UI.
+    Redraw waiters are keyed by space type and only wake when a region of that space draws.
+    """
+    _LOOP = None
+    _TIME_SLICE = 0.005
+    _INTERVAL = 0.01
+    _TICK_WAITERS = []
+    _REDRAW_WAITERS = {}
+    _EVENT_WAITERS = []
+    _REDRAW_HANDLES = {}
+
+    @classmethod
+    def loop(cls):
+        if cls._LOOP is None or cls._LOOP.is_closed():
+            cls._LOOP = asyncio.new_event_loop()
+            cls._LOOP.set_exception_handler(cls._exception_handler)
+        return cls._LOOP
+
+    @classmethod
+    def spawn(cls, coro:Coroutine):
+        """Schedules the coroutine and returns its task"""
+        if not asyncio.iscoroutine(coro):
+            return None
+        task = cls.loop().create_task(coro)
+        task.add_done_callback(cls._task_done)
+        cls._ensure_timer()
+        return task
+
+    @classmethod
+    def cancel_all(cls):
+        loop = cls._LOOP
+        if loop is None or loop.is_closed():
+            return
+        for task in asyncio.all_tasks(loop):
+            task.cancel()
+        cls._step()
+
+    @classmethod
+    def shutdown(cls):
+        cls.cancel_all()
+        if bpy.app.timers.is_registered(cls._step):
+            bpy.app.timers.unregister(cls._step)
+        cls._remove_redraw_handles()
+        cls._TICK_WAITERS.clear()
+        cls._REDRAW_WAITERS.clear()
+        cls._EVENT_WAITERS.clear()
+        if cls._LOOP is not None and not cls._LOOP.is_closed():
+            cls._LOOP.close()
+        cls._LOOP = None
+
+    @classmethod
+    def feed_event(cls, event:Event):
+        """Called from a modal operator to wake coroutines awaiting next_event"""
+        if not cls._EVENT_WAITERS:
+            return
+        info = event_info_from_event(event)
+        waiters = cls._EVENT_WAITERS[:]
+        cls._EVENT_WAITERS.clear()
+        for future, types in waiters:
+            if future.done():
+                continue
+            if types and info.type not in types:
+                cls._EVENT_WAITERS.append((future, types))
+                continue
+            future.set_result(info)
+        cls._ensure_timer()
+
+    @classmethod
+    def _step(cls):
+        loop = cls._LOOP
+        if loop is None or loop.is_closed():
+            return None
+        cls._resolve(cls._TICK_WAITERS, None)
+        deadline = time.perf_counter() + cls._TIME_SLICE
+        while True:
+            loop.stop()
+            loop.run_forever()
+            # The ready queue is private, without it only one iteration runs per tick
+            if not getattr(loop, '_ready', None):
+                break
+            if time.perf_counter() >= deadline:
+                break
+        cls._remove_redraw_handles(idle_only=True)
+        if asyncio.all_tasks(loop):
+            return 0.0 if getattr(loop, '_ready', None) else cls._INTERVAL
+        return None
+
+    @classmethod
+    def _ensure_timer(cls):
+        if not bpy.app.timers.is_registered(cls._step):
+            bpy.app.timers.register(cls._step, first_interval=0.0, persistent=True)
+
+    @classmethod
+    def _resolve(cls, waiters:list, result):
+        items = waiters[:]
+        waiters.clear()
+        for future in items:
+            if not future.done():
+                future.set_result(result)
+
+    @classmethod
+    def _redraw_callback(cls, space:SPACE_TYPES):
+        waiters = cls._REDRAW_WAITERS.get(space)
+        if waiters:
+            cls._resolve(waiters, space)
+            cls._ensure_timer()
+
+    @classmethod
+    def _add_redraw_handle(cls, space:SPACE_TYPES):
+        if space not in cls._REDRAW_HANDLES:
+            handle = ShaderHandler.add(cls._redraw_callback, (space,), space, REGION_TYPES.WINDOW, DRAW_TYPES.POST_PIXEL)
+            if handle:
+                cls._REDRAW_HANDLES[space] = handle
+
+    @classmethod
+    def _remove_redraw_handles(cls, idle_only=False):
+        """Removes the draw handles, idle_only keeps those of spaces with pending waiters"""
+        for space in list(cls._REDRAW_HANDLES):
+            if idle_only and cls._REDRAW_WAITERS.get(space):
+                continue
+            cls._REDRAW_HANDLES.pop(space).remove()
+            cls._REDRAW_WAITERS.pop(space, None)
+
+    @staticmethod
+    def _task_done(task:asyncio.Task):
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+    @staticmethod
+    def _exception_handler(loop, context):
+        print(context.get('message', "Async error"))
+        error = context.get('exception')
+        if error is not None:
+            traceback.print_exception(type(error), error, error.__traceback__)
+
+# ------------------------------------------------------------------------------- #
+# AWAITABLES
+# ------------------------------------------------------------------------------- #
+
+def next_tick():
+    """Resolves on the next timer step"""
+    future = AsyncLoop.loop().create_future()
+    AsyncLoop._TICK_WAITERS.append(future)
+    return future
+
+
+def next_redraw(space:SPACE_TYPES=SPACE_TYPES.VIEW_3D, tag=True):
+    """Resolves after the next draw of the space type, tags those areas when tag is set"""
+    future = AsyncLoop.loop().create_future()
+    AsyncLoop._REDRAW_WAITERS.setdefault(space, []).append(future)
+    AsyncLoop._add_redraw_handle(space)
+    if tag:
+        RedrawQueue.request_type(space.name)
+    return future
+
+
+def next_event(types:set=None):
+    """Resolves with an EventInfo once a modal operator feeds a matching event"""
+    future = AsyncLoop.loop().create_future()
+    AsyncLoop._EVENT_WAITERS.append((future, set(types) if types else set()))
+    return future
+
+
+async def wait_timer(seconds:float=0.0):
+    """Resolves after the delay, resolution is bound to the timer interval"""
+    await asyncio.sleep(max(seconds, 0.0))
+
+
+async def run_in_thread(func:Callable, *args):
+    """Runs blocking work such as file reads on the default thread executor"""
+    return await AsyncLoop.loop().run_in_executor(None, func, *args)
+
+
+def run_in_worker(func:Callable, args:Tuple=tuple(), pool_type:POOL_TYPES=POOL_TYPES.THREAD):
+    """Submits pure data work to a WorkerPool and returns an awaitable future"""
+    loop = AsyncLoop.loop()
+    future = loop.create_future()
+    def callback(result):
+        if not future.done():
+            future.set_result(result)
+        AsyncLoop._ensure_timer()
+    def errback(error):
+        if not future.done():
+            future.set_exception(error)
+        AsyncLoop._ensure_timer()
+    job = WorkerPool.get(pool_type).submit(func, args, callback, errback)
+    if job is None:
+        future.set_exception(RuntimeError("Worker pool is saturated"))
+    else:
+        future.add_done_callback(lambda f: job.cancel() if f.cancelled() else None)
+    return future
+
+
+def spawn(coro:Coroutine):
+    return AsyncLoop.spawn(coro)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    AsyncLoop.shutdown()
+
+
+def unregister():
+    AsyncLoop.shutdown()
@@ -0,0 +1,318 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Text
+from collections import Counter
+import bisect
+import builtins
+import heapq
+import keyword
+import re
+import time
+from .modules import LazyNamespace, get_module_from_name
+from .search import LibrarySearch, fuzzy_score
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+DEF_RE = re.compile(r"^\s*(?:async\s+)?(?:def|class)\s+([A-Za-z_][A-Za-z0-9_]*)|^\s*([A-Za-z_][A-Za-z0-9_]*)\s*(?::[^=]*)?=[^=]")
+IMPORT_RE = re.compile(r"^\s*import\s+(.+)$")
+FROM_RE = re.compile(r"^\s*from\s+([\w.]+)\s+import\s+(.+)$")
+CURSOR_RE = re.compile(r"((?:[A-Za-z_][A-Za-z0-9_]*\.)*)([A-Za-z_][A-Za-z0-9_]*)?$")
+STATIC_WORDS = tuple(keyword.kwlist) + tuple(name for name in dir(builtins) if not name.startswith('_'))
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def scan_line(line:str):
+    """Returns (identifiers, definitions, {alias : module path}) of one source line"""
+    code = line.split('#', 1)[0]
+    if not code.strip():
+        return (), (), {}
+    names = tuple(IDENT_RE.findall(code))
+    match = DEF_RE.match(code)
+    definitions = tuple(name for name in match.groups() if name) if match else ()
+    imports = {}
+    match = FROM_RE.match(code)
+    if match:
+        module = match.group(1)
+        for part in match.group(2).strip('() ').split(','):
+            words = part.split()
+            if words:
+                imports[words[-1]] = f"{module}.{words[0]}"
+    else:
+        match = IMPORT_RE.match(code)
+        if match:
+            for part in match.group(1).split(','):
+                words = part.split()
+                if len(words) == 3:
+                    imports[words[2]] = words[0]
+                elif words:
+                    root = words[0].split('.')[0]
+                    imports[root] = root
+    return names, definitions, imports
+
+# ------------------------------------------------------------------------------- #
+# INDEX
+# ------------------------------------------------------------------------------- #
+
+class TextIndex:
+    """
+    Symbols of one text block, kept per line.
+    sync splices in only the lines that differ from the previous source, scan tokenizes pending lines within a time budget.
+    """
+
+    def __init__(self):
+        self.lines = []
+        self.scanned = []
+        self.pending = set()
+        self.names = Counter()
+        self.definitions = Counter()
+        self.sorted_names = []
+        self.imports = {}
+        self.source = None
+        self.stale = False
+
+    def sync(self, source:str):
+        """Splices changed lines in and marks them pending, returns the number of changed lines"""
+        if source == self.source:
+            return 0
+        self.source = source
+        lines = source.split('\n')
+        old = self.lines
+        limit = min(len(old), len(lines))
+        prefix = 0
+        while prefix < limit and old[prefix] == lines[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == lines[-1 - suffix]:
+            suffix += 1
+        old_end = len(old) - suffix
+        new_end = len(lines) - suffix
+        for index in range(prefix, old_end):
+            self.forget(index)
+        delta = new_end - old_end
+        self.pending = {index if index < old_end else index + delta for index in self.pending if not prefix <= index < old_end}
+        self.lines = lines
+        self.scanned[prefix:old_end] = [None] * (new_end - prefix)
+        self.pending.update(range(prefix, new_end))
+        return new_end - prefix
+
+    def sync_line(self, index:int, body:str):
+        """Splices one line in when it differs, returns 1 when it changed"""
+        if self.lines[index] == body:
+            return 0
+        self.forget(index)
+        self.lines[index] = body
+        self.scanned[index] = None
+        self.pending.add(index)
+        self.source = None
+        return 1
+
+    def forget(self, index:int):
+        entry = self.scanned[index]
+        if entry is None:
+            return
+        names, definitions, imports = entry
+        for counter, values in ((self.names, names), (self.definitions, definitions)):
+            counter.subtract(values)
+            for name in values:
+                if counter.get(name, 0) <= 0 and counter.pop(name, None) is not None and counter is self.names:
+                    key = (name.lower(), name)
+                    position = bisect.bisect_left(self.sorted_names, key)
+                    if position < len(self.sorted_names) and self.sorted_names[position] == key:
+                        del self.sorted_names[position]
+        for alias in imports:
+            if self.imports.get(alias, (None, None))[1] is entry:
+                del self.imports[alias]
+
+    def scan(self, budget:float=0.002, first:set=None):
+        """Tokenizes pending lines, lines in first go before the rest, returns True when nothing is pending"""
+        start = time.perf_counter()
+        order = [index for index in first or () if index in self.pending]
+        order.extend(self.pending.difference(order) if self.pending else ())
+        for count, index in enumerate(order):
+            if count % 64 == 0 and time.perf_counter() - start > budget:
+                return False
+            self.pending.discard(index)
+            entry = scan_line(self.lines[index])
+            self.scanned[index] = entry
+            names, definitions, imports = entry
+            for name in set(names):
+                if name not in self.names:
+                    bisect.insort(self.sorted_names, (name.lower(), name))
+            self.names.update(names)
+            self.definitions.update(definitions)
+            for alias, path in imports.items():
+                self.imports[alias] = (path, entry)
+        return not self.pending
+
+    def names_with_prefix(self, prefix:str, cap:int=1000):
+        """Returns up to cap names whose lowercase form starts with the lowercase prefix"""
+        prefix = prefix.lower()
+        start = bisect.bisect_left(self.sorted_names, (prefix,))
+        names = []
+        for lowered, name in self.sorted_names[start:start + cap]:
+            if not lowered.startswith(prefix):
+                break
+            names.append(name)
+        return names
+
+    @property
+    def complete(self):
+        return not self.pending
+
+# ------------------------------------------------------------------------------- #
+# ENGINE
+# ------------------------------------------------------------------------------- #
+
+class Autocomplete:
+    """
+    Completion for the Text Editor from local symbols, builtins, importable modules and module attributes.
+    While the line count is unchanged a request only compares the cursor line, the full text is diffed from a timer.
+    Each request re-tokenizes only the edited lines, the remaining lines are indexed from a timer in slices.
+    Indexes are keyed by the text datablock so renaming a text keeps its index.
+    """
+    _INDEXES = {}
+    _INTERVAL = 0.02
+    _BUDGET = 0.003
+
+    @classmethod
+    def index(cls, text:Text):
+        key = text.as_pointer()
+        index = cls._INDEXES.get(key)
+        if index is None:
+            index = cls._INDEXES[key] = TextIndex()
+        return index
+
+    @classmethod
+    def complete(cls, text:Text, line:int, column:int, limit:int=20):
+        """Returns [(name, kind)] for the word before the cursor, best first"""
+        index = cls.index(text)
+        lines = text.lines
+        if len(lines) != len(index.lines):
+            index.sync(text.as_string())
+        elif line < len(lines):
+            index.sync_line(line, lines[line].body)
+            index.stale = True
+        index.scan(cls._BUDGET, first={line})
+        if index.pending or index.stale:
+            cls._ensure_timer()
+        if line >= len(index.lines):
+            return []
+        match = CURSOR_RE.search(index.lines[line][:column])
+        if match is None:
+            return []
+        base, word = match.group(1).rstrip('.'), match.group(2) or ""
+        if base:
+            return cls.attributes(index, base, word, limit)
+        if not word:
+            return []
+        before = index.lines[line][:column - len(word)].strip()
+        if before in {'import', 'from'} or before.startswith('import ') and before.endswith(','):
+            return cls.modules(word, limit)
+        match = FROM_RE.match(f"{before} _")
+        if match and match.group(2) == "_":
+            return cls.attributes(index, match.group(1), word, limit)
+        # Locals by prefix, widened to the first letter for fuzzy matches when few names share the prefix
+        names = index.names_with_prefix(word)
+        if len(names) <= limit:
+            names = index.names_with_prefix(word[0], cap=600)
+        candidates = []
+        for name in names:
+            if name != word:
+                candidates.append((name, 'DEFINITION' if index.definitions.get(name, 0) > 0 else 'LOCAL', index.names[name]))
+        candidates.extend((name, 'MODULE', 1) for name in index.imports)
+        candidates.extend((name, 'BUILTIN', 0) for name in STATIC_WORDS)
+        return cls.rank(word, candidates, limit)
+
+    @staticmethod
+    def modules(word:str, limit:int):
+        """Importable modules from the shared library search index, empty until its first build fills it"""
+        LibrarySearch.ensure_built()
+        return [(symbol.name, 'MODULE') for _, symbol in LibrarySearch.search(word, limit, kinds={'MODULE'})]
+
+    @classmethod
+    def attributes(cls, index:TextIndex, base:str, word:str, limit:int):
+        parts = base.split('.')
+        imported = index.imports.get(parts[0])
+        path = ".".join([imported[0]] + parts[1:]) if imported else base
+        try: module = get_module_from_name(path)
+        except Exception: module = None
+        if module is None:
+            return []
+        namespace = LazyNamespace.get(module)
+        names = namespace.names(public=not word.startswith('_'))
+        if not word:
+            return [(name, namespace.kind(name)) for name in names[:limit]]
+        lowered = word.lower()
+        matches = [name for name in names if name.lower().startswith(lowered)]
+        if len(matches) > limit:
+            names = matches
+        return cls.rank(word, ((name, namespace.kind(name), 0) for name in names), limit)
+
+    @staticmethod
+    def rank(word:str, candidates, limit:int):
+        """Prefix matches first, then fuzzy matches, frequency breaks ties"""
+        lowered = word.lower()
+        scored = []
+        seen = set()
+        for name, kind, count in candidates:
+            if name in seen:
+                continue
+            seen.add(name)
+            if name.startswith(word):
+                score = 2.0
+            elif name.lower().startswith(lowered):
+                score = 1.5
+            else:
+                score = fuzzy_score(lowered, name.lower())
+                if score <= 0.0:
+                    continue
+            score += min(count, 50) * 0.005 + (0.2 if kind == 'DEFINITION' else 0.0)
+            scored.append((score, -len(name), name, kind))
+        return [(name, kind) for _, _, name, kind in heapq.nlargest(limit, scored)]
+
+    @classmethod
+    def _ensure_timer(cls):
+        if not bpy.app.timers.is_registered(cls._step):
+            bpy.app.timers.register(cls._step, first_interval=cls._INTERVAL)
+
+    @classmethod
+    def _step(cls):
+        """Timer callback, diffs texts edited since the last full sync and indexes pending lines within the budget"""
+        busy = False
+        texts = {text.as_pointer() : text for text in bpy.data.texts}
+        for key, index in list(cls._INDEXES.items()):
+            text = texts.get(key)
+            if text is None:
+                del cls._INDEXES[key]
+                continue
+            if index.stale:
+                index.stale = False
+                index.sync(text.as_string())
+            if index.pending and not index.scan(cls._BUDGET):
+                busy = True
+        return cls._INTERVAL if busy else None
+
+    @classmethod
+    def clear(cls):
+        cls._INDEXES.clear()
+        if bpy.app.timers.is_registered(cls._step):
+            bpy.app.timers.unregister(cls._step)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    Autocomplete.clear()
+
+
+def unregister():
+    Autocomplete.clear()
@@ -0,0 +1,99 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+from collections import OrderedDict
+from types import CodeType
+import hashlib
+import importlib.util
+import marshal
+import os
+from .addon import config_directory
+
+# ------------------------------------------------------------------------------- #
+# CACHE
+# ------------------------------------------------------------------------------- #
+
+class CodeCache:
+    """
+    Code objects keyed by a hash of the source, filename and interpreter magic number.
+    Held in a bounded LRU in memory, persist also marshals them into the config directory across sessions.
+    """
+    _DEFAULT = None
+
+    @classmethod
+    def default(cls):
+        if cls._DEFAULT is None:
+            cls._DEFAULT = cls()
+        return cls._DEFAULT
+
+    def __init__(self, limit:int=512, persist=False, directory:str=""):
+        self.limit = limit
+        self.persist = persist
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source:str, filename:str):
+        digest = hashlib.sha1(importlib.util.MAGIC_NUMBER)
+        digest.update(filename.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+
+    def disk_path(self, key:str):
+        if not self.directory:
+            self.directory = os.path.join(config_directory(), "code")
+        os.makedirs(self.directory, exist_ok=True)
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def compile(self, source:str, filename:str="<string>"):
+        """Returns the code object, compiling only when the source was not seen before"""
+        key = self.key(source, filename)
+        code = self.entries.get(key)
+        if code is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return code
+        code = self.load(key) if self.persist else None
+        if code is None:
+            self.misses += 1
+            code = compile(source, filename, 'exec')
+            if self.persist:
+                self.save(key, code)
+        else:
+            self.hits += 1
+        self.entries[key] = code
+        while len(self.entries) > self.limit:
+            self.entries.popitem(last=False)
+        return code
+
+    def load(self, key:str):
+        try:
+            with open(self.disk_path(key), 'rb') as file:
+                code = marshal.load(file)
+            return code if isinstance(code, CodeType) else None
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def save(self, key:str, code:CodeType):
+        path = self.disk_path(key)
+        temp = path + ".tmp"
+        try:
+            with open(temp, 'wb') as file:
+                marshal.dump(code, file)
+            os.replace(temp, path)
+        except OSError:
+            return False
+        return True
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def compile_cached(source:str, filename:str="<string>"):
+    return CodeCache.default().compile(source, filename)
@@ -0,0 +1,236 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import gc
+import json
+import numpy as np
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from .addon import config_directory, user_prefs
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+INDEX_NAME = "index.json"
+DEFAULT_SIZE_CAP = 512 * 1024 * 1024
+INDEX_FLUSH_INTERVAL = 5.0
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def cache_key(kind:str, *parts):
+    """Returns a file system safe key from the kind and fingerprint parts"""
+    text = "-".join([kind] + [str(part) for part in parts])
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", text)
+
+
+def size_cap_from_prefs():
+    try: return user_prefs().settings.disk_cache_size * 1024 * 1024
+    except (AttributeError, KeyError): return DEFAULT_SIZE_CAP
+
+
+def folder_size(path:str):
+    try: return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+    except OSError: return 0
+
+# ------------------------------------------------------------------------------- #
+# CACHE
+# ------------------------------------------------------------------------------- #
+
+class DiskCache:
+    """
+    Derived mesh arrays stored across sessions, keyed by mesh content fingerprints.
+    Each entry is a folder of .npy files so arrays load memory-mapped, the JSON index tracks size and last use.
+    Entries are evicted least recently used first once the size cap is exceeded, a size_cap of None follows the preference.
+    Folders that fail to delete, memory maps keep them open on Windows, stay on a retry list and count toward the cap.
+    """
+    _DEFAULT = None
+
+    @classmethod
+    def default(cls):
+        if cls._DEFAULT is None:
+            cls._DEFAULT = cls(os.path.join(config_directory(), "cache"))
+        return cls._DEFAULT
+
+    @classmethod
+    def close_default(cls):
+        if cls._DEFAULT is not None:
+            cls._DEFAULT.flush()
+        cls._DEFAULT = None
+
+    def __init__(self, directory:str, size_cap:int=None):
+        self.directory = directory
+        self.size_cap = size_cap
+        self.lock = threading.Lock()
+        self.index = {}
+        self.removals = {}
+        self.dirty = False
+        self.flush_time = 0.0
+        os.makedirs(directory, exist_ok=True)
+        self.load_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_NAME)
+
+    @property
+    def cap(self):
+        return self.size_cap if self.size_cap is not None else size_cap_from_prefs()
+
+    @property
+    def nbytes(self):
+        return sum(entry['bytes'] for entry in self.index.values()) + sum(self.removals.values())
+
+    def entry_path(self, key:str):
+        return os.path.join(self.directory, key)
+
+    def load_index(self):
+        try:
+            with open(self.index_path, 'r') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+        self.index = {key : entry for key, entry in index.items() if os.path.isdir(self.entry_path(key))}
+        # Folders left by failed deletions of earlier sessions
+        for name in os.listdir(self.directory):
+            path = self.entry_path(name)
+            if name not in self.index and not name.startswith(".tmp-") and os.path.isdir(path):
+                self.removals[path] = folder_size(path)
+        self.retry_removals()
+
+    def flush(self, force=True):
+        """Writes the index, access time updates are batched unless forced"""
+        if not self.dirty:
+            return False
+        if not force and time.time() - self.flush_time < INDEX_FLUSH_INTERVAL:
+            return False
+        with self.lock:
+            index = dict(self.index)
+            self.dirty = False
+            self.flush_time = time.time()
+        temp = self.index_path + ".tmp"
+        with open(temp, 'w') as file:
+            json.dump(index, file)
+        os.replace(temp, self.index_path)
+        return True
+
+    def __contains__(self, key:str):
+        return key in self.index
+
+    def get(self, key:str, mmap=True):
+        """Returns a dict of arrays or None, arrays are read-only memory maps unless mmap is False"""
+        entry = self.index.get(key)
+        if entry is None:
+            return None
+        path = self.entry_path(key)
+        try:
+            arrays = {name : np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r' if mmap else None) for name in entry['arrays']}
+        except (OSError, ValueError):
+            self.remove(key)
+            return None
+        with self.lock:
+            entry['atime'] = time.time()
+            self.dirty = True
+        self.flush(force=False)
+        return arrays
+
+    def put(self, key:str, arrays:dict):
+        """Stores the arrays under the key, the entry is written to a temp folder and moved into place"""
+        if not arrays:
+            return False
+        temp = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for name, array in arrays.items():
+                np.save(os.path.join(temp, f"{name}.npy"), np.ascontiguousarray(array), allow_pickle=False)
+            nbytes = sum(os.path.getsize(os.path.join(temp, name)) for name in os.listdir(temp))
+            path = self.entry_path(key)
+            if os.path.isdir(path):
+                entry = self.index.pop(key, None)
+                if not self.delete_folder(path, entry['bytes'] if entry else folder_size(path)):
+                    raise OSError(f"Could not replace {path}")
+            os.replace(temp, path)
+        except OSError:
+            shutil.rmtree(temp, ignore_errors=True)
+            return False
+        with self.lock:
+            self.index[key] = {'arrays' : list(arrays.keys()), 'bytes' : nbytes, 'atime' : time.time()}
+            self.dirty = True
+        self.evict()
+        self.flush()
+        return True
+
+    def remove(self, key:str):
+        """Drops the entry, returns False when its folder could not be deleted yet and was queued for a retry"""
+        with self.lock:
+            entry = self.index.pop(key, None)
+            self.dirty = True
+        return self.delete_folder(self.entry_path(key), entry['bytes'] if entry else 0)
+
+    def delete_folder(self, path:str, nbytes:int):
+        """Deletes the folder, collects unreachable memory maps and tries again before queueing it"""
+        for attempt in range(2):
+            try:
+                shutil.rmtree(path)
+                break
+            except FileNotFoundError:
+                break
+            except OSError:
+                if attempt == 0:
+                    gc.collect()
+        else:
+            self.removals[path] = nbytes
+            return False
+        self.removals.pop(path, None)
+        return True
+
+    def retry_removals(self):
+        """Retries queued deletions without collecting, returns the number still queued"""
+        for path in list(self.removals):
+            try:
+                shutil.rmtree(path)
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del self.removals[path]
+        return len(self.removals)
+
+    def evict(self):
+        """Removes least recently used entries until the cache fits the size cap, folders that fail to delete keep counting"""
+        cap = self.cap
+        if self.removals:
+            self.retry_removals()
+        total = self.nbytes
+        if total <= cap:
+            return 0
+        removed = 0
+        for key, entry in sorted(self.index.items(), key=lambda item: item[1]['atime']):
+            if total <= cap:
+                break
+            if self.remove(key):
+                total -= entry['bytes']
+            removed += 1
+        return removed
+
+    def clear(self):
+        for key in list(self.index.keys()):
+            self.remove(key)
+        self.flush()
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    DiskCache.close_default()
+
+
+def unregister():
+    DiskCache.close_default()
@@ -0,0 +1,161 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+from bpy.types import Mesh, Object
+from mathutils import Matrix
+import hashlib
+import numpy as np
+import zlib
+from .mesh import MeshData, mesh_from_object
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+BLOCK_SIZE = 1 << 16
+
+COORD_KEYS = ('coords',)
+TOPOLOGY_KEYS = ('edges', 'loop_verts', 'loop_totals')
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def block_hashes(array:np.ndarray, block_size:int=BLOCK_SIZE):
+    """Returns the CRC32 of each block_size bytes of the array as a uint32 array"""
+    view = memoryview(np.ascontiguousarray(array)).cast('B')
+    return np.fromiter((zlib.crc32(view[i:i + block_size]) for i in range(0, len(view), block_size)), dtype=np.uint32)
+
+
+def combine_hashes(hashes, seed:bytes=b""):
+    """Returns a single 64 bit digest of block hashes"""
+    digest = hashlib.blake2b(seed, digest_size=8)
+    digest.update(np.ascontiguousarray(hashes, dtype=np.uint32).tobytes())
+    return int.from_bytes(digest.digest(), 'little')
+
+
+def matrix_hash(matrix:Matrix, precision:int=6):
+    """Returns a digest of the matrix values rounded to the precision"""
+    if not isinstance(matrix, Matrix):
+        return 0
+    values = np.round(np.array(matrix, dtype=np.float64), precision) + 0.0
+    return zlib.crc32(values.tobytes())
+
+# ------------------------------------------------------------------------------- #
+# FINGERPRINT
+# ------------------------------------------------------------------------------- #
+
+class MeshFingerprint:
+    """
+    Block-wise content hash of the coordinate and topology buffers of a mesh.
+    Unlike session_uid it changes when the geometry is edited, and compare localizes the change to element ranges.
+    """
+
+    _TOPOLOGY = {}
+    _TOPOLOGY_LIMIT = 256
+
+    @classmethod
+    def frame_key(cls, data:MeshData, topology_changed=False):
+        """
+        Returns (topology, coords) digests for per frame use.
+        Coordinates are hashed on every call, topology only when the element counts change or the caller reports a topology edit.
+        """
+        uid = data.mesh.session_uid
+        counts = data.counts
+        cached = cls._TOPOLOGY.pop(uid, None)
+        if topology_changed or cached is None or cached[0] != counts:
+            cached = (counts, cls.from_mesh_data(data, keys=TOPOLOGY_KEYS).topology)
+        while len(cls._TOPOLOGY) >= cls._TOPOLOGY_LIMIT:
+            del cls._TOPOLOGY[next(iter(cls._TOPOLOGY))]
+        cls._TOPOLOGY[uid] = cached
+        return cached[1], cls.from_mesh_data(data, keys=COORD_KEYS).coords
+
+    @classmethod
+    def from_mesh(cls, mesh:Mesh, block_size:int=BLOCK_SIZE):
+        data = MeshData.get(mesh)
+        if data is None:
+            return None
+        return cls.from_mesh_data(data, block_size)
+
+    @classmethod
+    def from_mesh_data(cls, data:MeshData, block_size:int=BLOCK_SIZE, keys=COORD_KEYS + TOPOLOGY_KEYS):
+        """Hashes only the buffers in keys, topology caches can skip the coordinates"""
+        readers = {
+            'coords'      : data.vertex_positions,
+            'edges'       : data.edge_vertices,
+            'loop_verts'  : data.loop_vertices,
+            'loop_totals' : data.face_loop_totals,
+        }
+        return cls({key : readers[key]() for key in keys}, block_size)
+
+    def __init__(self, buffers:dict, block_size:int=BLOCK_SIZE):
+        self.block_size = block_size
+        self.counts = {key : len(array) for key, array in buffers.items()}
+        self.item_sizes = {key : array.itemsize * int(np.prod(array.shape[1:], dtype=np.int64)) for key, array in buffers.items()}
+        self.blocks = {key : block_hashes(array, block_size) for key, array in buffers.items()}
+        self.coords = self.digest(COORD_KEYS)
+        self.topology = self.digest(TOPOLOGY_KEYS)
+
+    def digest(self, keys=None):
+        """Returns a 64 bit blake2b digest of the counts and block hashes, safe as a persistent cache key"""
+        digest = hashlib.blake2b(digest_size=8)
+        for key in sorted(self.blocks) if keys is None else keys:
+            if key in self.blocks:
+                digest.update(key.encode())
+                digest.update(self.counts[key].to_bytes(8, 'little'))
+                digest.update(self.blocks[key].tobytes())
+        return int.from_bytes(digest.digest(), 'little')
+
+    @property
+    def key(self):
+        return (self.topology, self.coords)
+
+    def __eq__(self, other):
+        return isinstance(other, MeshFingerprint) and self.key == other.key and self.counts == other.counts
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def changed_blocks(self, other, key:str='coords'):
+        """Returns the indices of blocks that differ or None when the buffer was resized"""
+        if not isinstance(other, MeshFingerprint) or self.counts.get(key) != other.counts.get(key) or self.block_size != other.block_size:
+            return None
+        return np.flatnonzero(self.blocks[key] != other.blocks[key])
+
+    def changed_ranges(self, other, key:str='coords'):
+        """Returns [(first, last)) element ranges that differ or None when the buffer was resized"""
+        blocks = self.changed_blocks(other, key)
+        if blocks is None:
+            return None
+        item_size = self.item_sizes[key]
+        count = self.counts[key]
+        ranges = []
+        for block in blocks:
+            first = (int(block) * self.block_size) // item_size
+            last = min(count, -(-(int(block) + 1) * self.block_size // item_size))
+            if ranges and ranges[-1][1] >= first:
+                ranges[-1] = (ranges[-1][0], last)
+            else:
+                ranges.append((first, last))
+        return ranges
+
+    def cache_key(self, matrix:Matrix=None):
+        """Returns a hashable key for caches of derived data, world space data should pass the object matrix"""
+        return self.key + (matrix_hash(matrix),)
+
+
+def object_cache_key(obj:Object, world=True, data:MeshData=None, sync=True, topology_changed=False):
+    """
+    Returns a cache key of the object mesh content and optionally its world matrix.
+    Pass data already synced this frame, or sync=False, to skip the edit mode write-back on every call.
+    Topology is rehashed only when counts change, pass topology_changed after edits that keep the counts.
+    """
+    if data is None:
+        if not isinstance(obj, Object) or obj.type != 'MESH':
+            return None
+        mesh = mesh_from_object(obj) if sync else obj.data
+        data = MeshData.get(mesh)
+    if data is None:
+        return None
+    return MeshFingerprint.frame_key(data, topology_changed) + (matrix_hash(obj.matrix_world if world else None),)
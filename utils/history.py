@@ -0,0 +1,204 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Operator
+from collections import namedtuple
+from mathutils import Color, Euler, Matrix, Quaternion, Vector
+import time
+import traceback
+from .modules import get_bpy_ops_py_string, get_bpy_ops_rna_schema
+
+# ------------------------------------------------------------------------------- #
+# TYPES
+# ------------------------------------------------------------------------------- #
+
+HistoryEntry = namedtuple('HistoryEntry', ('bl_idname', 'py_path', 'values', 'time'))
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def plain_value(value):
+    """Returns the property value as a plain python value that survives the operator being freed"""
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, set):
+        return frozenset(value)
+    if isinstance(value, Matrix):
+        return tuple(tuple(row) for row in value)
+    if isinstance(value, (Vector, Euler, Quaternion, Color)):
+        return tuple(value)
+    try: return tuple(value)
+    except TypeError: return None
+
+
+def operator_values(op:Operator):
+    """Returns ((identifier, value), ...) of the writable properties set on the operator"""
+    props = op.properties
+    schema = get_bpy_ops_rna_schema(op.bl_idname, props)
+    values = []
+    for identifier, info in schema.items():
+        if info['DATA_TYPE'] in {'POINTER', 'COLLECTION'}:
+            continue
+        if not props.is_property_set(identifier):
+            continue
+        value = plain_value(getattr(props, identifier))
+        if value is not None:
+            values.append((identifier, value))
+    return tuple(values)
+
+
+def entry_py_string(entry:HistoryEntry):
+    args = ", ".join(f"{identifier}={set(value) if isinstance(value, frozenset) else value!r}" for identifier, value in entry.values)
+    return f"{entry.py_path}({args})"
+
+# ------------------------------------------------------------------------------- #
+# RING BUFFER
+# ------------------------------------------------------------------------------- #
+
+class RingBuffer:
+    """Fixed capacity buffer, appends overwrite the oldest item and indexing from either end is O(1)"""
+
+    def __init__(self, capacity:int=256):
+        self.capacity = max(capacity, 1)
+        self.items = [None] * self.capacity
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index:int):
+        if index < 0:
+            index += self.count
+        if index < 0 or index >= self.count:
+            raise IndexError(index)
+        return self.items[(self.head - self.count + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+    def append(self, item):
+        self.items[self.head] = item
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def replace_last(self, item):
+        if self.count == 0:
+            return self.append(item)
+        self.items[(self.head - 1) % self.capacity] = item
+
+    def last(self, n:int):
+        """Returns the newest n items, oldest first"""
+        n = min(n, self.count)
+        return [self[index] for index in range(self.count - n, self.count)]
+
+    def clear(self):
+        self.items = [None] * self.capacity
+        self.head = 0
+        self.count = 0
+
+# ------------------------------------------------------------------------------- #
+# HISTORY
+# ------------------------------------------------------------------------------- #
+
+class OperatorHistory:
+    """
+    Captures operators as they land in window_manager.operators.
+    A timer aligns the (pointer, bl_idname) list of the stack against the one seen at the last capture,
+    so a reused address alone cannot hide a new operator and an Adjust Last Operation redo replaces its entry,
+    property schemas come from the per bl_idname cache in utils.modules.
+    """
+    _BUFFER = RingBuffer(512)
+    _SEEN = []
+    _INTERVAL = 0.25
+
+    @classmethod
+    def start(cls):
+        if not bpy.app.timers.is_registered(cls._poll):
+            bpy.app.timers.register(cls._poll, first_interval=cls._INTERVAL, persistent=True)
+
+    @classmethod
+    def stop(cls):
+        if bpy.app.timers.is_registered(cls._poll):
+            bpy.app.timers.unregister(cls._poll)
+
+    @classmethod
+    def entries(cls):
+        return cls._BUFFER
+
+    @classmethod
+    def last(cls, n:int=1):
+        return cls._BUFFER.last(n)
+
+    @classmethod
+    def clear(cls):
+        cls._BUFFER.clear()
+        cls._SEEN = []
+
+    @staticmethod
+    def align(seen:list, current:list):
+        """Returns (number of current entries already captured, True when the last of those was redone)"""
+        for dropped in range(len(seen) + 1):
+            tail = seen[dropped:]
+            if current[:len(tail)] == tail:
+                return len(tail), False
+            if tail and len(current) >= len(tail) and current[:len(tail) - 1] == tail[:-1] and current[len(tail) - 1][1] == tail[-1][1]:
+                return len(tail) - 1, True
+        return 0, False
+
+    @classmethod
+    def capture(cls):
+        """Appends the operators registered since the last capture, returns how many were added or redone"""
+        try: operators = bpy.context.window_manager.operators
+        except AttributeError: return 0
+        operators = list(operators)
+        current = [(op.as_pointer(), op.bl_idname) for op in operators]
+        if current == cls._SEEN:
+            # Redo can also rerun the same operator in place with new values
+            if not operators or not len(cls._BUFFER):
+                return 0
+            op = operators[-1]
+            values = operator_values(op)
+            if values == cls._BUFFER[-1].values:
+                return 0
+            cls._BUFFER.replace_last(HistoryEntry(op.bl_idname, get_bpy_ops_py_string(op), values, time.time()))
+            return 1
+        known, redone = cls.align(cls._SEEN, current)
+        cls._SEEN = current
+        now = time.time()
+        new = operators[known:]
+        if redone:
+            op = new.pop(0)
+            cls._BUFFER.replace_last(HistoryEntry(op.bl_idname, get_bpy_ops_py_string(op), operator_values(op), now))
+        for op in new:
+            cls._BUFFER.append(HistoryEntry(op.bl_idname, get_bpy_ops_py_string(op), operator_values(op), now))
+        return len(new) + int(redone)
+
+    @classmethod
+    def _poll(cls):
+        try: cls.capture()
+        except Exception: traceback.print_exc()
+        return cls._INTERVAL
+
+    @classmethod
+    def script(cls, n:int=None):
+        """Returns python source replaying the newest n entries"""
+        entries = list(cls._BUFFER) if n is None else cls._BUFFER.last(n)
+        return "\n".join(["import bpy", ""] + [entry_py_string(entry) for entry in entries]) + "\n"
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    OperatorHistory.clear()
+    OperatorHistory.start()
+
+
+def unregister():
+    OperatorHistory.stop()
+    OperatorHistory.clear()
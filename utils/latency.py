@@ -0,0 +1,148 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from collections import deque
+from typing import Callable
+import json
+import os
+import statistics
+import tempfile
+import time
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def percentile(values, fraction:float):
+    """Returns the nearest rank percentile of the values, 0.0 when empty"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def default_log_path():
+    directory = bpy.app.tempdir or tempfile.gettempdir()
+    return os.path.join(directory, "kbt_latency.jsonl")
+
+# ------------------------------------------------------------------------------- #
+# MONITOR
+# ------------------------------------------------------------------------------- #
+
+class LatencyMonitor:
+    """
+    Input to draw latency for a modal operator.
+    Inputs are stamped when the modal receives them, applied when an update changes state,
+    and matched to the first draw that follows.
+    """
+
+    def __init__(self, name:str="", window:int=240, show_hud=True):
+        self.name = name
+        self.show_hud = show_hud
+        self.start_time = time.perf_counter()
+        # Samples
+        self.latencies = deque(maxlen=window)
+        self.update_times = deque(maxlen=window)
+        self.draw_times = {}
+        # Counters
+        self.inputs = 0
+        self.matched = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.frames = 0
+        # Pending
+        self.pending = []
+        self.applied = []
+        self.update_start = 0.0
+        self.msgs = None
+
+    def input(self):
+        self.inputs += 1
+        self.pending.append(time.perf_counter())
+
+    def coalesce(self):
+        self.coalesced += 1
+
+    def update_begin(self):
+        self.update_start = time.perf_counter()
+
+    def update_end(self, changed:bool):
+        self.update_times.append((time.perf_counter() - self.update_start) * 1000)
+        if changed:
+            self.applied.extend(self.pending)
+        else:
+            self.dropped += len(self.pending)
+        self.pending.clear()
+
+    def draw_begin(self):
+        if not self.applied:
+            return
+        now = time.perf_counter()
+        for stamp in self.applied:
+            self.latencies.append((now - stamp) * 1000)
+        self.matched += len(self.applied)
+        self.applied.clear()
+        self.frames += 1
+
+    def draw_end(self, phase:str, start:float):
+        samples = self.draw_times.get(phase)
+        if samples is None:
+            samples = deque(maxlen=self.latencies.maxlen)
+            self.draw_times[phase] = samples
+        samples.append((time.perf_counter() - start) * 1000)
+
+    def wrap_draw(self, func:Callable, phase:str):
+        def wrapper(context):
+            start = time.perf_counter()
+            self.draw_begin()
+            func(context)
+            self.draw_end(phase, start)
+            if self.show_hud and phase == 'draw_2d':
+                self.draw_hud()
+        return wrapper
+
+    def stats(self):
+        latencies = list(self.latencies)
+        return {
+            'name'       : self.name,
+            'duration_s' : time.perf_counter() - self.start_time,
+            'inputs'     : self.inputs,
+            'matched'    : self.matched,
+            'coalesced'  : self.coalesced,
+            'dropped'    : self.dropped,
+            'frames'     : self.frames,
+            'latency_ms' : {
+                'p50'  : percentile(latencies, 0.50),
+                'p95'  : percentile(latencies, 0.95),
+                'max'  : max(latencies, default=0.0),
+                'mean' : statistics.fmean(latencies) if latencies else 0.0,
+            },
+            'update_ms'  : statistics.fmean(self.update_times) if self.update_times else 0.0,
+            'draw_ms'    : {phase : statistics.fmean(samples) for phase, samples in self.draw_times.items() if samples},
+        }
+
+    def draw_hud(self, x:float=15, y:float=60):
+        from .graphics import Msgs
+        if self.msgs is None:
+            self.msgs = Msgs(size=11, color_a=(0.6, 0.6, 0.6, 1.0))
+        stats = self.stats()
+        lat = stats['latency_ms']
+        self.msgs.clear()
+        self.msgs.add("Latency", f"p50 {lat['p50']:.1f}  p95 {lat['p95']:.1f}  max {lat['max']:.1f} ms")
+        self.msgs.add("Update", f"{stats['update_ms']:.2f} ms")
+        for phase, value in stats['draw_ms'].items():
+            self.msgs.add(phase.replace('_', ' ').title(), f"{value:.2f} ms")
+        self.msgs.add("Events", f"{stats['inputs']} in  {stats['coalesced']} coalesced  {stats['dropped']} dropped")
+        self.msgs.draw(x, y)
+
+    def write_log(self, path:str=""):
+        path = path or default_log_path()
+        try:
+            with open(path, 'a') as file:
+                file.write(json.dumps(self.stats()) + "\n")
+        except OSError as e:
+            print(e)
+            return False
+        return True
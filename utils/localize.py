@@ -0,0 +1,170 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bmesh
+from mathutils import Matrix
+from .preview import MeshPreview
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def selected_seed_faces(bm:bmesh.types.BMesh):
+    """Returns the visible faces touching the selection"""
+    faces = set()
+    for vert in bm.verts:
+        if vert.select and not vert.hide:
+            faces.update(face for face in vert.link_faces if not face.hide)
+    return faces
+
+
+def grow_faces(faces:set, rings:int=1):
+    """Returns the faces grown by n rings through shared vertices"""
+    region = set(faces)
+    front = set(faces)
+    for _ in range(max(rings, 0)):
+        verts = {vert for face in front for vert in face.verts}
+        grown = {face for vert in verts for face in vert.link_faces if not face.hide}
+        front = grown - region
+        if not front:
+            break
+        region |= front
+    return region
+
+# ------------------------------------------------------------------------------- #
+# REGION
+# ------------------------------------------------------------------------------- #
+
+class LocalRegion:
+    """
+    Small working BMesh cut from the selection plus an n ring neighborhood.
+    Interactive operations run on the working copy, the full mesh is only touched on splice.
+    The working copy is cut from a full copy and spliced back with duplicate, so every custom data layer survives the round trip.
+    Boundary vertices are shared with the rest of the mesh and are welded back by index on splice.
+    """
+    SOURCE_LAYER = "kbt_source_index"
+
+    def __init__(self, bm:bmesh.types.BMesh, rings:int=1):
+        bm.verts.ensure_lookup_table()
+        bm.verts.index_update()
+        bm.faces.index_update()
+        # Region
+        faces = grow_faces(selected_seed_faces(bm), rings)
+        self.face_indices = sorted(face.index for face in faces)
+        verts = {vert for face in faces for vert in face.verts}
+        self.vert_indices = sorted(vert.index for vert in verts)
+        self.boundary = {vert.index for vert in verts if any(face not in faces for face in vert.link_faces)}
+        self.boundary_coords = {vert.index : vert.co.copy() for vert in verts if vert.index in self.boundary}
+        # Working Copy
+        self.pristine = self.extract(bm, faces)
+        self.bm = self.pristine.copy()
+        self.changed = True
+        self.preview = MeshPreview(color=(0.3, 0.6, 1.0, 1.0))
+
+    @property
+    def is_empty(self):
+        return not self.face_indices
+
+    def extract(self, bm:bmesh.types.BMesh, faces:set):
+        """Cuts the region from a copy of the full mesh so every custom data layer comes along"""
+        local = bm.copy()
+        local.verts.index_update()
+        local.faces.index_update()
+        keep_faces = {face.index for face in faces}
+        keep_verts = set(self.vert_indices)
+        bmesh.ops.delete(local, geom=[face for face in local.faces if face.index not in keep_faces], context='FACES_ONLY')
+        bmesh.ops.delete(local, geom=[vert for vert in local.verts if vert.index not in keep_verts], context='VERTS')
+        bmesh.ops.delete(local, geom=[edge for edge in local.edges if not edge.link_faces], context='EDGES')
+        # Copies keep element order, so the remaining verts line up with the sorted region indices
+        source = local.verts.layers.int.new(self.SOURCE_LAYER)
+        for vert, index in zip(local.verts, self.vert_indices):
+            vert[source] = index
+        local.normal_update()
+        return local
+
+    def restore(self):
+        """Resets the working copy to the extracted state"""
+        if isinstance(self.bm, bmesh.types.BMesh) and self.bm.is_valid:
+            self.bm.free()
+        self.bm = self.pristine.copy()
+        self.changed = True
+        return self.bm
+
+    def hide_region(self, bm:bmesh.types.BMesh, hide=True):
+        """Hides the region in the full mesh while the working copy is previewed, boundary elements of visible faces stay visible"""
+        bm.faces.ensure_lookup_table()
+        faces = [bm.faces[index] for index in self.face_indices]
+        for face in faces:
+            face.hide = hide
+        for face in faces:
+            for edge in face.edges:
+                edge.hide = hide and all(link.hide for link in edge.link_faces)
+            for vert in face.verts:
+                vert.hide = hide and all(link.hide for link in vert.link_faces)
+
+    def splice(self, bm:bmesh.types.BMesh):
+        """Replaces the region in the full mesh with the working copy, returns the new faces"""
+        local = self.bm
+        source = local.verts.layers.int.get(self.SOURCE_LAYER)
+        if source is None:
+            raise ValueError("Working copy has no source index layer")
+        bm.verts.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+        self.hide_region(bm, hide=False)
+        # Boundary
+        boundary_map = {}
+        for vert in local.verts:
+            index = vert[source]
+            if index in self.boundary:
+                best = boundary_map.get(index)
+                target = self.boundary_coords[index]
+                if best is None or (vert.co - target).length < (best.co - target).length:
+                    boundary_map[index] = vert
+        boundary_verts = {local_vert : bm.verts[index] for index, local_vert in boundary_map.items()}
+        region_faces = [bm.faces[index] for index in self.face_indices]
+        region_edges = {edge for face in region_faces for edge in face.edges}
+        interior = [bm.verts[index] for index in self.vert_indices if index not in self.boundary]
+        # Copy Back, checked before the region is removed so a failure leaves the mesh untouched
+        geom = list(local.verts) + list(local.edges) + list(local.faces)
+        result = bmesh.ops.duplicate(local, geom=geom, dest=bm)
+        vert_map = result['vert_map']
+        face_map = result['face_map']
+        new_faces = [face_map[face] for face in local.faces if face in face_map]
+        if len(new_faces) != len(local.faces):
+            copied = [vert_map[vert] for vert in local.verts if vert in vert_map]
+            if copied:
+                bmesh.ops.delete(bm, geom=copied, context='VERTS')
+            raise ValueError(f"Splice copied {len(new_faces)} of {len(local.faces)} faces")
+        # Remove Region
+        bmesh.ops.delete(bm, geom=[face for face in region_faces if face.is_valid], context='FACES_ONLY')
+        if interior:
+            bmesh.ops.delete(bm, geom=interior, context='VERTS')
+        # Boundary Weld
+        targetmap = {vert_map[local_vert] : full_vert for local_vert, full_vert in boundary_verts.items() if local_vert in vert_map}
+        if targetmap:
+            bmesh.ops.weld_verts(bm, targetmap=targetmap)
+        loose = [edge for edge in region_edges if edge.is_valid and not edge.link_faces]
+        if loose:
+            bmesh.ops.delete(bm, geom=loose, context='EDGES')
+        return [face for face in new_faces if face.is_valid]
+
+    def free(self):
+        for local in (self.bm, self.pristine):
+            if isinstance(local, bmesh.types.BMesh) and local.is_valid:
+                local.free()
+        self.bm = None
+        self.pristine = None
+        self.preview.free()
+
+    def draw(self, matrix:Matrix):
+        """Draws the working copy in a POST_VIEW handler"""
+        if not isinstance(self.bm, bmesh.types.BMesh) or not self.bm.is_valid:
+            return
+        if self.changed:
+            self.bm.verts.index_update()
+            self.bm.normal_update()
+            self.preview.upload(self.bm, topology=True)
+            self.changed = False
+        self.preview.matrix = matrix
+        self.preview.draw()
@@ -0,0 +1,288 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Object
+from collections import namedtuple
+from mathutils import Vector
+import time
+import traceback
+from .history import HistoryEntry
+from .mesh import MeshData
+
+# ------------------------------------------------------------------------------- #
+# TYPES
+# ------------------------------------------------------------------------------- #
+
+MacroStep = namedtuple('MacroStep', ('bl_idname', 'py_path', 'kwargs'))
+MacroReport = namedtuple('MacroReport', ('targets', 'steps', 'direct', 'ops', 'failed', 'ms'))
+
+# ------------------------------------------------------------------------------- #
+# DIRECT
+# ------------------------------------------------------------------------------- #
+
+# Handlers take (obj, kwargs, targets) and return False whenever the result could differ from the operator
+
+PLAIN_PIVOTS = {'MEDIAN_POINT', 'BOUNDING_BOX_CENTER', 'INDIVIDUAL_ORIGINS', 'ACTIVE_ELEMENT'}
+
+
+def _shade(obj:Object, kwargs:dict, smooth:bool):
+    if obj.type != 'MESH' or not kwargs.get('keep_sharp_edges', True):
+        return False
+    data = MeshData.get(obj.data)
+    data.write(obj.data.polygons, 'use_smooth', [smooth] * len(obj.data.polygons), bool)
+    obj.data.update()
+    return True
+
+
+def _location_clear(obj:Object, kwargs:dict, targets:list):
+    if kwargs.get('clear_delta', False) or any(obj.lock_location):
+        return False
+    obj.location = (0.0, 0.0, 0.0)
+    return True
+
+
+def _rotation_clear(obj:Object, kwargs:dict, targets:list):
+    if kwargs.get('clear_delta', False) or obj.rotation_mode in {'QUATERNION', 'AXIS_ANGLE'} or any(obj.lock_rotation):
+        return False
+    obj.rotation_euler = (0.0, 0.0, 0.0)
+    return True
+
+
+def _scale_clear(obj:Object, kwargs:dict, targets:list):
+    if kwargs.get('clear_delta', False) or any(obj.lock_scale):
+        return False
+    obj.scale = (1.0, 1.0, 1.0)
+    return True
+
+
+def _plain_transform(obj:Object, kwargs:dict):
+    """Unparented objects in a global orientation without proportional editing or origin only options"""
+    if obj.parent is not None or kwargs.get('orient_type', 'GLOBAL') != 'GLOBAL':
+        return False
+    if kwargs.get('use_proportional_edit', False) or any(kwargs.get('center_override', ())):
+        return False
+    tool_settings = bpy.context.scene.tool_settings
+    return not (tool_settings.use_transform_data_origin or tool_settings.use_transform_pivot_point_align)
+
+
+def _translate(obj:Object, kwargs:dict, targets:list):
+    """Constrained axes are fine, the recorded value is already masked to them"""
+    if not _plain_transform(obj, kwargs) or any(obj.lock_location):
+        return False
+    obj.location += Vector(kwargs.get('value', (0.0, 0.0, 0.0)))
+    return True
+
+
+def _resize(obj:Object, kwargs:dict, targets:list):
+    """Only a single object scales around its own origin for every pivot but the cursor"""
+    if len(targets) != 1 or not _plain_transform(obj, kwargs) or any(obj.lock_scale):
+        return False
+    if bpy.context.scene.tool_settings.transform_pivot_point not in PLAIN_PIVOTS:
+        return False
+    obj.scale *= Vector(kwargs.get('value', (1.0, 1.0, 1.0)))
+    return True
+
+
+DIRECT_OPS = {
+    'OBJECT_OT_shade_smooth'   : lambda obj, kwargs, targets: _shade(obj, kwargs, True),
+    'OBJECT_OT_shade_flat'     : lambda obj, kwargs, targets: _shade(obj, kwargs, False),
+    'OBJECT_OT_location_clear' : _location_clear,
+    'OBJECT_OT_rotation_clear' : _rotation_clear,
+    'OBJECT_OT_scale_clear'    : _scale_clear,
+    'TRANSFORM_OT_translate'   : _translate,
+    'TRANSFORM_OT_resize'      : _resize,
+}
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def step_from_info(info:dict):
+    """Returns a MacroStep from get_bpy_ops_info_from_win_man_at_index output"""
+    if not info:
+        return None
+    kwargs = {}
+    for prop in info['PROP_INFO']:
+        if prop['DATA_TYPE'] in {'POINTER', 'COLLECTION'}:
+            continue
+        value = prop['VALUE']
+        if isinstance(value, (bool, int, float, str, set)):
+            kwargs[prop['IDENTIFIER']] = value
+        else:
+            try: kwargs[prop['IDENTIFIER']] = tuple(value)
+            except TypeError: pass
+    return MacroStep(info['OPERATOR'].bl_idname, info['OPS_PY_STR'], kwargs)
+
+
+def step_from_history(entry:HistoryEntry):
+    kwargs = {identifier : set(value) if isinstance(value, frozenset) else value for identifier, value in entry.values}
+    return MacroStep(entry.bl_idname, entry.py_path, kwargs)
+
+
+def acts_on_selection(step:MacroStep):
+    """Transform operators read the view layer selection, a context override does not limit them"""
+    return step.bl_idname.startswith('TRANSFORM_OT_')
+
+
+def without_selected_children(objects:list):
+    """Transforms skip objects whose parent chain is transformed too, they follow their parent"""
+    selected = set(objects)
+    result = []
+    for obj in objects:
+        parent = obj.parent
+        while parent is not None and parent not in selected:
+            parent = parent.parent
+        if parent is None:
+            result.append(obj)
+    return result
+
+
+def object_state(obj:Object):
+    """Returns the transform, modifier stack and face shading of the object for comparing replays"""
+    smooth = ()
+    if obj.type == 'MESH':
+        smooth = tuple(MeshData.get(obj.data).read('face:smooth', obj.data.polygons, 'use_smooth', len(obj.data.polygons), 1, bool))
+    matrix = tuple(round(value, 5) for row in obj.matrix_world for value in row)
+    return matrix, tuple(mod.type for mod in obj.modifiers), smooth
+
+
+def operator_from_py_path(py_path:str):
+    _, _, category, name = py_path.split('.', 3)
+    return getattr(getattr(bpy.ops, category), name)
+
+# ------------------------------------------------------------------------------- #
+# MACRO
+# ------------------------------------------------------------------------------- #
+
+class Macro:
+    """
+    Recorded operators replayed over many objects.
+    Steps with a known data API equivalent skip bpy.ops, the rest run with undo disabled,
+    transform operators run once over all targets since they act on the selection,
+    one undo step is pushed and the view layer is updated once after all targets.
+    """
+
+    def __init__(self, steps:list, name:str="KBT Macro"):
+        self.steps = [step for step in steps if isinstance(step, MacroStep)]
+        self.name = name
+        self.ops = {}
+
+    @classmethod
+    def from_infos(cls, infos:list, name:str="KBT Macro"):
+        return cls([step_from_info(info) for info in infos], name)
+
+    @classmethod
+    def from_history(cls, entries:list, name:str="KBT Macro"):
+        return cls([step_from_history(entry) for entry in entries], name)
+
+    def operator(self, step:MacroStep):
+        op = self.ops.get(step.py_path)
+        if op is None:
+            op = self.ops[step.py_path] = operator_from_py_path(step.py_path)
+        return op
+
+    def run(self, context, targets:list, batched=True, direct=True, undo=True):
+        """Runs every step on every target, batched=False replays like separate bpy.ops calls for comparison"""
+        targets = [obj for obj in targets if isinstance(obj, Object)]
+        counts = {'direct' : 0, 'ops' : 0, 'failed' : 0}
+        start = time.perf_counter()
+        for step in self.steps:
+            handler = DIRECT_OPS.get(step.bl_idname) if direct else None
+            step_targets = without_selected_children(targets) if acts_on_selection(step) else targets
+            remaining = []
+            for obj in step_targets:
+                if handler is None:
+                    remaining.append(obj)
+                    continue
+                try:
+                    handled = handler(obj, step.kwargs, step_targets)
+                except Exception:
+                    counts['failed'] += 1
+                    traceback.print_exc()
+                    continue
+                if handled:
+                    counts['direct'] += 1
+                    if not batched:
+                        context.view_layer.update()
+                else:
+                    remaining.append(obj)
+            if not remaining:
+                continue
+            if acts_on_selection(step):
+                self.call_on_selection(context, step, remaining, undo and not batched, counts)
+                continue
+            for obj in remaining:
+                override = {
+                    'object' : obj,
+                    'active_object' : obj,
+                    'selected_objects' : [obj],
+                    'selected_editable_objects' : [obj],
+                }
+                try:
+                    with context.temp_override(**override):
+                        self.operator(step)('EXEC_DEFAULT', undo and not batched, **step.kwargs)
+                    counts['ops'] += 1
+                except Exception:
+                    counts['failed'] += 1
+                    traceback.print_exc()
+        if batched:
+            context.view_layer.update()
+            if undo:
+                bpy.ops.ed.undo_push(message=self.name)
+        return MacroReport(len(targets), len(self.steps), counts['direct'], counts['ops'], counts['failed'], (time.perf_counter() - start) * 1000)
+
+    def call_on_selection(self, context, step:MacroStep, objects:list, undo:bool, counts:dict):
+        """Runs the step once with the view layer selection set to the objects, then restores the selection"""
+        view_layer = context.view_layer
+        selected = [obj for obj in view_layer.objects if obj.select_get(view_layer=view_layer)]
+        active = view_layer.objects.active
+        try:
+            for obj in selected:
+                obj.select_set(False, view_layer=view_layer)
+            for obj in objects:
+                obj.select_set(True, view_layer=view_layer)
+            view_layer.objects.active = objects[0]
+            with context.temp_override(active_object=objects[0], selected_objects=objects, selected_editable_objects=objects):
+                self.operator(step)('EXEC_DEFAULT', undo, **step.kwargs)
+            counts['ops'] += len(objects)
+        except Exception:
+            counts['failed'] += len(objects)
+            traceback.print_exc()
+        finally:
+            for obj in objects:
+                obj.select_set(False, view_layer=view_layer)
+            for obj in selected:
+                obj.select_set(True, view_layer=view_layer)
+            view_layer.objects.active = active
+
+    def benchmark(self, context, targets:list):
+        """
+        Runs naive and batched replay on temporary copies of the targets without undo pushes.
+        Returns (naive, batched, speedup, identical), identical compares the resulting transforms, modifiers and shading.
+        """
+        reports = []
+        states = []
+        for batched in (False, True):
+            copies = []
+            for obj in targets:
+                if not isinstance(obj, Object):
+                    continue
+                copy = obj.copy()
+                if obj.data is not None:
+                    copy.data = obj.data.copy()
+                context.scene.collection.objects.link(copy)
+                copies.append(copy)
+            context.view_layer.update()
+            try:
+                reports.append(self.run(context, copies, batched=batched, direct=batched, undo=False))
+                context.view_layer.update()
+                states.append([object_state(copy) for copy in copies])
+            finally:
+                datas = [copy.data for copy in copies if copy.data is not None]
+                bpy.data.batch_remove(copies)
+                bpy.data.batch_remove([data for data in datas if data.users == 0])
+        naive, batched = reports
+        speedup = naive.ms / batched.ms if batched.ms > 0 else 0.0
+        return naive, batched, speedup, states[0] == states[1]
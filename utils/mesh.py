@@ -0,0 +1,228 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Mesh, Object
+import numpy as np
+from .handlers import LoadPreHandler
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+ATTRIBUTE_LAYOUTS = {
+    'FLOAT'        : ('value',  1,  np.float32),
+    'INT'          : ('value',  1,  np.int32),
+    'INT8'         : ('value',  1,  np.int32),
+    'BOOLEAN'      : ('value',  1,  bool),
+    'FLOAT2'       : ('vector', 2,  np.float32),
+    'INT32_2D'     : ('value',  2,  np.int32),
+    'INT16_2D'     : ('value',  2,  np.int16),
+    'FLOAT_VECTOR' : ('vector', 3,  np.float32),
+    'FLOAT_COLOR'  : ('color',  4,  np.float32),
+    'BYTE_COLOR'   : ('color',  4,  np.float32),
+    'QUATERNION'   : ('value',  4,  np.float32),
+    'FLOAT4X4'     : ('value',  16, np.float32),
+}
+
+DOMAINS = {
+    'POINT'  : 'vertices',
+    'EDGE'   : 'edges',
+    'FACE'   : 'polygons',
+    'CORNER' : 'loops',
+}
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def mesh_from_object(obj:Object):
+    """Returns the object mesh with edit mode changes flushed or None"""
+    if not isinstance(obj, Object) or obj.type != 'MESH':
+        return None
+    if obj.data.is_editmode:
+        obj.update_from_editmode()
+    return obj.data
+
+
+def domain_size(mesh:Mesh, domain:str):
+    collection = DOMAINS.get(domain)
+    return len(getattr(mesh, collection)) if collection else 0
+
+# ------------------------------------------------------------------------------- #
+# DATA
+# ------------------------------------------------------------------------------- #
+
+class MeshData:
+    """
+    Bulk NumPy access to mesh data through foreach_get / foreach_set.
+    Returned arrays are views into reused buffers, copy them to keep values across calls.
+    Accessors of removed meshes are pruned when a new one is cached, the least recently used go past the limit.
+    """
+    _CACHE = {}
+    _LIMIT = 64
+
+    @classmethod
+    def get(cls, mesh:Mesh):
+        """Returns the cached accessor for the mesh so buffers are shared between callers"""
+        if not isinstance(mesh, Mesh):
+            return None
+        uid = mesh.session_uid
+        data = cls._CACHE.pop(uid, None)
+        if data is None:
+            cls.prune()
+            data = cls(mesh)
+        cls._CACHE[uid] = data
+        data.mesh = mesh
+        return data
+
+    @classmethod
+    def prune(cls):
+        """Drops accessors whose mesh was removed, then the oldest ones over the limit"""
+        for uid, data in list(cls._CACHE.items()):
+            try: alive = data.mesh.session_uid == uid
+            except ReferenceError: alive = False
+            if not alive:
+                del cls._CACHE[uid]
+        while len(cls._CACHE) >= cls._LIMIT:
+            del cls._CACHE[next(iter(cls._CACHE))]
+
+    @classmethod
+    def clear_cache(cls):
+        cls._CACHE.clear()
+
+    def __init__(self, mesh:Mesh):
+        self.mesh = mesh
+        self.buffers = {}
+
+    @property
+    def counts(self):
+        mesh = self.mesh
+        return len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops)
+
+    def buffer(self, key:str, count:int, width:int, dtype):
+        """Returns a reused buffer of shape (count, width) or (count,)"""
+        shape = (count, width) if width > 1 else (count,)
+        array = self.buffers.get(key)
+        if array is None or array.shape != shape or array.dtype != np.dtype(dtype):
+            array = np.empty(shape, dtype=dtype)
+            self.buffers[key] = array
+        return array
+
+    def read(self, key:str, collection, prop:str, count:int, width:int, dtype):
+        array = self.buffer(key, count, width, dtype)
+        collection.foreach_get(prop, array.ravel())
+        return array
+
+    def write(self, collection, prop:str, values, dtype):
+        values = np.ascontiguousarray(values, dtype=dtype)
+        collection.foreach_set(prop, values.ravel())
+        return True
+
+    def vertex_positions(self):
+        return self.read('vert:co', self.mesh.vertices, 'co', len(self.mesh.vertices), 3, np.float32)
+
+    def set_vertex_positions(self, coords):
+        self.write(self.mesh.vertices, 'co', coords, np.float32)
+        self.mesh.update()
+        return True
+
+    def vertex_normals(self):
+        return self.read('vert:normal', self.mesh.vertex_normals, 'vector', len(self.mesh.vertices), 3, np.float32)
+
+    def edge_vertices(self):
+        return self.read('edge:verts', self.mesh.edges, 'vertices', len(self.mesh.edges), 2, np.int32)
+
+    def edge_positions(self):
+        """Returns (E, 2, 3) endpoints"""
+        return self.vertex_positions()[self.edge_vertices()]
+
+    def face_loop_starts(self):
+        return self.read('face:start', self.mesh.polygons, 'loop_start', len(self.mesh.polygons), 1, np.int32)
+
+    def face_loop_totals(self):
+        return self.read('face:total', self.mesh.polygons, 'loop_total', len(self.mesh.polygons), 1, np.int32)
+
+    def face_normals(self):
+        return self.read('face:normal', self.mesh.polygon_normals, 'vector', len(self.mesh.polygons), 3, np.float32)
+
+    def face_centers(self):
+        return self.read('face:center', self.mesh.polygons, 'center', len(self.mesh.polygons), 3, np.float32)
+
+    def loop_vertices(self):
+        return self.read('loop:vert', self.mesh.loops, 'vertex_index', len(self.mesh.loops), 1, np.int32)
+
+    def loop_edges(self):
+        return self.read('loop:edge', self.mesh.loops, 'edge_index', len(self.mesh.loops), 1, np.int32)
+
+    def loop_positions(self):
+        return self.vertex_positions()[self.loop_vertices()]
+
+    def loop_normals(self):
+        return self.read('loop:normal', self.mesh.corner_normals, 'vector', len(self.mesh.loops), 3, np.float32)
+
+    def loop_triangles(self):
+        """Returns (T, 3) vertex indices of the loop triangulation"""
+        self.mesh.calc_loop_triangles()
+        tris = self.mesh.loop_triangles
+        return self.read('tri:verts', tris, 'vertices', len(tris), 3, np.int32)
+
+    def selection(self, domain:str='POINT'):
+        collection = getattr(self.mesh, DOMAINS[domain])
+        return self.read(f"{domain}:select", collection, 'select', len(collection), 1, bool)
+
+    def set_selection(self, domain:str, mask):
+        return self.write(getattr(self.mesh, DOMAINS[domain]), 'select', mask, bool)
+
+    def hidden(self, domain:str='POINT'):
+        collection = getattr(self.mesh, DOMAINS[domain])
+        return self.read(f"{domain}:hide", collection, 'hide', len(collection), 1, bool)
+
+    def set_hidden(self, domain:str, mask):
+        return self.write(getattr(self.mesh, DOMAINS[domain]), 'hide', mask, bool)
+
+    def selected_indices(self, domain:str='POINT'):
+        return np.flatnonzero(self.selection(domain))
+
+    def attribute(self, name:str):
+        """Returns the generic attribute as an array or None"""
+        attr = self.mesh.attributes.get(name)
+        if attr is None:
+            return None
+        layout = ATTRIBUTE_LAYOUTS.get(attr.data_type)
+        if layout is None:
+            return None
+        prop, width, dtype = layout
+        return self.read(f"attr:{name}", attr.data, prop, domain_size(self.mesh, attr.domain), width, dtype)
+
+    def set_attribute(self, name:str, values, data_type:str='FLOAT', domain:str='POINT'):
+        """Writes the attribute, creating it with the data type and domain when missing"""
+        attr = self.mesh.attributes.get(name)
+        if attr is None:
+            attr = self.mesh.attributes.new(name, data_type, domain)
+        layout = ATTRIBUTE_LAYOUTS.get(attr.data_type)
+        if layout is None:
+            return False
+        prop, _, dtype = layout
+        return self.write(attr.data, prop, values, dtype)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+LOAD_HANDLE = None
+
+
+def register():
+    global LOAD_HANDLE
+    MeshData.clear_cache()
+    LOAD_HANDLE = LoadPreHandler.add(MeshData.clear_cache, tuple())
+
+
+def unregister():
+    global LOAD_HANDLE
+    if isinstance(LOAD_HANDLE, LoadPreHandler):
+        LOAD_HANDLE.remove()
+    LOAD_HANDLE = None
+    MeshData.clear_cache()
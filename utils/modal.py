@@ -2,11 +2,16 @@
 # IMPORTS
 # ------------------------------------------------------------------------------- #
 
-import bpy
+from bpy.types import Context, Event
 import enum
 from .handlers import (
     SPACE_TYPES, REGION_TYPES, DRAW_TYPES, ShaderHandler,
 )
+from .addon import user_prefs
+from .aio import event_info_from_event
+from .latency import LatencyMonitor
+from .redraw import RedrawQueue
+from .replay import EventRecorder
 
 # ------------------------------------------------------------------------------- #
 # ENUMS
@@ -25,10 +30,18 @@ class STATUS(enum.Flag):
 
 def add_shader_handles(op, context, space=SPACE_TYPES.VIEW_3D, regtype=REGION_TYPES.WINDOW):
     op.handler_3d, op.handler_2d = None, None
+    monitor = getattr(op, 'latency', None)
     if hasattr(op, 'draw_3d'):
-        op.handler_3d = ShaderHandler.add(op.draw_3d, (context,), space, regtype, DRAW_TYPES.POST_VIEW)
+        draw_3d = monitor.wrap_draw(op.draw_3d, 'draw_3d') if isinstance(monitor, LatencyMonitor) else op.draw_3d
+        op.handler_3d = ShaderHandler.add(draw_3d, (context,), space, regtype, DRAW_TYPES.POST_VIEW)
     if hasattr(op, 'draw_2d'):
-        op.handler_2d = ShaderHandler.add(op.draw_2d, (context,), space, regtype, DRAW_TYPES.POST_PIXEL)
+        draw_2d = monitor.wrap_draw(op.draw_2d, 'draw_2d') if isinstance(monitor, LatencyMonitor) else op.draw_2d
+        op.handler_2d = ShaderHandler.add(draw_2d, (context,), space, regtype, DRAW_TYPES.POST_PIXEL)
+
+
+def latency_enabled():
+    try: return user_prefs().settings.measure_latency
+    except (AttributeError, KeyError): return False
 
 
 def remove_shader_handles(op):
@@ -38,3 +51,140 @@ def remove_shader_handles(op):
     if hasattr(op, 'handler_2d'):
         if isinstance(op.handler_2d, ShaderHandler):
             op.handler_2d.remove()
+
+# ------------------------------------------------------------------------------- #
+# BASE
+# ------------------------------------------------------------------------------- #
+
+class ModalBase:
+    """
+    Mixin for modal operators with table driven dispatch.
+    MODAL_EVENTS maps (event type, event value) to a method name, use 'ANY' to match every value.
+    Handlers receive (context, event) and return True when the state changed.
+    Mouse moves are coalesced, only the latest move reaches on_mouse_move once per timer tick,
+    as an EventInfo copy of that move since the event being handled at flush time is a timer or key event.
+    The area is tagged for redraw only when a handler reported a change.
+    With MEASURE_LATENCY or the addon setting, input to draw latency is shown in the HUD and logged on close.
+    """
+    MODAL_EVENTS = {}
+    MOUSE_EVENTS = {'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE'}
+    COALESCE_INTERVAL = 1 / 60
+    PASS_UNHANDLED = False
+    MEASURE_LATENCY = False
+
+    def modal_start(self, context:Context, event:Event, space=SPACE_TYPES.VIEW_3D, regtype=REGION_TYPES.WINDOW):
+        # State
+        self.status = STATUS.RUNNING
+        self.state_changed = False
+        self.mouse = (event.mouse_region_x, event.mouse_region_y)
+        self.mouse_pending = None
+        self.mouse_coalesced = 0
+        # Latency
+        self.latency = None
+        if self.MEASURE_LATENCY or latency_enabled():
+            self.latency = LatencyMonitor(getattr(self, 'bl_idname', ""))
+        # Timer
+        self.modal_timer = context.window_manager.event_timer_add(self.COALESCE_INTERVAL, window=context.window)
+        # Handlers
+        add_shader_handles(self, context, space, regtype)
+        # Modal
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+
+    def modal(self, context:Context, event:Event):
+        # Record
+        EventRecorder.capture(self, event)
+        # Mouse
+        if event.type in self.MOUSE_EVENTS:
+            if self.latency:
+                self.latency.input()
+            if self.mouse_pending is not None:
+                self.mouse_coalesced += 1
+                if self.latency:
+                    self.latency.coalesce()
+            self.mouse_pending = event_info_from_event(event)
+            return {'RUNNING_MODAL'}
+        # Flush
+        self.flush_mouse(context, event)
+        # Dispatch
+        handled = True
+        if event.type != 'TIMER':
+            method = self.MODAL_EVENTS.get((event.type, event.value)) or self.MODAL_EVENTS.get((event.type, 'ANY'))
+            handler = getattr(self, method, None) if method else None
+            if callable(handler):
+                if self.latency:
+                    self.latency.input()
+                    self.latency.update_begin()
+                changed = bool(handler(context, event))
+                if self.latency:
+                    self.latency.update_end(changed)
+                if changed:
+                    self.state_changed = True
+            else:
+                handled = False
+        # Redraw
+        if self.state_changed:
+            self.state_changed = False
+            self.tag_redraw(context)
+        # Exit
+        if self.status in STATUS.FINISHED | STATUS.CANCELLED:
+            return self.modal_close(context)
+        # Pass
+        if self.status == STATUS.PASSTHROUGH or (not handled and self.PASS_UNHANDLED):
+            self.status = STATUS.RUNNING
+            return {'PASS_THROUGH'}
+        return {'RUNNING_MODAL'}
+
+
+    def flush_mouse(self, context:Context, event:Event):
+        """Runs on_mouse_move with the latest coalesced move, not with the event that triggered the flush"""
+        move = self.mouse_pending
+        if move is None:
+            return False
+        self.mouse = (move.mouse_region_x, move.mouse_region_y)
+        self.mouse_pending = None
+        if self.latency:
+            self.latency.update_begin()
+        changed = bool(self.on_mouse_move(context, move))
+        if self.latency:
+            self.latency.update_end(changed)
+        if changed:
+            self.state_changed = True
+        return True
+
+
+    def modal_close(self, context:Context):
+        # Timer
+        if getattr(self, 'modal_timer', None) is not None:
+            context.window_manager.event_timer_remove(self.modal_timer)
+            self.modal_timer = None
+        # Handlers
+        remove_shader_handles(self)
+        # Latency
+        if getattr(self, 'latency', None):
+            self.latency.write_log()
+        # Redraw
+        self.tag_redraw(context)
+        # Close
+        self.on_close(context)
+        if self.status == STATUS.CANCELLED:
+            return {'CANCELLED'}
+        return {'FINISHED'}
+
+
+    def tag_redraw(self, context:Context):
+        RedrawQueue.request_context(context)
+
+
+    def on_mouse_move(self, context:Context, event:Event):
+        return False
+
+
+    def on_close(self, context:Context):
+        pass
+
+
+    def cancel(self, context:Context):
+        self.status = STATUS.CANCELLED
+        self.modal_close(context)
@@ -5,20 +5,24 @@
 import bpy
 from bpy.types import Operator
 import sys
+import os
+import json
+import time
 import pkgutil
 import inspect
 import importlib
+import threading
 from types import ModuleType
+from .addon import config_directory
+from .codecache import compile_cached
+from .workers import submit_thread
 
 # ------------------------------------------------------------------------------- #
 # FUNCTIONS
 # ------------------------------------------------------------------------------- #
 
 def get_importable_module_names():
-    modules = set(sys.builtin_module_names)
-    for module_info in pkgutil.iter_modules():
-        modules.add(module_info.name)
-    return sorted(modules)
+    return ModuleIndex.get().names()
 
 
 def get_public_root_module_names():
@@ -49,15 +53,14 @@ def get_math_module_names():
 
 def get_submodules_names_from_module(module:ModuleType):
     if isinstance(module, ModuleType):
-        items = [n for n, m in inspect.getmembers(module) if isinstance(m, ModuleType) and not n.startswith('_')]
-        return sorted(items, key=lambda item: item.lower())
+        return LazyNamespace.get(module).names(kinds={'MODULE'})
     return []
 
 
 def get_attribute_names_from_module(module:ModuleType):
     if isinstance(module, ModuleType):
-        items = [n for n, m in inspect.getmembers(module) if not isinstance(m, ModuleType) and not n.startswith('_')]
-        return sorted(items, key=lambda item: item.lower())
+        namespace = LazyNamespace.get(module)
+        return [n for n in namespace.names() if namespace.kind(n) != 'MODULE']
     return []
 
 
@@ -88,10 +91,207 @@ def get_module_from_name(name: str):
 def compile_source_to_module(name:str, source:str, doc:str=None):
     if isinstance(name, str) and isinstance(source, str):
         module = ModuleType(name, doc)
-        exec(source, module.__dict__)
+        exec(compile_cached(source, f"<{name}>"), module.__dict__)
         return module
     return None
 
+# ------------------------------------------------------------------------------- #
+# INTROSPECTION
+# ------------------------------------------------------------------------------- #
+
+def static_kind(value):
+    if isinstance(value, ModuleType):
+        return 'MODULE'
+    if isinstance(value, type):
+        return 'CLASS'
+    if isinstance(value, (staticmethod, classmethod)) or inspect.isroutine(value):
+        return 'FUNCTION'
+    if isinstance(value, property):
+        return 'PROPERTY'
+    return 'DATA'
+
+
+class LazyNamespace:
+    """
+    Names of a module listed with dir() without evaluating any attribute.
+    Kinds come from the static namespace, names only reachable through __getattr__ (bpy.types RNA classes)
+    report 'DYNAMIC' until resolve evaluates them. Values, kinds and signatures are cached per name.
+    """
+    _CACHE = {}
+
+    @classmethod
+    def get(cls, module:ModuleType):
+        namespace = cls._CACHE.get(id(module))
+        if namespace is None or namespace.module is not module:
+            namespace = cls(module)
+            cls._CACHE[id(module)] = namespace
+        return namespace
+
+    @classmethod
+    def clear_cache(cls):
+        cls._CACHE.clear()
+
+    def __init__(self, module:ModuleType):
+        self.module = module
+        self.all_names = None
+        self.kinds = {}
+        self.signatures = {}
+
+    def refresh(self):
+        self.all_names = None
+        self.kinds.clear()
+        self.signatures.clear()
+
+    def names(self, public=True, kinds:set=None):
+        if self.all_names is None:
+            try: names = dir(self.module)
+            except Exception: names = list(getattr(self.module, '__dict__', {}).keys())
+            self.all_names = sorted(names, key=lambda item: item.lower())
+        names = [n for n in self.all_names if not n.startswith('_')] if public else self.all_names
+        if kinds:
+            names = [n for n in names if self.kind(n) in kinds]
+        return names
+
+    def page(self, index:int=0, size:int=100, public=True, kinds:set=None):
+        """Returns (names on the page, total count)"""
+        names = self.names(public, kinds)
+        start = max(index, 0) * size
+        return names[start:start + size], len(names)
+
+    def kind(self, name:str):
+        kind = self.kinds.get(name)
+        if kind is None:
+            try: kind = static_kind(inspect.getattr_static(self.module, name))
+            except AttributeError: kind = 'DYNAMIC'
+            self.kinds[name] = kind
+        return kind
+
+    def resolve(self, name:str):
+        """Evaluates the attribute and returns its kind, this may trigger RNA lookups"""
+        try: value = getattr(self.module, name)
+        except Exception: return 'MISSING'
+        self.kinds[name] = static_kind(value)
+        return self.kinds[name]
+
+    def value(self, name:str):
+        return getattr(self.module, name, None)
+
+    def signature(self, name:str):
+        """Returns the call signature as text or an empty string"""
+        if name not in self.signatures:
+            try: text = str(inspect.signature(getattr(self.module, name)))
+            except Exception: text = ""
+            self.signatures[name] = text
+        return self.signatures[name]
+
+# ------------------------------------------------------------------------------- #
+# MODULE INDEX
+# ------------------------------------------------------------------------------- #
+
+def path_entry_mtime(entry:str):
+    try: return os.stat(entry or os.curdir).st_mtime
+    except OSError: return None
+
+
+def scan_path_entries(entries:list, known:dict):
+    """Returns {entry : {'mtime', 'names'}} rescanning only entries whose mtime changed, runs off the main thread"""
+    index = {}
+    for entry in entries:
+        mtime = path_entry_mtime(entry)
+        if mtime is None:
+            continue
+        cached = known.get(entry)
+        if cached and cached.get('mtime') == mtime:
+            index[entry] = cached
+            continue
+        try: names = sorted({info.name for info in pkgutil.iter_modules([entry])})
+        except Exception: names = []
+        index[entry] = {'mtime' : mtime, 'names' : names}
+    return index
+
+
+class ModuleIndex:
+    """
+    Importable module names per sys.path entry, stored in the config directory across sessions.
+    Lookups answer from the index, entries whose directory mtime changed are rescanned in a worker thread.
+    """
+    _INSTANCE = None
+    FILE_NAME = "module_index.json"
+    CHECK_INTERVAL = 10.0
+
+    @classmethod
+    def get(cls):
+        if cls._INSTANCE is None:
+            cls._INSTANCE = cls(os.path.join(config_directory(), cls.FILE_NAME))
+        return cls._INSTANCE
+
+    @classmethod
+    def reset(cls):
+        cls._INSTANCE = None
+
+    def __init__(self, path:str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.entries = self.load()
+        self.check_time = 0.0
+        self.sorted_names = None
+        self.path_key = ()
+        self.job = None
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as file:
+                data = json.load(file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        temp = self.path + ".tmp"
+        try:
+            with open(temp, 'w') as file:
+                json.dump(self.entries, file)
+            os.replace(temp, self.path)
+        except OSError:
+            return False
+        return True
+
+    def names(self):
+        """Returns the sorted module names, the first call in a fresh config scans sys.path in place"""
+        entries = list(sys.path)
+        if tuple(entries) != self.path_key:
+            self.path_key = tuple(entries)
+            self.sorted_names = None
+            if not any(entry in self.entries for entry in entries):
+                self.apply(scan_path_entries(entries, self.entries))
+            else:
+                self.refresh()
+        elif time.time() - self.check_time > self.CHECK_INTERVAL:
+            self.refresh()
+        if self.sorted_names is None:
+            modules = set(sys.builtin_module_names)
+            for entry in entries:
+                modules.update(self.entries.get(entry, {}).get('names', []))
+            self.sorted_names = sorted(modules)
+        return list(self.sorted_names)
+
+    def refresh(self):
+        """Rescans changed sys.path entries in the background"""
+        self.check_time = time.time()
+        with self.lock:
+            known = dict(self.entries)
+        self.job = submit_thread(scan_path_entries, (list(sys.path), known), callback=self.apply, group="module_index")
+        return self.job is not None
+
+    def apply(self, index:dict):
+        self.check_time = time.time()
+        with self.lock:
+            changed = any(self.entries.get(entry) != value for entry, value in index.items())
+            self.entries.update(index)
+        if changed:
+            self.sorted_names = None
+            self.save()
+
 # ------------------------------------------------------------------------------- #
 # BPY OPS
 # ------------------------------------------------------------------------------- #
@@ -150,34 +350,51 @@ def get_bpy_ops_py_string(op:Operator):
     return op_path_py
 
 
+_RNA_SCHEMAS = {}
+
+
+def get_bpy_ops_rna_schema(bl_idname:str, props):
+    """
+    Returns {identifier : prop info} of the writable operator properties.
+    Cached per bl_idname and RNA struct, re-registering the operator creates a new struct so the schema is rebuilt.
+    """
+    rna = props.bl_rna.as_pointer()
+    cached = _RNA_SCHEMAS.get(bl_idname)
+    schema = cached[1] if cached is not None and cached[0] == rna else None
+    if schema is None:
+        schema = {}
+        for prop in props.bl_rna.properties:
+            if prop.is_readonly or prop.identifier == 'rna_type':
+                continue
+            schema[prop.identifier] = {
+                'IDENTIFIER' : prop.identifier,
+                'NAME'       : prop.name,
+                'DATA_TYPE'  : prop.type,
+                'SUB_TYPE'   : prop.subtype if hasattr(prop, 'subtype') else 'NONE',
+                'ENUM_ITEMS' : list(prop.enum_items.keys()) if prop.type == 'ENUM' else [],
+                'IS_ARRAY'   : getattr(prop, 'is_array', False),
+                'IS_FLAG'    : getattr(prop, 'is_enum_flag', False),
+            }
+        _RNA_SCHEMAS[bl_idname] = (rna, schema)
+    return schema
+
+
 def get_bpy_ops_info_from_win_man_at_index(last=True, index=0):
     context = bpy.context
     wm = context.window_manager
-    if not wm.operators:
-        return None
-    operator = None
-    ops = enumerate(reversed(wm.operators)) if last else enumerate(wm.operators)
-    for i, op in ops:
-        if i == index:
-            operator = op
-            break
-    if operator is None:
+    count = len(wm.operators)
+    if index < 0 or index >= count:
         return None
+    operator = wm.operators[count - 1 - index if last else index]
     ops_py_string = get_bpy_ops_py_string(operator)
     wm_props = wm.operator_properties_last(operator.bl_idname)
+    schema = get_bpy_ops_rna_schema(operator.bl_idname, wm_props)
     prop_item_info = []
-    rna_props = {k : v for k, v in wm_props.bl_rna.properties.items()}
     for k in wm_props.keys():
-        prop = rna_props[k]
-        if not prop.is_readonly:
-            prop_info = {
-                'IDENTIFIER' : prop.identifier,
-                'NAME'       : prop.name,
-                'VALUE'      : getattr(wm_props, k),
-                'DATA_TYPE'  : prop.type,
-                'SUB_TYPE'   : prop.subtype if hasattr(prop, 'subtype') else 'NONE',
-                'ENUM_ITEMS' : list(prop.enum_items.keys()) if prop.type == 'ENUM' else []
-            }
+        prop_schema = schema.get(k)
+        if prop_schema is not None:
+            prop_info = dict(prop_schema)
+            prop_info['VALUE'] = getattr(wm_props, k)
             prop_item_info.append(prop_info)
     info = {
         'OPERATOR'   : operator,
@@ -186,4 +403,3 @@ def get_bpy_ops_info_from_win_man_at_index(last=True, index=0):
         'PROP_INFO'  : prop_item_info
     }
     return info
-
@@ -0,0 +1,189 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+import bmesh
+import gpu
+from mathutils import Matrix
+import numpy as np
+from .handlers import (
+    SPACE_TYPES, REGION_TYPES, DRAW_TYPES, ShaderHandler,
+)
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+LIGHT_DIR = np.array((0.3, 0.5, 0.8), dtype=np.float32) / np.linalg.norm((0.3, 0.5, 0.8))
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def bmesh_vertex_arrays(bm:bmesh.types.BMesh):
+    """Returns (coords, normals) as (N, 3) float32 arrays"""
+    count = len(bm.verts)
+    coords = np.fromiter((c for vert in bm.verts for c in vert.co), dtype=np.float32, count=count * 3)
+    normals = np.fromiter((c for vert in bm.verts for c in vert.normal), dtype=np.float32, count=count * 3)
+    return coords.reshape(-1, 3), normals.reshape(-1, 3)
+
+
+def bmesh_coords(bm:bmesh.types.BMesh, scratch:bpy.types.Mesh):
+    """Returns the (N, 3) float32 coords of the BMesh, written to the scratch mesh and read with foreach_get"""
+    bm.to_mesh(scratch)
+    coords = np.empty(len(scratch.vertices) * 3, dtype=np.float32)
+    scratch.vertices.foreach_get('co', coords)
+    return coords.reshape(-1, 3)
+
+
+def set_bmesh_coords(bm:bmesh.types.BMesh, scratch:bpy.types.Mesh, coords:np.ndarray):
+    """
+    Writes the coords through the scratch mesh holding the BMesh from bmesh_coords, then reloads the BMesh.
+    Element order is kept but element references and lookup tables are not.
+    """
+    scratch.vertices.foreach_set('co', np.ascontiguousarray(coords, dtype=np.float32).ravel())
+    bm.clear()
+    bm.from_mesh(scratch, face_normals=True, vertex_normals=True, use_shape_key=False, shape_key_index=0)
+
+
+def mesh_vertex_arrays(mesh:bpy.types.Mesh):
+    """Returns (coords, normals) as (N, 3) float32 arrays read with foreach_get"""
+    count = len(mesh.vertices)
+    coords = np.empty(count * 3, dtype=np.float32)
+    normals = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    mesh.vertex_normals.foreach_get('vector', normals)
+    return coords.reshape(-1, 3), normals.reshape(-1, 3)
+
+
+def mesh_topology_arrays(mesh:bpy.types.Mesh):
+    """Returns (triangle indices, edge indices) as int32 arrays read with foreach_get"""
+    mesh.calc_loop_triangles()
+    tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    lines = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', tris)
+    mesh.edges.foreach_get('vertices', lines)
+    return tris.reshape(-1, 3), lines.reshape(-1, 2)
+
+
+def shade_normals(normals:np.ndarray, color=(0.75, 0.75, 0.75, 1.0)):
+    """Returns per vertex RGBA from a fixed headlight lambert term"""
+    lambert = np.abs(normals @ LIGHT_DIR) * 0.6 + 0.4
+    colors = np.empty((len(normals), 4), dtype=np.float32)
+    colors[:, :3] = lambert[:, None] * np.asarray(color[:3], dtype=np.float32)
+    colors[:, 3] = color[3]
+    return colors
+
+# ------------------------------------------------------------------------------- #
+# PREVIEW
+# ------------------------------------------------------------------------------- #
+
+class MeshPreview:
+    """
+    Persistent GPU batch of a working BMesh.
+    The BMesh is written to a scratch mesh so arrays come from foreach_get instead of per element iteration.
+    Position only updates upload a single vertex buffer, the index buffers are kept until topology changes.
+    """
+
+    def __init__(self, matrix:Matrix=None, color=(0.75, 0.75, 0.75, 1.0), wire_color=(0.0, 0.0, 0.0, 0.6)):
+        self.matrix = matrix.copy() if isinstance(matrix, Matrix) else Matrix.Identity(4)
+        self.color = color
+        self.wire_color = wire_color
+        self.show_wire = True
+        self.handler = None
+        self.shader = None
+        self.wire_shader = None
+        self.format = None
+        self.vbo = None
+        self.ibo_tris = None
+        self.ibo_lines = None
+        self.batch_tris = None
+        self.batch_lines = None
+        self.vert_count = -1
+        self.uploads = 0
+        self.scratch = None
+
+    def show(self, space=SPACE_TYPES.VIEW_3D):
+        if self.handler is None:
+            self.handler = ShaderHandler.add(self.draw, tuple(), space, REGION_TYPES.WINDOW, DRAW_TYPES.POST_VIEW)
+        return self.handler is not None
+
+    def hide(self):
+        if isinstance(self.handler, ShaderHandler):
+            self.handler.remove()
+        self.handler = None
+
+    def scratch_mesh(self):
+        try: valid = isinstance(self.scratch, bpy.types.Mesh) and self.scratch.name in bpy.data.meshes
+        except ReferenceError: valid = False
+        if not valid:
+            self.scratch = bpy.data.meshes.new("kbt_preview")
+        return self.scratch
+
+    def free(self):
+        self.hide()
+        try:
+            if isinstance(self.scratch, bpy.types.Mesh) and self.scratch.name in bpy.data.meshes:
+                bpy.data.meshes.remove(self.scratch)
+        except ReferenceError: pass
+        self.scratch = None
+        self.vbo = None
+        self.ibo_tris = None
+        self.ibo_lines = None
+        self.batch_tris = None
+        self.batch_lines = None
+        self.vert_count = -1
+
+    def upload(self, bm:bmesh.types.BMesh, topology=True):
+        """Uploads the BMesh, set topology when faces, edges or vertex order changed since the last upload"""
+        if not isinstance(bm, bmesh.types.BMesh) or not bm.is_valid:
+            return False
+        mesh = self.scratch_mesh()
+        bm.to_mesh(mesh)
+        coords, normals = mesh_vertex_arrays(mesh)
+        if topology or self.vbo is None or len(coords) != self.vert_count:
+            tris, lines = mesh_topology_arrays(mesh)
+            self.ibo_tris = gpu.types.GPUIndexBuf(type='TRIS', seq=tris)
+            self.ibo_lines = gpu.types.GPUIndexBuf(type='LINES', seq=lines)
+            self.upload_vertices(coords, normals)
+        else:
+            self.fill_vertices(coords, normals)
+        return True
+
+    def upload_vertices(self, coords:np.ndarray, normals:np.ndarray):
+        """Creates the vertex buffer and the batches over the current index buffers"""
+        if self.format is None:
+            self.format = gpu.types.GPUVertFormat()
+            self.format.attr_add(id="pos", comp_type='F32', len=3, fetch_mode='FLOAT')
+            self.format.attr_add(id="color", comp_type='F32', len=4, fetch_mode='FLOAT')
+        self.vbo = gpu.types.GPUVertBuf(self.format, len(coords))
+        self.batch_tris = gpu.types.GPUBatch(type='TRIS', buf=self.vbo, elem=self.ibo_tris)
+        self.batch_lines = gpu.types.GPUBatch(type='LINES', buf=self.vbo, elem=self.ibo_lines)
+        self.vert_count = len(coords)
+        self.fill_vertices(coords, normals)
+
+    def fill_vertices(self, coords:np.ndarray, normals:np.ndarray):
+        """Refills the existing vertex buffer in place, the batches and index buffers are kept"""
+        self.vbo.attr_fill(id="pos", data=coords)
+        self.vbo.attr_fill(id="color", data=shade_normals(normals, self.color))
+        self.uploads += 1
+
+    def draw(self):
+        if self.batch_tris is None:
+            return
+        if self.shader is None:
+            self.shader = gpu.shader.from_builtin('SMOOTH_COLOR')
+            self.wire_shader = gpu.shader.from_builtin('UNIFORM_COLOR')
+        gpu.matrix.push()
+        gpu.matrix.multiply_matrix(self.matrix)
+        gpu.state.depth_test_set('LESS_EQUAL')
+        gpu.state.face_culling_set('NONE')
+        self.batch_tris.draw(self.shader)
+        if self.show_wire and self.batch_lines is not None:
+            gpu.state.blend_set('ALPHA')
+            self.wire_shader.uniform_float("color", self.wire_color)
+            self.batch_lines.draw(self.wire_shader)
+            gpu.state.blend_set('NONE')
+        gpu.state.depth_test_set('NONE')
+        gpu.matrix.pop()
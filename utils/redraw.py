@@ -0,0 +1,145 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Area
+import time
+from .addon import user_prefs
+from .handlers import LoadPreHandler
+from .screen import ScreenRegistry
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def area_key(area):
+    as_pointer = getattr(area, 'as_pointer', None)
+    return as_pointer() if callable(as_pointer) else id(area)
+
+
+def max_fps_from_prefs():
+    try: return user_prefs().settings.redraw_max_fps
+    except: return 0
+
+# ------------------------------------------------------------------------------- #
+# QUEUE
+# ------------------------------------------------------------------------------- #
+
+class RedrawQueue:
+    """
+    Collects redraw requests for areas, area types or everything and tags each area once per timer tick.
+    With a max FPS set, flushes closer together than the frame interval are delayed, never dropped.
+    Queued areas belong to the current screens, the queue is cleared before a file loads.
+    """
+    _AREAS = {}
+    _TYPES = set()
+    _ALL = False
+    _LAST_FLUSH = 0.0
+    _REQUESTS = 0
+    _TAGS = 0
+
+    @classmethod
+    def request_area(cls, area:Area):
+        if area is None:
+            return
+        cls._AREAS[area_key(area)] = area
+        cls._request()
+
+    @classmethod
+    def request_type(cls, area_type:str):
+        cls._TYPES.add(area_type)
+        cls._request()
+
+    @classmethod
+    def request_all(cls):
+        cls._ALL = True
+        cls._request()
+
+    @classmethod
+    def request_context(cls, context):
+        cls.request_area(getattr(context, 'area', None))
+
+    @classmethod
+    def pending(cls):
+        return cls._ALL or bool(cls._TYPES) or bool(cls._AREAS)
+
+    @classmethod
+    def _request(cls):
+        cls._REQUESTS += 1
+        try:
+            if not bpy.app.timers.is_registered(cls._tick):
+                bpy.app.timers.register(cls._tick, first_interval=0.0)
+        except Exception:
+            pass
+
+    @classmethod
+    def _tick(cls):
+        if not cls.pending():
+            return None
+        max_fps = max_fps_from_prefs()
+        if max_fps > 0:
+            wait = cls._LAST_FLUSH + 1.0 / max_fps - time.perf_counter()
+            if wait > 0.0:
+                return wait
+        cls.flush()
+        return None
+
+    @classmethod
+    def flush(cls):
+        """Tags every requested area once and clears the requests, returns the number of areas tagged"""
+        if not cls.pending():
+            return 0
+        areas = {}
+        groups = (ScreenRegistry.all_areas(),) if cls._ALL else [ScreenRegistry.areas(area_type) for area_type in cls._TYPES]
+        for group in groups:
+            for _, area in group:
+                areas[area_key(area)] = area
+        for key, area in cls._AREAS.items():
+            areas.setdefault(key, area)
+        cls._AREAS = {}
+        cls._TYPES = set()
+        cls._ALL = False
+        cls._LAST_FLUSH = time.perf_counter()
+        tagged = 0
+        for area in areas.values():
+            try:
+                area.tag_redraw()
+                tagged += 1
+            except ReferenceError:
+                pass
+        cls._TAGS += tagged
+        return tagged
+
+    @classmethod
+    def stats(cls):
+        """Returns (requests, tags), the gap is the redundant work saved"""
+        return cls._REQUESTS, cls._TAGS
+
+    @classmethod
+    def clear(cls):
+        cls._AREAS = {}
+        cls._TYPES = set()
+        cls._ALL = False
+        if bpy.app.timers.is_registered(cls._tick):
+            bpy.app.timers.unregister(cls._tick)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+LOAD_HANDLE = None
+
+
+def register():
+    global LOAD_HANDLE
+    RedrawQueue.clear()
+    LOAD_HANDLE = LoadPreHandler.add(RedrawQueue.clear, tuple())
+
+
+def unregister():
+    global LOAD_HANDLE
+    if isinstance(LOAD_HANDLE, LoadPreHandler):
+        LOAD_HANDLE.remove()
+    LOAD_HANDLE = None
+    RedrawQueue.clear()
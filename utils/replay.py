@@ -0,0 +1,245 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Event, Object, Operator
+import hashlib
+import json
+import os
+import statistics
+import time
+import traceback
+from .latency import percentile
+from .mesh import MeshData, mesh_from_object
+from .redraw import RedrawQueue
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+EVENT_FIELDS = ('type', 'value', 'mouse_x', 'mouse_y', 'mouse_region_x', 'mouse_region_y', 'ctrl', 'shift', 'alt', 'oskey', 'is_repeat')
+
+# ------------------------------------------------------------------------------- #
+# RECORDER
+# ------------------------------------------------------------------------------- #
+
+class EventRecorder:
+    """Captures the events a modal operator receives, ModalBase feeds the active recorder"""
+    _ACTIVE = None
+
+    @classmethod
+    def start(cls, path:str):
+        cls._ACTIVE = cls(path)
+        return cls._ACTIVE
+
+    @classmethod
+    def stop(cls):
+        recorder = cls._ACTIVE
+        cls._ACTIVE = None
+        if recorder is not None:
+            recorder.save()
+        return recorder
+
+    @classmethod
+    def capture(cls, op, event:Event):
+        if cls._ACTIVE is not None:
+            cls._ACTIVE.record(op, event)
+
+    def __init__(self, path:str):
+        self.path = path
+        self.operator = ""
+        self.events = []
+        self.start_time = time.perf_counter()
+
+    def record(self, op, event:Event):
+        if not self.operator:
+            self.operator = getattr(op, 'bl_idname', "")
+        row = {field : getattr(event, field, None) for field in EVENT_FIELDS}
+        row['time'] = time.perf_counter() - self.start_time
+        self.events.append(row)
+
+    def save(self):
+        data = {'operator' : self.operator, 'events' : self.events}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as file:
+            json.dump(data, file)
+        return True
+
+
+def load_event_stream(path:str):
+    """Returns (operator idname, list of StubEvent) from a recorded file"""
+    with open(path, 'r') as file:
+        data = json.load(file)
+    return data.get('operator', ""), [StubEvent(row) for row in data.get('events', [])]
+
+# ------------------------------------------------------------------------------- #
+# STUBS
+# ------------------------------------------------------------------------------- #
+
+class StubEvent:
+    def __init__(self, row:dict):
+        self.type = row.get('type', 'NONE')
+        self.value = row.get('value', 'NOTHING')
+        self.mouse_x = row.get('mouse_x', 0)
+        self.mouse_y = row.get('mouse_y', 0)
+        self.mouse_region_x = row.get('mouse_region_x', 0)
+        self.mouse_region_y = row.get('mouse_region_y', 0)
+        self.mouse_prev_x = self.mouse_x
+        self.mouse_prev_y = self.mouse_y
+        self.ctrl = bool(row.get('ctrl', False))
+        self.shift = bool(row.get('shift', False))
+        self.alt = bool(row.get('alt', False))
+        self.oskey = bool(row.get('oskey', False))
+        self.is_repeat = bool(row.get('is_repeat', False))
+        self.time = row.get('time', 0.0)
+
+
+class StubArea:
+    def __init__(self, area_type='VIEW_3D', width=1920, height=1080):
+        self.type = area_type
+        self.ui_type = area_type
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+        self.redraws = 0
+
+    def tag_redraw(self):
+        self.redraws += 1
+
+
+class StubWindowManager:
+    def __init__(self):
+        self.handlers = []
+        self.timers = []
+
+    def modal_handler_add(self, op):
+        self.handlers.append(op)
+        return True
+
+    def event_timer_add(self, time_step, window=None):
+        timer = object()
+        self.timers.append(timer)
+        return timer
+
+    def event_timer_remove(self, timer):
+        if timer in self.timers:
+            self.timers.remove(timer)
+
+    def __getattr__(self, name):
+        return getattr(bpy.context.window_manager, name)
+
+
+class StubContext:
+    """Forwards to bpy.context except for the window, area and window manager parts missing in background mode"""
+
+    def __init__(self, area_type='VIEW_3D'):
+        self.area = StubArea(area_type)
+        self.region = None
+        self.window = None
+        self.window_manager = StubWindowManager()
+
+    def __getattr__(self, name):
+        return getattr(bpy.context, name)
+
+# ------------------------------------------------------------------------------- #
+# REPLAY
+# ------------------------------------------------------------------------------- #
+
+class ReplayOperator:
+    """Stands in for bpy.types.Operator so an operator class can run without registration"""
+
+    def report(self, level, message):
+        print(f"{level} : {message}")
+
+
+def instance_from_operator_class(op_cls):
+    """Returns an unregistered instance of the operator class with property defaults applied"""
+    bases = tuple(base for base in op_cls.__bases__ if base is not Operator and not issubclass(base, Operator))
+    namespace = {k : v for k, v in op_cls.__dict__.items() if k not in {'__dict__', '__weakref__'}}
+    replay_cls = type(op_cls.__name__, bases + (ReplayOperator,), namespace)
+    op = replay_cls()
+    for name, prop in getattr(op_cls, '__annotations__', {}).items():
+        keywords = getattr(prop, 'keywords', None)
+        if isinstance(keywords, dict):
+            setattr(op, name, keywords.get('default'))
+    return op
+
+
+def operator_class_from_idname(idname:str):
+    if not isinstance(idname, str) or '.' not in idname:
+        return None
+    category, name = idname.split('.', 1)
+    return Operator.bl_rna_get_subclass_py(f"{category.upper()}_OT_{name}")
+
+
+def mesh_state(obj:Object):
+    """Returns element counts and a coordinate digest of the object mesh"""
+    if not isinstance(obj, Object) or obj.type != 'MESH':
+        return {}
+    mesh = mesh_from_object(obj)
+    coords = MeshData.get(mesh).vertex_positions()
+    return {
+        'verts'  : len(mesh.vertices),
+        'edges'  : len(mesh.edges),
+        'faces'  : len(mesh.polygons),
+        'digest' : hashlib.sha1(coords.tobytes()).hexdigest(),
+    }
+
+
+def replay_events(op_cls, events:list, context=None, obj:Object=None):
+    """
+    Feeds the events into the operator modal and returns a report.
+    Latencies are the wall time of each modal call in milliseconds.
+    """
+    context = context if context is not None else StubContext()
+    op = instance_from_operator_class(op_cls)
+    latencies = []
+    result = set()
+    try:
+        start = time.perf_counter()
+        result = op.invoke(context, events[0]) if events else {'CANCELLED'}
+        RedrawQueue.flush()
+        invoke_time = (time.perf_counter() - start) * 1000
+        for event in events[1:]:
+            if 'RUNNING_MODAL' not in result and 'PASS_THROUGH' not in result:
+                break
+            start = time.perf_counter()
+            result = op.modal(context, event)
+            latencies.append((time.perf_counter() - start) * 1000)
+            RedrawQueue.flush()
+    except Exception:
+        traceback.print_exc()
+        return {'error' : traceback.format_exc()}
+    area = getattr(context, 'area', None)
+    return {
+        'operator'  : getattr(op_cls, 'bl_idname', ""),
+        'result'    : sorted(result),
+        'events'    : len(latencies),
+        'invoke_ms' : invoke_time,
+        'total_ms'  : sum(latencies),
+        'mean_ms'   : statistics.fmean(latencies) if latencies else 0.0,
+        'p50_ms'    : percentile(latencies, 0.50),
+        'p95_ms'    : percentile(latencies, 0.95),
+        'max_ms'    : max(latencies, default=0.0),
+        'redraws'   : getattr(area, 'redraws', 0),
+        'mesh'      : mesh_state(obj),
+    }
+
+
+def compare_reports(report:dict, baseline:dict, tolerance:float=1.5):
+    """Returns a list of regression messages, latencies may grow by the tolerance factor"""
+    errors = []
+    if 'error' in report:
+        errors.append("Replay failed")
+        return errors
+    for key in ('mean_ms', 'p95_ms'):
+        if key in baseline and report.get(key, 0.0) > baseline[key] * tolerance:
+            errors.append(f"{key} : {report[key]:.3f} > {baseline[key]:.3f} x {tolerance}")
+    if baseline.get('mesh') and report.get('mesh') != baseline['mesh']:
+        errors.append("Final mesh state differs from baseline")
+    if baseline.get('result') and report.get('result') != baseline['result']:
+        errors.append(f"Result : {report.get('result')} != {baseline['result']}")
+    return errors
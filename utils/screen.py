@@ -5,6 +5,7 @@
 import bpy
 from bpy.types import Context, Region, Area
 from mathutils import Vector
+from .handlers import LoadPreHandler
 
 # ------------------------------------------------------------------------------- #
 # FUNCTIONS
@@ -25,24 +26,153 @@ def point_within_region(point:Vector, region:Region):
 
 
 def tag_area_for_redraw(context:Context):
-    if isinstance(context, Context):
-        if hasattr(context, 'area'):
-            if isinstance(context.area, Area):
-                context.area.tag_redraw()
+    """Accepts any context with an area, so replay stub contexts count their redraws"""
+    from .redraw import RedrawQueue
+    area = getattr(context, 'area', None)
+    if area is not None and callable(getattr(area, 'tag_redraw', None)):
+        RedrawQueue.request_area(area)
 
 
 def tag_all_areas_of_type_for_redraw(area_type='TEXT_EDITOR'):
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == area_type:
-                area.tag_redraw()
+    from .redraw import RedrawQueue
+    RedrawQueue.request_type(area_type)
 
 
 def create_new_window():
     original_windows = bpy.context.window_manager.windows[:]
     bpy.ops.wm.window_new()
+    ScreenRegistry.invalidate()
     window = None
     for window in bpy.context.window_manager.windows:
         if window not in original_windows:
             return window
     return None
+
+# ------------------------------------------------------------------------------- #
+# REGISTRY
+# ------------------------------------------------------------------------------- #
+
+class ScreenRegistry:
+    """
+    Index of windows, areas, active spaces and regions by type.
+    Every access compares a structural fingerprint (window, screen and area pointers with area types),
+    the index is rebuilt only when the layout changed, so lookups skip the window / area / space scans.
+    """
+    _FINGERPRINT = None
+    _WINDOWS = []
+    _AREAS = {}
+    _SPACES = {}
+    _REGIONS = {}
+    _REBUILDS = 0
+
+    @classmethod
+    def fingerprint(cls):
+        parts = []
+        for window in bpy.context.window_manager.windows:
+            screen = window.screen
+            parts.append(window.as_pointer())
+            parts.append(screen.as_pointer())
+            parts.extend((area.as_pointer(), area.type) for area in screen.areas)
+        return tuple(parts)
+
+    @classmethod
+    def invalidate(cls):
+        cls._FINGERPRINT = None
+
+    @classmethod
+    def clear(cls):
+        """Drops every held window and area, pointers of a loaded file can match the freed ones"""
+        cls._FINGERPRINT = None
+        cls._WINDOWS = []
+        cls._AREAS = {}
+        cls._SPACES = {}
+        cls._REGIONS = {}
+
+    @classmethod
+    def validate(cls):
+        try: fingerprint = cls.fingerprint()
+        except (AttributeError, ReferenceError): fingerprint = None
+        if fingerprint is None or fingerprint != cls._FINGERPRINT:
+            cls.rebuild()
+            cls._FINGERPRINT = fingerprint
+
+    @classmethod
+    def rebuild(cls):
+        cls._WINDOWS = []
+        cls._AREAS = {}
+        cls._SPACES = {}
+        cls._REGIONS = {}
+        cls._REBUILDS += 1
+        try: windows = list(bpy.context.window_manager.windows)
+        except AttributeError: return
+        for window in windows:
+            cls._WINDOWS.append(window)
+            for area in window.screen.areas:
+                cls._AREAS.setdefault(area.type, []).append((window, area))
+                space = area.spaces.active
+                if space is not None:
+                    cls._SPACES.setdefault(space.type, []).append((window, area, space))
+                for region in area.regions:
+                    cls._REGIONS[(area.as_pointer(), region.type)] = region
+
+    @classmethod
+    def windows(cls):
+        cls.validate()
+        return cls._WINDOWS
+
+    @classmethod
+    def areas(cls, area_type:str):
+        """Returns [(window, area)] of the type"""
+        cls.validate()
+        return cls._AREAS.get(area_type, [])
+
+    @classmethod
+    def spaces(cls, space_type:str):
+        """Returns [(window, area, space)] where the active space is of the type"""
+        cls.validate()
+        return cls._SPACES.get(space_type, [])
+
+    @classmethod
+    def first_space(cls, space_type:str):
+        spaces = cls.spaces(space_type)
+        return spaces[0][2] if spaces else None
+
+    @classmethod
+    def region(cls, area:Area, region_type:str='WINDOW'):
+        cls.validate()
+        return cls._REGIONS.get((area.as_pointer(), region_type))
+
+    @classmethod
+    def all_areas(cls):
+        """Returns [(window, area)] of every type"""
+        cls.validate()
+        return [item for areas in cls._AREAS.values() for item in areas]
+
+    @classmethod
+    def tag_redraw(cls, area_type:str=None):
+        """Tags every area of the type, or all areas when no type is given"""
+        cls.validate()
+        groups = cls._AREAS.values() if area_type is None else (cls._AREAS.get(area_type, []),)
+        for areas in groups:
+            for _, area in areas:
+                area.tag_redraw()
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+LOAD_HANDLE = None
+
+
+def register():
+    global LOAD_HANDLE
+    ScreenRegistry.clear()
+    LOAD_HANDLE = LoadPreHandler.add(ScreenRegistry.clear, tuple())
+
+
+def unregister():
+    global LOAD_HANDLE
+    if isinstance(LOAD_HANDLE, LoadPreHandler):
+        LOAD_HANDLE.remove()
+    LOAD_HANDLE = None
+    ScreenRegistry.clear()
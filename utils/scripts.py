@@ -0,0 +1,340 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Text
+from collections import namedtuple
+import ast
+import fnmatch
+import hashlib
+import heapq
+import importlib.abc
+import importlib.util
+import sys
+import threading
+import time
+import traceback
+from .codecache import compile_cached
+
+# ------------------------------------------------------------------------------- #
+# TYPES
+# ------------------------------------------------------------------------------- #
+
+BlockResult = namedtuple('BlockResult', ('name', 'status', 'ms', 'error'))
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def module_name_from_text(text:Text):
+    """Returns the import name of a text block, 'tools.py' imports as 'tools'"""
+    name = text.name
+    return name[:-3] if name.endswith(".py") else ""
+
+
+def text_from_module_name(name:str):
+    """Returns the text block or None, also while bpy.data is restricted during registration or file loading"""
+    try: return bpy.data.texts.get(f"{name}.py")
+    except Exception: return None
+
+def scripts_trusted():
+    """Returns False when Blender blocked auto run for the open file or Auto Run Python Scripts does not cover it"""
+    if bpy.app.autoexec_fail:
+        return False
+    preferences = bpy.context.preferences
+    if not preferences.filepaths.use_scripts_auto_execute:
+        return False
+    filepath = bpy.data.filepath
+    for excluded in getattr(preferences, 'autoexec_paths', ()):
+        if not excluded.path:
+            continue
+        if excluded.use_glob and fnmatch.fnmatch(filepath, excluded.path):
+            return False
+        if not excluded.use_glob and filepath.startswith(bpy.path.abspath(excluded.path)):
+            return False
+    return True
+
+# ------------------------------------------------------------------------------- #
+# LOADER
+# ------------------------------------------------------------------------------- #
+
+class TextBlockLoader(importlib.abc.MetaPathFinder, importlib.abc.Loader):
+    """
+    Makes text blocks ending in .py importable by name from other text blocks.
+    Only installed in sys.meta_path for the duration of an explicit build or load (use it as a context manager),
+    so failed imports elsewhere in Blender never run text blocks of the open file.
+    It answers only for the names it was created with and sits first, names of importable modules are refused beforehand.
+    Sources compile through the code cache so unchanged blocks skip parsing on every run.
+    """
+
+    def __init__(self, names=()):
+        self.names = set(names)
+
+    def __enter__(self):
+        if not scripts_trusted():
+            raise PermissionError("Auto Run Python Scripts is disabled or blocked for this file")
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+        return self
+
+    def __exit__(self, *args):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        return False
+
+    @staticmethod
+    def owns(module):
+        return isinstance(getattr(module, '__loader__', None), TextBlockLoader)
+
+    @classmethod
+    def unload_modules(cls):
+        """Removes stray finders and every module imported from a text block"""
+        sys.meta_path[:] = [finder for finder in sys.meta_path if not isinstance(finder, TextBlockLoader)]
+        for name in [name for name, module in sys.modules.items() if cls.owns(module)]:
+            del sys.modules[name]
+
+    def find_spec(self, fullname:str, path=None, target=None):
+        if fullname not in self.names or threading.current_thread() is not threading.main_thread():
+            return None
+        if text_from_module_name(fullname) is None:
+            return None
+        return importlib.util.spec_from_loader(fullname, self, origin=f"{fullname}.py")
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        text = text_from_module_name(module.__name__)
+        if text is None:
+            raise ImportError(f"Text block {module.__name__}.py was removed", name=module.__name__)
+        module.__file__ = text.name
+        exec(compile_cached(text.as_string(), text.name), module.__dict__)
+
+
+def shadowed_module(name:str):
+    """Returns True when the name already belongs to an importable module, a text block of that name would never run"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return not TextBlockLoader.owns(module)
+    if name in sys.builtin_module_names:
+        return True
+    try: return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError): return False
+
+
+def execute_text_module(name:str, text:Text, loader:TextBlockLoader):
+    """Runs the text block into a fresh module registered under the name, the previous module is kept on failure"""
+    spec = importlib.util.spec_from_loader(name, loader, origin=text.name)
+    module = importlib.util.module_from_spec(spec)
+    previous = sys.modules.get(name)
+    sys.modules[name] = module
+    try:
+        loader.exec_module(module)
+    except BaseException:
+        if previous is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = previous
+        raise
+    return module
+
+
+def load_text_module(text:Text, reload=False):
+    """Imports the text block as a module, reload runs it again, raises PermissionError for untrusted files and ImportError for shadowed names"""
+    name = module_name_from_text(text)
+    if not name:
+        return None
+    module = sys.modules.get(name)
+    if module is not None and TextBlockLoader.owns(module) and not reload:
+        return module
+    if shadowed_module(name):
+        raise ImportError(f"{text.name} shadows the importable module {name}", name=name)
+    with TextBlockLoader({name}) as loader:
+        return execute_text_module(name, text, loader)
+
+# ------------------------------------------------------------------------------- #
+# BUILD
+# ------------------------------------------------------------------------------- #
+
+_IMPORTS = {}
+_IMPORTS_LIMIT = 256
+
+
+def source_hash(source:str):
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+
+def imported_names(source:str, digest:str=""):
+    """Returns the root names of every import in the source, cached by source hash for the most recent sources"""
+    digest = digest or source_hash(source)
+    names = _IMPORTS.get(digest)
+    if names is None:
+        names = set()
+        try: tree = ast.parse(source)
+        except SyntaxError: tree = None
+        for node in ast.walk(tree) if tree is not None else ():
+            if isinstance(node, ast.Import):
+                names.update(alias.name.split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                names.add(node.module.split('.')[0])
+        while len(_IMPORTS) >= _IMPORTS_LIMIT:
+            del _IMPORTS[next(iter(_IMPORTS))]
+        _IMPORTS[digest] = names
+    return names
+
+
+def text_build_settings(text:Text):
+    """Returns (include, order) from the text block properties"""
+    settings = getattr(text, 'kbt', None)
+    if settings is None:
+        return True, 0
+    return settings.build_include, settings.build_order
+
+
+class ScriptBuilder:
+    """
+    Incremental build over the .py text blocks.
+    Dependencies come from imports between blocks, independent blocks run by their declared build order.
+    Only blocks whose source changed since their last successful run, and the blocks depending on them, execute again.
+    Blocks run directly into fresh modules, names of importable modules are reported as errors since imports would resolve to the module.
+    """
+    _DEFAULT = None
+
+    @classmethod
+    def default(cls):
+        if cls._DEFAULT is None:
+            cls._DEFAULT = cls()
+        return cls._DEFAULT
+
+    def __init__(self):
+        self.built = {}
+        self.report = []
+
+    def collect(self):
+        """Returns {module name : (text, digest, order)} for included blocks"""
+        blocks = {}
+        for text in bpy.data.texts:
+            name = module_name_from_text(text)
+            include, order = text_build_settings(text)
+            if name and include:
+                source = text.as_string()
+                blocks[name] = (text, source_hash(source), order)
+        return blocks
+
+    def graph(self, blocks:dict):
+        """Returns {name : dependency names} limited to blocks in the build"""
+        deps = {}
+        for name, (text, digest, _) in blocks.items():
+            deps[name] = {dep for dep in imported_names(text.as_string(), digest) if dep in blocks and dep != name}
+        return deps
+
+    def order(self, blocks:dict, deps:dict):
+        """Returns (ordered names, names blocked by an import cycle)"""
+        dependents = {name : set() for name in blocks}
+        waiting = {}
+        for name, names in deps.items():
+            waiting[name] = len(names)
+            for dep in names:
+                dependents[dep].add(name)
+        ready = [(blocks[name][2], name) for name, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            _, name = heapq.heappop(ready)
+            ordered.append(name)
+            for dependent in dependents[name]:
+                waiting[dependent] -= 1
+                if waiting[dependent] == 0:
+                    heapq.heappush(ready, (blocks[dependent][2], dependent))
+        blocked = sorted(set(blocks) - set(ordered))
+        return ordered, blocked
+
+    def cycle_members(self, deps:dict, blocked:list):
+        """Returns the blocked names that import themselves through other blocked names, the rest only depend on a cycle"""
+        blocked = set(blocked)
+        members = set()
+        for name in blocked:
+            stack = [dep for dep in deps[name] if dep in blocked]
+            seen = set()
+            while stack:
+                dep = stack.pop()
+                if dep == name:
+                    members.add(name)
+                    break
+                if dep in seen:
+                    continue
+                seen.add(dep)
+                stack.extend(other for other in deps[dep] if other in blocked)
+        return members
+
+    def dirty(self, blocks:dict, deps:dict, ordered:list, force=False):
+        """Returns the changed blocks plus everything downstream of them"""
+        dirty = set()
+        for name in ordered:
+            digest = blocks[name][1]
+            module = sys.modules.get(name)
+            if force or self.built.get(name) != digest or deps[name] & dirty or module is None or not TextBlockLoader.owns(module):
+                dirty.add(name)
+        return dirty
+
+    def run(self, force=False):
+        """Executes the dirty blocks in dependency order and returns a list of BlockResult, raises PermissionError for untrusted files"""
+        if not scripts_trusted():
+            raise PermissionError("Auto Run Python Scripts is disabled or blocked for this file")
+        blocks = self.collect()
+        shadowed = sorted(name for name in blocks if shadowed_module(name))
+        report = [BlockResult(name, 'FAILED', 0.0, f"Shadows the importable module {name}") for name in shadowed]
+        for name in shadowed:
+            del blocks[name]
+            self.built.pop(name, None)
+        deps = self.graph(blocks)
+        ordered, blocked = self.order(blocks, deps)
+        cycles = self.cycle_members(deps, blocked)
+        failed = set(blocked)
+        for name in blocked:
+            self.built.pop(name, None)
+            if name in cycles:
+                report.append(BlockResult(name, 'CYCLE', 0.0, "Import cycle"))
+            else:
+                report.append(BlockResult(name, 'SKIPPED', 0.0, "Depends on an import cycle"))
+        dirty = self.dirty(blocks, deps, ordered, force)
+        with TextBlockLoader(blocks) as loader:
+            for name in ordered:
+                text, digest, _ = blocks[name]
+                if name not in dirty:
+                    report.append(BlockResult(name, 'CACHED', 0.0, ""))
+                    continue
+                if deps[name] & failed:
+                    failed.add(name)
+                    self.built.pop(name, None)
+                    report.append(BlockResult(name, 'SKIPPED', 0.0, "Dependency failed"))
+                    continue
+                start = time.perf_counter()
+                try:
+                    execute_text_module(name, text, loader)
+                    self.built[name] = digest
+                    report.append(BlockResult(name, 'BUILT', (time.perf_counter() - start) * 1000, ""))
+                except Exception:
+                    failed.add(name)
+                    self.built.pop(name, None)
+                    report.append(BlockResult(name, 'FAILED', (time.perf_counter() - start) * 1000, traceback.format_exc()))
+        for name in set(self.built) - set(blocks):
+            del self.built[name]
+        self.report = report
+        return report
+
+    def reset(self):
+        self.built.clear()
+        self.report = []
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    TextBlockLoader.unload_modules()
+
+
+def unregister():
+    TextBlockLoader.unload_modules()
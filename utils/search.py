@@ -0,0 +1,323 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from collections import Counter, namedtuple
+from types import ModuleType
+import bisect
+import heapq
+import re
+import time
+from .aio import next_tick, spawn
+from .modules import (
+    get_importable_module_names,
+    get_bpy_ops_category_names,
+    get_bpy_ops_operator_names,
+    get_attribute_names_from_module,
+)
+
+# ------------------------------------------------------------------------------- #
+# TYPES
+# ------------------------------------------------------------------------------- #
+
+Symbol = namedtuple('Symbol', ('key', 'name', 'kind', 'label', 'description'))
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+FIELD_WEIGHTS = (('name', 1.0), ('label', 0.8), ('description', 0.3))
+SPLIT_RE = re.compile(r"[\s._\-/()]+")
+SEPARATORS = set(" ._-/()")
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def trigrams(text:str):
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def tokens(text:str):
+    return {token for token in SPLIT_RE.split(text.lower()) if token}
+
+
+def fuzzy_score(query:str, text:str):
+    """
+    Returns a score in [0, 1] for lowercase query and text, substrings rank above scattered subsequences,
+    matches at word starts and consecutive runs earn bonuses, 0 when the query is not a subsequence.
+    """
+    if not query or not text:
+        return 0.0
+    position = text.find(query)
+    if position >= 0:
+        boundary = position == 0 or text[position - 1] in SEPARATORS
+        return 0.6 + 0.2 * boundary + 0.2 * len(query) / len(text)
+    score = 0.0
+    index = 0
+    run = 0
+    for char in query:
+        found = text.find(char, index)
+        if found < 0:
+            return 0.0
+        run = run + 1 if found == index else 0
+        boundary = found == 0 or text[found - 1] in SEPARATORS
+        score += 1.0 + run * 0.5 + boundary * 0.75
+        index = found + 1
+    return min(0.55, 0.5 * score / (len(query) * 2.25) + 0.05 * len(query) / len(text))
+
+# ------------------------------------------------------------------------------- #
+# INDEX
+# ------------------------------------------------------------------------------- #
+
+class SearchIndex:
+    """
+    Fuzzy symbol search for as-you-type queries.
+    Trigram posting lists narrow long queries and a sorted token list answers short prefixes,
+    only the surviving candidates are scored. Symbols are grouped by source so a group updates in place.
+    """
+
+    def __init__(self):
+        self.symbols = {}
+        self.folded = {}
+        self.groups = {}
+        self.postings = {}
+        self.token_owners = {}
+        self.sorted_tokens = []
+        self.tokens_dirty = False
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def add(self, symbol:Symbol, group:str=""):
+        if symbol.key in self.symbols:
+            self.remove(symbol.key)
+        self.symbols[symbol.key] = symbol
+        self.folded[symbol.key] = tuple(getattr(symbol, field).lower() for field, _ in FIELD_WEIGHTS)
+        self.groups.setdefault(group, set()).add(symbol.key)
+        for gram in self.symbol_trigrams(symbol):
+            self.postings.setdefault(gram, set()).add(symbol.key)
+        for token in self.symbol_tokens(symbol):
+            owners = self.token_owners.get(token)
+            if owners is None:
+                owners = self.token_owners[token] = set()
+                self.tokens_dirty = True
+            owners.add(symbol.key)
+
+    def remove(self, key:str):
+        symbol = self.symbols.pop(key, None)
+        if symbol is None:
+            return False
+        del self.folded[key]
+        for keys in self.groups.values():
+            keys.discard(key)
+        for gram in self.symbol_trigrams(symbol):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self.postings[gram]
+        for token in self.symbol_tokens(symbol):
+            owners = self.token_owners.get(token)
+            if owners is not None:
+                owners.discard(key)
+                if not owners:
+                    del self.token_owners[token]
+                    self.tokens_dirty = True
+        return True
+
+    def update_group(self, group:str, symbols:list):
+        """Replaces the symbols of the group, unchanged symbols are left in place"""
+        symbols = list(symbols)
+        for _ in self.update_group_steps(group, symbols):
+            pass
+        return len({symbol.key for symbol in symbols})
+
+    def update_group_steps(self, group:str, symbols:list):
+        """Generator form of update_group, yields after every removed or added symbol so callers can slice the work"""
+        fresh = {symbol.key : symbol for symbol in symbols}
+        for key in list(self.groups.get(group, ())):
+            if fresh.get(key) != self.symbols.get(key):
+                self.remove(key)
+                yield key
+        for key, symbol in fresh.items():
+            if self.symbols.get(key) != symbol:
+                self.add(symbol, group)
+                yield key
+
+    def symbol_trigrams(self, symbol:Symbol):
+        grams = set()
+        for field, _ in FIELD_WEIGHTS:
+            grams |= trigrams(getattr(symbol, field))
+        return grams
+
+    def symbol_tokens(self, symbol:Symbol):
+        return tokens(symbol.name) | tokens(symbol.label)
+
+    def prefix_candidates(self, prefix:str, cap:int=1000, kinds:set=None):
+        """Returns keys owning a token that starts with the prefix, only of the kinds when given, stops collecting at the cap"""
+        if self.tokens_dirty:
+            self.sorted_tokens = sorted(self.token_owners)
+            self.tokens_dirty = False
+        keys = set()
+        start = bisect.bisect_left(self.sorted_tokens, prefix)
+        for token in self.sorted_tokens[start:]:
+            if not token.startswith(prefix):
+                break
+            owners = self.token_owners[token]
+            keys.update(owners if not kinds else (key for key in owners if self.symbols[key].kind in kinds))
+            if len(keys) >= cap:
+                break
+        return keys
+
+    def trigram_candidates(self, query:str, pool:int=200, cap:int=2000, kinds:set=None):
+        """
+        Returns {key : shared trigram ratio} for keys sharing at least 60% of the query trigrams, best pool only.
+        A match owns one of the rarest len - required + 1 grams, only those postings are walked, up to the cap,
+        the rest are only intersected with those candidates.
+        """
+        grams = trigrams(query)
+        grams.discard(f"{query[-2:]} ")
+        postings = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        if not postings:
+            return {}
+        required = max(1, int(len(grams) * 0.6 + 0.5))
+        seeds = len(grams) - required + 1
+        counts = Counter()
+        walked = 0
+        while walked < min(seeds, len(postings)) and len(counts) < cap:
+            counts.update(postings[walked])
+            walked += 1
+        for posting in postings[walked:]:
+            counts.update(counts.keys() & posting)
+        keys = [key for key, count in counts.items() if count >= required]
+        if kinds:
+            keys = [key for key in keys if self.symbols[key].kind in kinds]
+        if len(keys) > pool:
+            keys = heapq.nlargest(pool, keys, key=counts.__getitem__)
+        return {key : counts[key] / len(grams) for key in keys}
+
+    def score(self, query:str, key:str, overlap:float):
+        """Scores the fields in weight order and stops once the rest can not beat the best so far"""
+        score = 0.0
+        for text, (_, weight) in zip(self.folded[key], FIELD_WEIGHTS):
+            if score >= weight:
+                break
+            if text:
+                score = max(score, (fuzzy_score(query, text) or 0.4 * overlap) * weight)
+        return score
+
+    def search(self, query:str, limit:int=50, kinds:set=None):
+        """Returns [(score, Symbol)] best first"""
+        query = query.strip().lower()
+        if not query:
+            return []
+        pool = max(limit * 4, 100)
+        # Single words answer from token prefixes, typos and multi word queries fall back to trigrams
+        candidates = {}
+        if len(query) < 3 or not SPLIT_RE.search(query):
+            candidates = dict.fromkeys(self.prefix_candidates(query, pool, kinds), 0.0)
+        if len(query) >= 3 and len(candidates) < limit:
+            candidates.update(self.trigram_candidates(query, pool, kinds=kinds))
+        results = []
+        for key, overlap in candidates.items():
+            symbol = self.symbols[key]
+            if kinds and symbol.kind not in kinds:
+                continue
+            score = self.score(query, key, overlap)
+            if score > 0.0:
+                results.append((score, symbol))
+        return heapq.nlargest(limit, results, key=lambda item: (item[0], -len(item[1].name)))
+
+# ------------------------------------------------------------------------------- #
+# SOURCES
+# ------------------------------------------------------------------------------- #
+
+def operator_symbol(category:str, name:str):
+    label, description = "", ""
+    try:
+        rna = getattr(getattr(bpy.ops, category), name).get_rna_type()
+        label, description = rna.name, rna.description
+    except Exception:
+        pass
+    idname = f"{category}.{name}"
+    return Symbol(f"bpy.ops.{idname}", idname, 'OPERATOR', label, description)
+
+
+def operator_symbols(category:str):
+    return [operator_symbol(category, name) for name in get_bpy_ops_operator_names(category)]
+
+
+def module_symbols():
+    return [Symbol(f"module:{name}", name, 'MODULE', "", "") for name in get_importable_module_names()]
+
+
+def attribute_symbols(module:ModuleType):
+    name = getattr(module, '__name__', "")
+    return [Symbol(f"{name}.{attr}", attr, 'ATTRIBUTE', f"{name}.{attr}", "") for attr in get_attribute_names_from_module(module)]
+
+
+class LibrarySearch:
+    """Shared index over bpy.ops, importable modules and attributes of indexed modules, built in time slices"""
+    _INDEX = None
+    _TASK = None
+    _TIME_SLICE = 0.004
+
+    @classmethod
+    def index(cls):
+        if cls._INDEX is None:
+            cls._INDEX = SearchIndex()
+        return cls._INDEX
+
+    @classmethod
+    def search(cls, query:str, limit:int=50, kinds:set=None):
+        return cls.index().search(query, limit, kinds)
+
+    @classmethod
+    def ensure_built(cls):
+        """Starts the background build when the index is empty and no build is running"""
+        if len(cls.index()) == 0 and (cls._TASK is None or cls._TASK.done()):
+            cls.build()
+
+    @classmethod
+    def build(cls):
+        """Starts or restarts the background build, the index answers queries while it fills"""
+        if cls._TASK is not None and not cls._TASK.done():
+            cls._TASK.cancel()
+        cls._TASK = spawn(cls._build())
+        return cls._TASK
+
+    @classmethod
+    async def _build(cls):
+        index = cls.index()
+        start = time.perf_counter()
+        for _ in index.update_group_steps("modules", module_symbols()):
+            if time.perf_counter() - start > cls._TIME_SLICE:
+                await next_tick()
+                start = time.perf_counter()
+        for category in get_bpy_ops_category_names():
+            symbols = []
+            for name in get_bpy_ops_operator_names(category):
+                if time.perf_counter() - start > cls._TIME_SLICE:
+                    await next_tick()
+                    start = time.perf_counter()
+                symbols.append(operator_symbol(category, name))
+            for _ in index.update_group_steps(f"bpy.ops.{category}", symbols):
+                if time.perf_counter() - start > cls._TIME_SLICE:
+                    await next_tick()
+                    start = time.perf_counter()
+
+    @classmethod
+    def index_module(cls, module:ModuleType):
+        if isinstance(module, ModuleType):
+            return cls.index().update_group(f"attr:{module.__name__}", attribute_symbols(module))
+        return 0
+
+    @classmethod
+    def clear(cls):
+        if cls._TASK is not None and not cls._TASK.done():
+            cls._TASK.cancel()
+        cls._TASK = None
+        cls._INDEX = None
@@ -0,0 +1,100 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+import bmesh
+import enum
+import numpy as np
+
+# ------------------------------------------------------------------------------- #
+# ENUMS
+# ------------------------------------------------------------------------------- #
+
+class CHANGES(enum.Flag):
+    NONE     = 0
+    COORDS   = enum.auto()
+    TOPOLOGY = enum.auto()
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def bmesh_counts(bm:bmesh.types.BMesh):
+    """Returns (verts, edges, faces) counts"""
+    return len(bm.verts), len(bm.edges), len(bm.faces)
+
+# ------------------------------------------------------------------------------- #
+# SNAPSHOT
+# ------------------------------------------------------------------------------- #
+
+class BmeshSnapshot:
+    """
+    Pristine copy of a BMesh, its vertex coordinates and edge vertex indices.
+    Moved vertices are written back from the coordinate array, full restores reload the BMesh from a pristine mesh,
+    topology edits swap in a copy of the cached BMesh.
+    """
+
+    def __init__(self, bm:bmesh.types.BMesh):
+        self.counts = bmesh_counts(bm)
+        self.mesh = bpy.data.meshes.new("kbt_snapshot")
+        bm.to_mesh(self.mesh)
+        self.coords = np.empty(self.counts[0] * 3, dtype=np.float32)
+        self.mesh.vertices.foreach_get('co', self.coords)
+        self.coords = self.coords.reshape(-1, 3)
+        self.edges = np.empty(self.counts[1] * 2, dtype=np.int32)
+        self.mesh.edges.foreach_get('vertices', self.edges)
+        self.edges = self.edges.reshape(-1, 2)
+        self.bm = bm.copy()
+
+    def is_valid(self):
+        if not (isinstance(self.bm, bmesh.types.BMesh) and self.bm.is_valid):
+            return False
+        try: return self.mesh.name in bpy.data.meshes
+        except ReferenceError: return False
+
+    def matches_topology(self, bm:bmesh.types.BMesh, indices):
+        """Compares the counts and the edges around the vertex indices with the snapshot, indices must be current"""
+        if bmesh_counts(bm) != self.counts:
+            return False
+        verts = bm.verts
+        verts.ensure_lookup_table()
+        edges = self.edges
+        for index in indices:
+            for edge in verts[index].link_edges:
+                v0, v1 = edge.verts
+                if edges[edge.index, 0] != v0.index or edges[edge.index, 1] != v1.index:
+                    return False
+        return True
+
+    def restore_coords(self, bm:bmesh.types.BMesh, indices=None):
+        """
+        Writes the cached coordinates of the vertex indices back, returns False when the topology around them changed.
+        Without indices the BMesh is reloaded from the pristine mesh, element references and lookup tables go stale.
+        """
+        if indices is None:
+            bm.clear()
+            bm.from_mesh(self.mesh, face_normals=True, vertex_normals=True, use_shape_key=False, shape_key_index=0)
+            return True
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        if not self.matches_topology(bm, indices):
+            return False
+        verts = bm.verts
+        for index, co in zip(indices.tolist(), self.coords[indices].tolist()):
+            verts[index].co = co
+        return True
+
+    def copy(self):
+        return self.bm.copy()
+
+    def free(self):
+        if isinstance(self.bm, bmesh.types.BMesh) and self.bm.is_valid:
+            self.bm.free()
+        self.bm = None
+        try:
+            if isinstance(self.mesh, bpy.types.Mesh) and self.mesh.name in bpy.data.meshes:
+                bpy.data.meshes.remove(self.mesh)
+        except ReferenceError: pass
+        self.mesh = None
+        self.coords = None
+        self.edges = None
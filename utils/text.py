@@ -8,7 +8,7 @@ from bpy.types import (
     Text,
     Window,
 )
-from .screen import create_new_window
+from .screen import ScreenRegistry, create_new_window
 
 # ------------------------------------------------------------------------------- #
 # POLLS
@@ -49,13 +49,7 @@ def get_text_block_from_active_space(context):
 
 
 def get_text_editor():
-    for window in bpy.context.window_manager.windows:
-        for area in window.screen.areas:
-            if area.type == 'TEXT_EDITOR':
-                for space in area.spaces:
-                    if space.type == 'TEXT_EDITOR':
-                        return space
-    return None
+    return ScreenRegistry.first_space('TEXT_EDITOR')
 
 
 def set_text_editor_text(text_block:Text):
@@ -82,7 +76,8 @@ def create_text_editor_window_get_space():
     if isinstance(window, Window):
         area = window.screen.areas[0]
         area.type = 'TEXT_EDITOR'
-        for space in area.spaces:
-            if space.type == 'TEXT_EDITOR':
-                return space
+        ScreenRegistry.invalidate()
+        space = area.spaces.active
+        if space is not None and space.type == 'TEXT_EDITOR':
+            return space
     return None
@@ -0,0 +1,347 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+from bpy.types import Mesh
+import numpy as np
+from .diskcache import DiskCache, cache_key
+from .fingerprint import MeshFingerprint, TOPOLOGY_KEYS
+from .handlers import LoadPreHandler
+from .mesh import MeshData
+
+# ------------------------------------------------------------------------------- #
+# CSR
+# ------------------------------------------------------------------------------- #
+
+def csr_from_pairs(rows:np.ndarray, cols:np.ndarray, size:int):
+    """Returns (offsets, indices) where indices[offsets[i]:offsets[i+1]] are the cols paired with row i"""
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    cols = np.asarray(cols, dtype=np.int32).ravel()
+    order = np.argsort(rows, kind='stable')
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=offsets[1:])
+    return offsets, cols[order]
+
+
+def csr_gather(offsets:np.ndarray, indices:np.ndarray, rows:np.ndarray):
+    """Returns (values, owners) of all entries in the rows, owners holds the position in rows for each value"""
+    rows = np.asarray(rows, dtype=np.int64).ravel()
+    starts = offsets[rows]
+    lengths = offsets[rows + 1] - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype), np.empty(0, dtype=np.int64)
+    owners = np.repeat(np.arange(len(rows)), lengths)
+    shifts = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return indices[shifts + np.arange(total)], owners
+
+
+def csr_row(offsets:np.ndarray, indices:np.ndarray, row:int):
+    return indices[offsets[row]:offsets[row + 1]]
+
+# ------------------------------------------------------------------------------- #
+# VERSION
+# ------------------------------------------------------------------------------- #
+
+def topology_version(data:MeshData):
+    """Returns a key that changes whenever the mesh connectivity changes"""
+    return data.counts + (MeshFingerprint.from_mesh_data(data, keys=TOPOLOGY_KEYS).topology,)
+
+# ------------------------------------------------------------------------------- #
+# GRAPH
+# ------------------------------------------------------------------------------- #
+
+class TopologyGraph:
+    """
+    Compressed sparse row adjacency of a mesh built from bulk extracted arrays.
+    Cached per mesh and rebuilt only when the connectivity changes, coordinate edits keep the graph.
+    """
+    _CACHE = {}
+    _LIMIT = 16
+
+    ARRAYS = (
+        'edge_verts', 'face_loop_offsets', 'loop_starts', 'loop_totals', 'loop_verts', 'loop_edges', 'loop_faces',
+        'vert_edge_offsets', 'vert_edges', 'vert_vert_offsets', 'vert_verts',
+        'edge_face_offsets', 'edge_faces', 'edge_face_counts', 'edge_opposite_offsets', 'edge_opposites',
+    )
+
+    @classmethod
+    def get(cls, mesh:Mesh, persist=False):
+        """Returns the cached graph, persist loads and stores it in the disk cache across sessions"""
+        data = MeshData.get(mesh)
+        if data is None:
+            return None
+        version = topology_version(data)
+        graph = cls._CACHE.pop(mesh.session_uid, None)
+        if graph is None:
+            cls.prune()
+        if graph is None or graph.version != version:
+            key = cache_key("topology", *version)
+            arrays = DiskCache.default().get(key) if persist else None
+            graph = cls.from_arrays(arrays) if arrays else cls.from_mesh_data(data)
+            if persist and not arrays:
+                DiskCache.default().put(key, graph.to_arrays())
+            graph.version = version
+        graph.mesh = mesh
+        cls._CACHE[mesh.session_uid] = graph
+        return graph
+
+    @classmethod
+    def prune(cls):
+        """Drops graphs whose mesh was removed, then the least recently used ones over the limit"""
+        for uid, graph in list(cls._CACHE.items()):
+            try: alive = graph.mesh.session_uid == uid
+            except ReferenceError: alive = False
+            if not alive:
+                del cls._CACHE[uid]
+        while len(cls._CACHE) >= cls._LIMIT:
+            del cls._CACHE[next(iter(cls._CACHE))]
+
+    @classmethod
+    def clear_cache(cls):
+        cls._CACHE.clear()
+
+    @classmethod
+    def from_mesh_data(cls, data:MeshData):
+        return cls(
+            vert_count=len(data.mesh.vertices),
+            edge_verts=data.edge_vertices(),
+            loop_starts=data.face_loop_starts(),
+            loop_totals=data.face_loop_totals(),
+            loop_verts=data.loop_vertices(),
+            loop_edges=data.loop_edges())
+
+    @classmethod
+    def from_arrays(cls, arrays:dict):
+        """Returns a graph over previously stored arrays without rebuilding the adjacency"""
+        graph = cls.__new__(cls)
+        graph.version = None
+        graph.mesh = None
+        graph.loop_steps = None
+        for name in cls.ARRAYS:
+            setattr(graph, name, arrays[name])
+        graph.vert_count = int(arrays['vert_count'][0])
+        graph.edge_count = len(graph.edge_verts)
+        graph.face_count = len(graph.loop_starts)
+        return graph
+
+    def to_arrays(self):
+        arrays = {name : getattr(self, name) for name in self.ARRAYS}
+        arrays['vert_count'] = np.array([self.vert_count], dtype=np.int64)
+        return arrays
+
+    def __init__(self, vert_count:int, edge_verts:np.ndarray, loop_starts:np.ndarray, loop_totals:np.ndarray, loop_verts:np.ndarray, loop_edges:np.ndarray):
+        self.version = None
+        self.mesh = None
+        self.loop_steps = None
+        self.vert_count = vert_count
+        self.edge_verts = np.array(edge_verts, dtype=np.int32).reshape(-1, 2)
+        self.edge_count = len(self.edge_verts)
+        self.face_count = len(loop_starts)
+        # Face -> Loop
+        self.face_loop_offsets = np.zeros(self.face_count + 1, dtype=np.int64)
+        np.cumsum(loop_totals, out=self.face_loop_offsets[1:])
+        self.loop_starts = np.array(loop_starts, dtype=np.int64)
+        self.loop_totals = np.array(loop_totals, dtype=np.int64)
+        self.loop_verts = np.array(loop_verts, dtype=np.int32)
+        self.loop_edges = np.array(loop_edges, dtype=np.int32)
+        self.loop_faces = np.empty(len(self.loop_verts), dtype=np.int32)
+        self.loop_faces[self.face_loop_order()] = np.repeat(np.arange(self.face_count, dtype=np.int32), self.loop_totals)
+        # Vert -> Edge / Vert -> Vert
+        edge_ids = np.repeat(np.arange(self.edge_count, dtype=np.int32), 2)
+        self.vert_edge_offsets, self.vert_edges = csr_from_pairs(self.edge_verts.ravel(), edge_ids, vert_count)
+        self.vert_vert_offsets, self.vert_verts = csr_from_pairs(self.edge_verts.ravel(), self.edge_verts[:, ::-1].ravel(), vert_count)
+        # Edge -> Face
+        self.edge_face_offsets, self.edge_faces = csr_from_pairs(self.loop_edges, self.loop_faces, self.edge_count)
+        self.edge_face_counts = np.diff(self.edge_face_offsets)
+        # Edge -> Opposite Edge (quads)
+        quads = np.flatnonzero(self.loop_totals == 4)
+        if len(quads):
+            loops = self.loop_starts[quads][:, None] + np.arange(4)
+            edges = self.loop_edges[loops]
+            opposite = edges[:, [2, 3, 0, 1]]
+            self.edge_opposite_offsets, self.edge_opposites = csr_from_pairs(edges.ravel(), opposite.ravel(), self.edge_count)
+        else:
+            self.edge_opposite_offsets, self.edge_opposites = np.zeros(self.edge_count + 1, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+    def face_loop_order(self):
+        """Returns loop indices ordered face by face, matching loop_faces"""
+        if self.face_count == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.repeat(self.loop_starts - self.face_loop_offsets[:-1], self.loop_totals) + np.arange(self.face_loop_offsets[-1])
+
+    def vert_valence(self):
+        return np.diff(self.vert_edge_offsets)
+
+    def edges_of_vert(self, vert:int):
+        return csr_row(self.vert_edge_offsets, self.vert_edges, vert)
+
+    def faces_of_edge(self, edge:int):
+        return csr_row(self.edge_face_offsets, self.edge_faces, edge)
+
+    def loops_of_face(self, face:int):
+        start = self.loop_starts[face]
+        return np.arange(start, start + self.loop_totals[face])
+
+    def opposite_edges(self, edge:int):
+        return csr_row(self.edge_opposite_offsets, self.edge_opposites, edge)
+
+    def n_ring(self, verts, rings:int=1):
+        """Returns the sorted vertex indices within n edge hops of the seed vertices"""
+        region = np.zeros(self.vert_count, dtype=bool)
+        front = np.unique(np.asarray(verts, dtype=np.int64))
+        region[front] = True
+        for _ in range(max(rings, 0)):
+            neighbors, _ = csr_gather(self.vert_vert_offsets, self.vert_verts, front)
+            neighbors = np.unique(neighbors)
+            front = neighbors[~region[neighbors]]
+            if not len(front):
+                break
+            region[front] = True
+        return np.flatnonzero(region)
+
+    def boundary_edges(self):
+        """Returns the edges used by exactly one face"""
+        return np.flatnonzero(self.edge_face_counts == 1)
+
+    def boundary_verts(self):
+        return np.unique(self.edge_verts[self.boundary_edges()])
+
+    def non_manifold_edges(self):
+        """Returns wire edges and edges shared by more than two faces"""
+        return np.flatnonzero((self.edge_face_counts == 0) | (self.edge_face_counts > 2))
+
+    def components(self):
+        """Returns (count, labels) where labels maps every vertex to a connected component index"""
+        labels = np.arange(self.vert_count, dtype=np.int64)
+        if self.edge_count == 0:
+            return self.vert_count, labels
+        a, b = self.edge_verts[:, 0], self.edge_verts[:, 1]
+        while True:
+            lowest = np.minimum(labels[a], labels[b])
+            updated = labels.copy()
+            np.minimum.at(updated, labels[a], lowest)
+            np.minimum.at(updated, labels[b], lowest)
+            # Pointer jumping
+            updated = updated[updated]
+            while True:
+                jumped = updated[updated]
+                if np.array_equal(jumped, updated):
+                    break
+                updated = jumped
+            if np.array_equal(updated, labels):
+                break
+            labels = updated
+        roots, labels = np.unique(labels, return_inverse=True)
+        return len(roots), labels
+
+    def build_loop_steps(self):
+        """
+        Returns the loop step of every edge end, ends are 2 * edge + side for the vertex edge_verts[edge, side].
+        Stepping out of an end gives the far end of the edge continuing the loop, or -1.
+        Loops continue across regular vertices, 4 edges and 4 faces, and along boundaries where a vertex has 2 boundary edges.
+        """
+        if self.loop_steps is not None:
+            return self.loop_steps
+        edge_count, vert_count = self.edge_count, self.vert_count
+        end_verts = self.edge_verts.ravel().astype(np.int64)
+        end_edges = np.arange(2 * edge_count, dtype=np.int64) >> 1
+        # Corners pair the incoming and outgoing edge of every loop at its vertex
+        order = self.face_loop_order()
+        positions = np.arange(len(order))
+        firsts = np.repeat(self.face_loop_offsets[:-1], self.loop_totals)
+        previous = np.where(positions == firsts, np.repeat(self.face_loop_offsets[1:] - 1, self.loop_totals), positions - 1)
+        corner_verts = self.loop_verts[order].astype(np.int64)
+        outgoing = self.loop_edges[order].astype(np.int64)
+        incoming = self.loop_edges[order[previous]].astype(np.int64)
+        def ends(edges):
+            return 2 * edges + (self.edge_verts[edges, 1] == corner_verts)
+        outgoing_ends, incoming_ends = ends(outgoing), ends(incoming)
+        size = 2 * edge_count
+        end_corners = np.bincount(outgoing_ends, minlength=size) + np.bincount(incoming_ends, minlength=size)
+        neighbor_sums = np.bincount(outgoing_ends, weights=incoming, minlength=size) + np.bincount(incoming_ends, weights=outgoing, minlength=size)
+        # Across regular vertices the continuing edge is the one that is neither the edge nor a corner neighbor
+        vert_corners = np.bincount(corner_verts, minlength=vert_count)
+        vert_edge_sums = np.bincount(end_verts, weights=end_edges, minlength=vert_count)
+        valence = self.vert_valence()
+        face_counts = self.edge_face_counts[end_edges]
+        regular = (valence[end_verts] == 4) & (vert_corners[end_verts] == 4) & (face_counts == 2) & (end_corners == 2)
+        across = (vert_edge_sums[end_verts] - end_edges - neighbor_sums).astype(np.int64)
+        # Along boundaries the continuing edge is the other boundary edge
+        boundary_ends = np.flatnonzero(self.edge_face_counts[end_edges] == 1)
+        boundary_counts = np.bincount(end_verts[boundary_ends], minlength=vert_count)
+        boundary_sums = np.bincount(end_verts[boundary_ends], weights=end_edges[boundary_ends], minlength=vert_count)
+        along = (boundary_sums[end_verts] - end_edges).astype(np.int64)
+        on_boundary = (face_counts == 1) & (boundary_counts[end_verts] == 2)
+        nexts = np.where(regular, across, np.where(on_boundary, along, -1))
+        valid = (nexts >= 0) & (nexts < edge_count) & (nexts != end_edges)
+        safe = np.where(valid, nexts, 0)
+        near = self.edge_verts[safe] == end_verts[:, None]
+        valid &= near.any(axis=1)
+        self.loop_steps = np.where(valid, 2 * safe + 1 - near[:, 1], -1)
+        return self.loop_steps
+
+    def _walk_loop(self, end:int, steps:np.ndarray, seen:set):
+        path = []
+        while True:
+            end = int(steps[end])
+            if end < 0 or (end >> 1) in seen:
+                return path, end >= 0
+            seen.add(end >> 1)
+            path.append(end >> 1)
+
+    def edge_loop(self, edge:int):
+        """Returns the edge indices of the loop through the edge, walked in both directions"""
+        steps = self.build_loop_steps()
+        seen = {edge}
+        forward, closed = self._walk_loop(2 * edge + 1, steps, seen)
+        if closed:
+            return np.array([edge] + forward, dtype=np.int32)
+        backward, _ = self._walk_loop(2 * edge, steps, seen)
+        return np.array(backward[::-1] + [edge] + forward, dtype=np.int32)
+
+    def edge_rings(self, edges):
+        """Returns the sorted edge indices of the rings through the edges, crossing quads only"""
+        ring = np.zeros(self.edge_count, dtype=bool)
+        front = np.unique(np.asarray(edges, dtype=np.int64))
+        ring[front] = True
+        while len(front):
+            opposites, _ = csr_gather(self.edge_opposite_offsets, self.edge_opposites, front)
+            opposites = np.unique(opposites)
+            front = opposites[~ring[opposites]]
+            ring[front] = True
+        return np.flatnonzero(ring).astype(np.int32)
+
+    def edge_ring(self, edge:int):
+        return self.edge_rings([edge])
+
+    def edge_loops(self, edges):
+        """Returns the sorted edge indices of the loops through the edges, edges on a walked loop are not walked again"""
+        covered = set()
+        loops = []
+        for edge in np.asarray(edges, dtype=np.int64).ravel():
+            if int(edge) not in covered:
+                loop = self.edge_loop(int(edge))
+                covered.update(loop.tolist())
+                loops.append(loop)
+        return np.unique(np.concatenate(loops)) if loops else np.empty(0, dtype=np.int32)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+LOAD_HANDLE = None
+
+
+def register():
+    global LOAD_HANDLE
+    TopologyGraph.clear_cache()
+    LOAD_HANDLE = LoadPreHandler.add(TopologyGraph.clear_cache, tuple())
+
+
+def unregister():
+    global LOAD_HANDLE
+    if isinstance(LOAD_HANDLE, LoadPreHandler):
+        LOAD_HANDLE.remove()
+    LOAD_HANDLE = None
+    TopologyGraph.clear_cache()
@@ -0,0 +1,294 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from bpy.types import Mesh
+import numpy as np
+import zlib
+from .mesh import ATTRIBUTE_LAYOUTS, domain_size
+
+# ------------------------------------------------------------------------------- #
+# CONSTANTS
+# ------------------------------------------------------------------------------- #
+
+TOPOLOGY_KEYS = ('edges', 'loop_verts', 'loop_edges', 'face_starts')
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def _get(collection, key:str, count:int, width:int, dtype):
+    array = np.empty(count * width, dtype=dtype)
+    collection.foreach_get(key, array)
+    return array
+
+
+def mesh_to_arrays(mesh:Mesh):
+    """Returns a dict of flat arrays describing the mesh geometry, flags and generic attributes"""
+    vcount, ecount, fcount, lcount = len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops)
+    arrays = {
+        'coords'      : _get(mesh.vertices, 'co', vcount, 3, np.float32),
+        'edges'       : _get(mesh.edges, 'vertices', ecount, 2, np.int32),
+        'loop_verts'  : _get(mesh.loops, 'vertex_index', lcount, 1, np.int32),
+        'loop_edges'  : _get(mesh.loops, 'edge_index', lcount, 1, np.int32),
+        'face_starts' : _get(mesh.polygons, 'loop_start', fcount, 1, np.int32),
+        'vert_select' : _get(mesh.vertices, 'select', vcount, 1, bool),
+        'vert_hide'   : _get(mesh.vertices, 'hide', vcount, 1, bool),
+        'edge_select' : _get(mesh.edges, 'select', ecount, 1, bool),
+        'edge_hide'   : _get(mesh.edges, 'hide', ecount, 1, bool),
+        'face_select' : _get(mesh.polygons, 'select', fcount, 1, bool),
+        'face_hide'   : _get(mesh.polygons, 'hide', fcount, 1, bool),
+    }
+    for attr in mesh.attributes:
+        name = attr.name
+        if name.startswith('.') or name == 'position':
+            continue
+        layout = ATTRIBUTE_LAYOUTS.get(attr.data_type)
+        if layout is None:
+            continue
+        key, width, dtype = layout
+        arrays[f"attr:{attr.domain}:{attr.data_type}:{name}"] = _get(attr.data, key, domain_size(mesh, attr.domain), width, dtype)
+    return arrays
+
+
+def arrays_to_mesh(arrays:dict, mesh:Mesh):
+    """Rebuilds the mesh geometry in place from mesh_to_arrays output"""
+    coords = arrays['coords']
+    edges = arrays['edges']
+    loop_verts = arrays['loop_verts']
+    face_starts = arrays['face_starts']
+    mesh.clear_geometry()
+    mesh.vertices.add(len(coords) // 3)
+    mesh.edges.add(len(edges) // 2)
+    mesh.loops.add(len(loop_verts))
+    mesh.polygons.add(len(face_starts))
+    mesh.vertices.foreach_set('co', coords)
+    mesh.edges.foreach_set('vertices', edges)
+    mesh.loops.foreach_set('vertex_index', loop_verts)
+    mesh.loops.foreach_set('edge_index', arrays['loop_edges'])
+    mesh.polygons.foreach_set('loop_start', face_starts)
+    for collection, prefix in ((mesh.vertices, 'vert'), (mesh.edges, 'edge'), (mesh.polygons, 'face')):
+        collection.foreach_set('select', arrays[f"{prefix}_select"])
+        collection.foreach_set('hide', arrays[f"{prefix}_hide"])
+    for name, array in arrays.items():
+        if not name.startswith('attr:'):
+            continue
+        _, domain, data_type, attr_name = name.split(':', 3)
+        attr = mesh.attributes.get(attr_name)
+        if attr is None or attr.domain != domain or attr.data_type != data_type:
+            if attr is not None:
+                mesh.attributes.remove(attr)
+            attr = mesh.attributes.new(attr_name, data_type, domain)
+        attr.data.foreach_set(ATTRIBUTE_LAYOUTS[data_type][0], array)
+    mesh.update()
+    return mesh
+
+
+def needs_mesh_copy(mesh:Mesh, vertex_groups=False):
+    """Returns True when the mesh holds data the arrays cannot store, vertex group weights, shape keys or unlisted attribute types"""
+    if vertex_groups or mesh.shape_keys is not None:
+        return True
+    return any(attr.data_type not in ATTRIBUTE_LAYOUTS for attr in mesh.attributes if not attr.name.startswith('.'))
+
+
+def topology_key(arrays:dict):
+    """Returns a cheap checksum tuple of the topology arrays"""
+    return tuple((len(arrays[key]), zlib.crc32(arrays[key])) for key in TOPOLOGY_KEYS)
+
+# ------------------------------------------------------------------------------- #
+# ENTRY
+# ------------------------------------------------------------------------------- #
+
+class UndoEntry:
+    """
+    Compressed mesh arrays.
+    Entries sharing topology with their keyframe store XOR deltas, unchanged data compresses to almost nothing.
+    """
+
+    def __init__(self, arrays:dict, keyframe=None, level:int=1):
+        self.keyframe = keyframe
+        self.level = level
+        self.raw_bytes = 0
+        self.data = {}
+        self.topology = topology_key(arrays)
+        self.encode(arrays, keyframe)
+
+    @property
+    def nbytes(self):
+        return sum(len(blob) for _, _, blob in self.data.values())
+
+    @property
+    def is_keyframe(self):
+        return self.keyframe is None
+
+    def encode(self, arrays:dict, keyframe=None):
+        self.keyframe = keyframe
+        self.data.clear()
+        self.raw_bytes = 0
+        base = keyframe.decode() if keyframe is not None else {}
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            self.raw_bytes += array.nbytes
+            raw = array.view(np.uint8)
+            other = base.get(name)
+            delta = other is not None and other.dtype == array.dtype and other.shape == array.shape
+            if delta:
+                raw = np.bitwise_xor(raw, other.view(np.uint8))
+            self.data[name] = (array.dtype.str, delta, zlib.compress(raw.tobytes(), self.level))
+
+    def decode(self):
+        base = self.keyframe.decode() if self.keyframe is not None else {}
+        arrays = {}
+        for name, (dtype, delta, blob) in self.data.items():
+            raw = np.frombuffer(zlib.decompress(blob), dtype=np.uint8)
+            if delta:
+                raw = np.bitwise_xor(raw, base[name].view(np.uint8))
+            arrays[name] = raw.view(np.dtype(dtype)).copy()
+        return arrays
+
+class MeshCopyEntry:
+    """Full Mesh copy for states the arrays cannot store, kept out of the delta chain"""
+    keyframe = None
+    is_keyframe = True
+    topology = None
+    data = {}
+
+    def __init__(self, mesh:Mesh):
+        self.mesh = mesh.copy()
+        self.mesh.use_fake_user = False
+        counts = len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops)
+        self.raw_bytes = counts[0] * 16 + counts[1] * 10 + counts[2] * 10 + counts[3] * 8
+        if mesh.shape_keys is not None:
+            self.raw_bytes += counts[0] * 12 * len(mesh.shape_keys.key_blocks)
+
+    @property
+    def nbytes(self):
+        return self.raw_bytes
+
+    def free(self):
+        try:
+            if self.mesh is not None and self.mesh.name in bpy.data.meshes:
+                bpy.data.meshes.remove(self.mesh)
+        except ReferenceError: pass
+        self.mesh = None
+
+# ------------------------------------------------------------------------------- #
+# STORE
+# ------------------------------------------------------------------------------- #
+
+class UndoStore:
+    """
+    Undo stack of compressed mesh states with a byte budget and oldest first eviction.
+    A limit or byte_budget of None disables that bound, owners sharing a timeline evict through drop_oldest.
+    Meshes with vertex groups, shape keys or attribute types outside ATTRIBUTE_LAYOUTS are stored as Mesh copies.
+    """
+
+    def __init__(self, limit:int=32, byte_budget:int=256 * 1024 * 1024, level:int=1):
+        self.limit = limit
+        self.byte_budget = byte_budget
+        self.level = level
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def push(self, mesh:Mesh, vertex_groups=False):
+        """Stores the mesh state, set vertex_groups when the owning object has vertex groups"""
+        if needs_mesh_copy(mesh, vertex_groups):
+            entry = MeshCopyEntry(mesh)
+        else:
+            arrays = mesh_to_arrays(mesh)
+            keyframe = self._keyframe_for(arrays)
+            entry = UndoEntry(arrays, keyframe, self.level)
+        self.entries.append(entry)
+        self.evict()
+        return entry
+
+    def pop(self):
+        if not self.entries:
+            return None
+        entry = self.entries.pop()
+        self._release(entry)
+        return entry
+
+    def peek(self):
+        return self.entries[-1] if self.entries else None
+
+    def restore_into(self, mesh:Mesh, entry:UndoEntry=None):
+        entry = entry if entry is not None else self.peek()
+        if entry is None or not isinstance(mesh, Mesh) or isinstance(entry, MeshCopyEntry):
+            return False
+        arrays_to_mesh(entry.decode(), mesh)
+        return True
+
+    def backup_mesh(self, scratch:Mesh, entry:UndoEntry=None):
+        """Returns a Mesh holding the entry state, array entries are decoded into the scratch mesh"""
+        entry = entry if entry is not None else self.peek()
+        if isinstance(entry, MeshCopyEntry):
+            return entry.mesh
+        return scratch if self.restore_into(scratch, entry) else None
+
+    def drop_oldest(self):
+        if not self.entries:
+            return None
+        entry = self.entries.pop(0)
+        self._release(entry)
+        return entry
+
+    def over_budget(self):
+        if self.limit is not None and len(self.entries) > self.limit:
+            return True
+        return self.byte_budget is not None and self.nbytes > self.byte_budget
+
+    def evict(self):
+        while len(self.entries) > 1 and self.over_budget():
+            self.drop_oldest()
+
+    def clear(self):
+        for entry in self.entries:
+            if isinstance(entry, MeshCopyEntry):
+                entry.free()
+        self.entries.clear()
+
+    @property
+    def nbytes(self):
+        return sum(entry.nbytes for entry in self.entries)
+
+    def memory_usage(self):
+        return {
+            'entries'   : len(self.entries),
+            'keyframes' : sum(1 for entry in self.entries if entry.is_keyframe),
+            'bytes'     : self.nbytes,
+            'raw_bytes' : sum(entry.raw_bytes for entry in self.entries),
+            'budget'    : self.byte_budget,
+        }
+
+    def _keyframe_for(self, arrays:dict):
+        last = self.peek()
+        if last is None:
+            return None
+        keyframe = last if last.is_keyframe else last.keyframe
+        if keyframe.data.keys() != arrays.keys():
+            return None
+        if keyframe.topology != topology_key(arrays):
+            return None
+        return keyframe
+
+    def _release(self, removed):
+        if isinstance(removed, MeshCopyEntry):
+            removed.free()
+        else:
+            self._rebase(removed)
+
+    def _rebase(self, removed:UndoEntry):
+        """Re-encodes the deltas that depended on a removed keyframe"""
+        if not removed.is_keyframe:
+            return
+        dependents = [entry for entry in self.entries if entry.keyframe is removed]
+        if not dependents:
+            return
+        first = dependents[0]
+        first.encode(first.decode(), None)
+        for entry in dependents[1:]:
+            entry.encode(entry.decode(), first)
@@ -0,0 +1,253 @@
+# ------------------------------------------------------------------------------- #
+# IMPORTS
+# ------------------------------------------------------------------------------- #
+
+import bpy
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    ProcessPoolExecutor,
+)
+from typing import (
+    Callable,
+    Tuple,
+)
+import enum
+import queue
+import threading
+import time
+import traceback
+from uuid import uuid4
+
+# ------------------------------------------------------------------------------- #
+# ENUMS
+# ------------------------------------------------------------------------------- #
+
+class POOL_TYPES(enum.Enum):
+    THREAD  = ThreadPoolExecutor
+    PROCESS = ProcessPoolExecutor
+
+class JOB_STATUS(enum.Enum):
+    PENDING   = 0
+    FINISHED  = 1
+    FAILED    = 2
+    CANCELLED = 3
+
+# ------------------------------------------------------------------------------- #
+# UTILS
+# ------------------------------------------------------------------------------- #
+
+keygen = lambda : str(uuid4())
+
+# ------------------------------------------------------------------------------- #
+# JOB
+# ------------------------------------------------------------------------------- #
+
+class Job:
+    """Handle for work submitted to a WorkerPool, callbacks always run on the main thread"""
+
+    def __init__(self, key:str, group:str, callback:Callable, errback:Callable):
+        self.key = key
+        self.group = group
+        self.callback = callback
+        self.errback = errback
+        self.status = JOB_STATUS.PENDING
+        self.result = None
+        self.error = None
+        self.future = None
+        self.submit_time = time.perf_counter()
+        self.finish_time = 0.0
+
+    @property
+    def done(self):
+        return self.status != JOB_STATUS.PENDING
+
+    @property
+    def elapsed(self):
+        if self.done:
+            return self.finish_time - self.submit_time
+        return time.perf_counter() - self.submit_time
+
+    def cancel(self):
+        """Cancels the job, if it is already running the result is discarded"""
+        if self.done:
+            return False
+        self.status = JOB_STATUS.CANCELLED
+        self.finish_time = time.perf_counter()
+        if self.future is not None:
+            self.future.cancel()
+        return True
+
+# ------------------------------------------------------------------------------- #
+# POOL
+# ------------------------------------------------------------------------------- #
+
+class WorkerPool:
+    """
+    Executor facade for pure data work (NumPy arrays, lists, tuples).
+    Extract inputs from bpy on the main thread, submit a function that never touches bpy,
+    and receive the result through a callback invoked by a bpy.app.timers drain.
+    Process pools require a picklable module level function.
+    """
+    _POOLS = {}
+    _RESULTS = queue.SimpleQueue()
+    _DRAIN_BUDGET = 0.004
+    _DRAIN_INTERVAL = 0.01
+
+    @classmethod
+    def get(cls, pool_type:POOL_TYPES=POOL_TYPES.THREAD):
+        if pool_type not in POOL_TYPES:
+            return None
+        pool = cls._POOLS.get(pool_type)
+        if pool is None:
+            pool = cls(pool_type)
+            cls._POOLS[pool_type] = pool
+        return pool
+
+    @classmethod
+    def shutdown_all(cls):
+        for pool in list(cls._POOLS.values()):
+            pool.shutdown()
+        cls._POOLS.clear()
+        while not cls._RESULTS.empty():
+            try: cls._RESULTS.get_nowait()
+            except queue.Empty: break
+        if bpy.app.timers.is_registered(cls._drain):
+            bpy.app.timers.unregister(cls._drain)
+
+    @classmethod
+    def _drain(cls):
+        """Timer callback, delivers finished jobs on the main thread within a time budget"""
+        start = time.perf_counter()
+        while time.perf_counter() - start < cls._DRAIN_BUDGET:
+            try:
+                pool, job, future = cls._RESULTS.get_nowait()
+            except queue.Empty:
+                break
+            pool._deliver(job, future)
+        if any(pool.pending for pool in cls._POOLS.values()) or not cls._RESULTS.empty():
+            return cls._DRAIN_INTERVAL
+        return None
+
+    @classmethod
+    def _ensure_drain(cls):
+        if not bpy.app.timers.is_registered(cls._drain):
+            bpy.app.timers.register(cls._drain, first_interval=0.0, persistent=True)
+
+    def __init__(self, pool_type:POOL_TYPES, max_workers:int=None, max_pending:int=64):
+        self.pool_type = pool_type
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.executor = None
+        self.jobs = {}
+        self.groups = {}
+        self.lock = threading.Lock()
+
+    @property
+    def pending(self):
+        return len(self.jobs)
+
+    @property
+    def saturated(self):
+        return self.pending >= self.max_pending
+
+    def submit(self, func:Callable, args:Tuple=tuple(), callback:Callable=None, errback:Callable=None, group:str=""):
+        """
+        Returns a Job or None when the pool is saturated (backpressure).
+        Jobs in the same group supersede each other, only the latest one reports back.
+        """
+        if not callable(func) or not isinstance(args, tuple):
+            return None
+        if group and group in self.groups:
+            self.groups[group].cancel()
+        if self.saturated:
+            return None
+        if self.executor is None:
+            self.executor = self.pool_type.value(max_workers=self.max_workers)
+        job = Job(keygen(), group, callback, errback)
+        with self.lock:
+            self.jobs[job.key] = job
+        if group:
+            self.groups[group] = job
+        try:
+            job.future = self.executor.submit(func, *args)
+        except Exception as e:
+            self._forget(job)
+            job.status = JOB_STATUS.FAILED
+            job.error = e
+            traceback.print_exc()
+            return None
+        job.future.add_done_callback(lambda future, job=job: WorkerPool._RESULTS.put((self, job, future)))
+        WorkerPool._ensure_drain()
+        return job
+
+    def map(self, func:Callable, items):
+        """Blocking parallel map for work that must finish within the current step, NumPy releases the GIL"""
+        if self.executor is None:
+            self.executor = self.pool_type.value(max_workers=self.max_workers)
+        return list(self.executor.map(func, items))
+
+    def cancel(self, group:str=""):
+        """Cancels every pending job or only those in the group"""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            if not group or job.group == group:
+                job.cancel()
+                self._forget(job)
+
+    def shutdown(self):
+        self.cancel()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = None
+
+    def _forget(self, job:Job):
+        with self.lock:
+            if job.key in self.jobs:
+                del self.jobs[job.key]
+        if job.group and self.groups.get(job.group) is job:
+            del self.groups[job.group]
+
+    def _deliver(self, job:Job, future):
+        self._forget(job)
+        if job.status == JOB_STATUS.CANCELLED or future.cancelled():
+            job.status = JOB_STATUS.CANCELLED
+            return
+        job.finish_time = time.perf_counter()
+        error = future.exception()
+        if error is None:
+            job.status = JOB_STATUS.FINISHED
+            job.result = future.result()
+            if callable(job.callback):
+                try: job.callback(job.result)
+                except: traceback.print_exc()
+        else:
+            job.status = JOB_STATUS.FAILED
+            job.error = error
+            if callable(job.errback):
+                try: job.errback(error)
+                except: traceback.print_exc()
+            else:
+                traceback.print_exception(type(error), error, error.__traceback__)
+
+# ------------------------------------------------------------------------------- #
+# FUNCTIONS
+# ------------------------------------------------------------------------------- #
+
+def submit_thread(func:Callable, args:Tuple=tuple(), callback:Callable=None, errback:Callable=None, group:str=""):
+    return WorkerPool.get(POOL_TYPES.THREAD).submit(func, args, callback, errback, group)
+
+
+def submit_process(func:Callable, args:Tuple=tuple(), callback:Callable=None, errback:Callable=None, group:str=""):
+    return WorkerPool.get(POOL_TYPES.PROCESS).submit(func, args, callback, errback, group)
+
+# ------------------------------------------------------------------------------- #
+# REGISTER
+# ------------------------------------------------------------------------------- #
+
+def register():
+    WorkerPool.shutdown_all()
+
+
+def unregister():
+    WorkerPool.shutdown_all()